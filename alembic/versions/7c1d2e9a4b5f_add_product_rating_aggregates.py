@@ -0,0 +1,63 @@
+"""add_product_rating_aggregates
+
+Revision ID: 7c1d2e9a4b5f
+Revises: 554c9035ae7c
+Create Date: 2026-10-18 09:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "7c1d2e9a4b5f"
+down_revision: Union[str, Sequence[str], None] = "554c9035ae7c"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "products",
+        sa.Column("rating_sum", sa.Integer(), server_default="0", nullable=False),
+    )
+    op.add_column(
+        "products",
+        sa.Column("rating_count", sa.Integer(), server_default="0", nullable=False),
+    )
+    op.add_column(
+        "products",
+        sa.Column("average_rating", sa.Numeric(precision=3, scale=2), nullable=True),
+    )
+    op.create_index(op.f("ix_products_average_rating"), "products", ["average_rating"])
+
+    # Backfill from existing reviews (same as `python -m app.cli backfill-ratings`)
+    op.execute(
+        """
+        UPDATE products SET
+            rating_sum = (
+                SELECT COALESCE(SUM(rating), 0) FROM reviews
+                WHERE reviews.product_id = products.id
+            ),
+            rating_count = (
+                SELECT COUNT(id) FROM reviews
+                WHERE reviews.product_id = products.id
+            ),
+            average_rating = (
+                SELECT ROUND(AVG(rating * 1.0), 2) FROM reviews
+                WHERE reviews.product_id = products.id
+            )
+        """
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f("ix_products_average_rating"), table_name="products")
+    op.drop_column("products", "average_rating")
+    op.drop_column("products", "rating_count")
+    op.drop_column("products", "rating_sum")
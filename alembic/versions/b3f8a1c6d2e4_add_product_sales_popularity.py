@@ -0,0 +1,55 @@
+"""add_product_sales_popularity
+
+Revision ID: b3f8a1c6d2e4
+Revises: 7c1d2e9a4b5f
+Create Date: 2026-10-18 10:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "b3f8a1c6d2e4"
+down_revision: Union[str, Sequence[str], None] = "7c1d2e9a4b5f"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        "products",
+        sa.Column("sales_count", sa.Integer(), server_default="0", nullable=False),
+    )
+    op.add_column(
+        "products",
+        sa.Column("popularity", sa.Float(), server_default="0", nullable=False),
+    )
+    op.create_index(op.f("ix_products_popularity"), "products", ["popularity"])
+    op.create_index(
+        "ix_products_category_popularity", "products", ["category_id", "popularity"]
+    )
+
+    # Every past sale counted as made at the popularity epoch (weight 1);
+    # `python -m app.cli recompute-popularity` weights them by order date
+    op.execute(
+        """
+        UPDATE products SET sales_count = (
+            SELECT COALESCE(SUM(quantity), 0) FROM orderitems
+            WHERE orderitems.product_id = products.id
+        )
+        """
+    )
+    op.execute("UPDATE products SET popularity = sales_count")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_products_category_popularity", table_name="products")
+    op.drop_index(op.f("ix_products_popularity"), table_name="products")
+    op.drop_column("products", "popularity")
+    op.drop_column("products", "sales_count")
@@ -0,0 +1,49 @@
+"""add_search_outbox
+
+Revision ID: c5d9e2f7a1b3
+Revises: b3f8a1c6d2e4
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "c5d9e2f7a1b3"
+down_revision: Union[str, Sequence[str], None] = "b3f8a1c6d2e4"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        "search_outbox",
+        sa.Column("id", sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column("product_id", sa.Integer(), nullable=False),
+        sa.Column("operation", sa.String(length=10), nullable=False),
+        sa.Column("fields", sa.JSON(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("available_at", sa.DateTime(), nullable=True),
+        sa.Column("attempts", sa.Integer(), server_default="0", nullable=False),
+        sa.Column("last_error", sa.Text(), nullable=True),
+        sa.Column("dead_at", sa.DateTime(), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        op.f("ix_search_outbox_product_id"), "search_outbox", ["product_id"]
+    )
+    op.create_index(
+        "ix_search_outbox_pending", "search_outbox", ["dead_at", "available_at", "id"]
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index("ix_search_outbox_pending", table_name="search_outbox")
+    op.drop_index(op.f("ix_search_outbox_product_id"), table_name="search_outbox")
+    op.drop_table("search_outbox")
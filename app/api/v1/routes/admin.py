@@ -2,7 +2,7 @@ from fastapi import APIRouter, Depends, Query, status
 from typing import Annotated, Optional
 from datetime import datetime
 
-from app.dependencies import require_admin, get_db
+from app.dependencies import require_admin, get_db, get_read_db
 from app.services.admin_service import AdminService
 from app.schema.admin_schema import (
     DashboardOverview,
@@ -20,15 +20,19 @@ from app.schema.admin_schema import (
     BulkInventoryUpdateRequest,
     BulkInventoryUpdateResponse,
 )
+from app.schema.common_schema import CountMode, PaginationMode
 from app.schema.user_schema import UserPublic
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
 router = APIRouter(tags=["Admin"])
 
 
-def get_admin_service(db: Annotated[Session, Depends(get_db)]) -> AdminService:
+async def get_admin_service(
+    db: Annotated[AsyncSession, Depends(get_db)],
+    read_db: Annotated[AsyncSession, Depends(get_read_db)],
+) -> AdminService:
     """Dependency to get admin service"""
-    return AdminService(db=db)
+    return AdminService(db=db, read_db=read_db)
 
 
 # Analytics Endpoints
@@ -43,7 +47,7 @@ async def get_dashboard(
     current_admin: Annotated[UserPublic, Depends(require_admin)],
 ):
     """Get complete admin dashboard overview with all analytics"""
-    return admin_service.get_dashboard_overview()
+    return await admin_service.get_dashboard_overview()
 
 
 @router.get(
@@ -57,7 +61,7 @@ async def get_sales_analytics(
     current_admin: Annotated[UserPublic, Depends(require_admin)],
 ):
     """Get sales analytics"""
-    return admin_service.get_sales_analytics()
+    return await admin_service.get_sales_analytics()
 
 
 @router.get(
@@ -71,7 +75,7 @@ async def get_user_analytics(
     current_admin: Annotated[UserPublic, Depends(require_admin)],
 ):
     """Get user analytics"""
-    return admin_service.get_user_analytics()
+    return await admin_service.get_user_analytics()
 
 
 @router.get(
@@ -85,7 +89,7 @@ async def get_product_analytics(
     current_admin: Annotated[UserPublic, Depends(require_admin)],
 ):
     """Get product analytics"""
-    return admin_service.get_product_analytics()
+    return await admin_service.get_product_analytics()
 
 
 @router.get(
@@ -99,7 +103,7 @@ async def get_review_analytics(
     current_admin: Annotated[UserPublic, Depends(require_admin)],
 ):
     """Get review analytics"""
-    return admin_service.get_review_analytics()
+    return await admin_service.get_review_analytics()
 
 
 # User Management Endpoints
@@ -118,10 +122,25 @@ async def list_all_users(
     role: Optional[str] = Query(
         None, description="Filter by role: 'customer' or 'admin'"
     ),
+    pagination: PaginationMode = Query(
+        PaginationMode.OFFSET, description="'offset' or 'cursor' (no total count)"
+    ),
+    cursor: Optional[str] = Query(
+        None, max_length=512, description="Cursor from the previous page"
+    ),
+    count_mode: Optional[CountMode] = Query(
+        None, description="'exact', 'cached', 'estimated' or 'has_more'"
+    ),
 ):
     """List all users with pagination and filters"""
-    return admin_service.get_all_users(
-        page=page, page_size=page_size, search=search, role=role
+    return await admin_service.get_all_users(
+        page=page,
+        page_size=page_size,
+        search=search,
+        role=role,
+        pagination=pagination.value,
+        cursor=cursor,
+        count_mode=count_mode.value if count_mode else None,
     )
 
 
@@ -138,7 +157,9 @@ async def update_user_role(
     current_admin: Annotated[UserPublic, Depends(require_admin)],
 ):
     """Update a user's role"""
-    user = admin_service.update_user_role(user_id=user_id, new_role=role_update.role)
+    user = await admin_service.update_user_role(
+        user_id=user_id, new_role=role_update.role
+    )
     return UserPublic.model_validate(user)
 
 
@@ -159,10 +180,25 @@ async def list_all_orders(
         description="Filter by status: 'pending', 'paid', 'shipped', 'delivered', 'cancelled'",
     ),
     user_id: Optional[int] = Query(None, description="Filter by user ID"),
+    pagination: PaginationMode = Query(
+        PaginationMode.OFFSET, description="'offset' or 'cursor' (no total count)"
+    ),
+    cursor: Optional[str] = Query(
+        None, max_length=512, description="Cursor from the previous page"
+    ),
+    count_mode: Optional[CountMode] = Query(
+        None, description="'exact', 'cached', 'estimated' or 'has_more'"
+    ),
 ):
     """List all orders with pagination and filters"""
-    return admin_service.get_all_orders(
-        page=page, page_size=page_size, status=status, user_id=user_id
+    return await admin_service.get_all_orders(
+        page=page,
+        page_size=page_size,
+        status=status,
+        user_id=user_id,
+        pagination=pagination.value,
+        cursor=cursor,
+        count_mode=count_mode.value if count_mode else None,
     )
 
 
@@ -178,7 +214,7 @@ async def update_order_status(
     current_admin: Annotated[UserPublic, Depends(require_admin)],
 ):
     """Update an order's status"""
-    order = admin_service.update_order_status(
+    order = await admin_service.update_order_status(
         order_id=order_id, new_status=status_update.status
     )
     return {
@@ -200,7 +236,7 @@ async def mark_order_shipped(
     current_admin: Annotated[UserPublic, Depends(require_admin)],
 ):
     """Mark an order as shipped"""
-    order = admin_service.mark_order_shipped(
+    order = await admin_service.mark_order_shipped(
         order_id=order_id, shipped_at=shipping_data.shipped_at
     )
     return {
@@ -222,9 +258,24 @@ async def get_pending_reviews(
     current_admin: Annotated[UserPublic, Depends(require_admin)],
     page: int = Query(1, ge=1, description="Page number"),
     page_size: int = Query(20, ge=1, le=100, description="Items per page"),
+    pagination: PaginationMode = Query(
+        PaginationMode.OFFSET, description="'offset' or 'cursor' (no total count)"
+    ),
+    cursor: Optional[str] = Query(
+        None, max_length=512, description="Cursor from the previous page"
+    ),
+    count_mode: Optional[CountMode] = Query(
+        None, description="'exact', 'cached', 'estimated' or 'has_more'"
+    ),
 ):
     """Get pending reviews for moderation"""
-    return admin_service.get_pending_reviews(page=page, page_size=page_size)
+    return await admin_service.get_pending_reviews(
+        page=page,
+        page_size=page_size,
+        pagination=pagination.value,
+        cursor=cursor,
+        count_mode=count_mode.value if count_mode else None,
+    )
 
 
 @router.get(
@@ -238,9 +289,24 @@ async def get_all_reviews(
     current_admin: Annotated[UserPublic, Depends(require_admin)],
     page: int = Query(1, ge=1, description="Page number"),
     page_size: int = Query(20, ge=1, le=100, description="Items per page"),
+    pagination: PaginationMode = Query(
+        PaginationMode.OFFSET, description="'offset' or 'cursor' (no total count)"
+    ),
+    cursor: Optional[str] = Query(
+        None, max_length=512, description="Cursor from the previous page"
+    ),
+    count_mode: Optional[CountMode] = Query(
+        None, description="'exact', 'cached', 'estimated' or 'has_more'"
+    ),
 ):
     """Get all reviews"""
-    return admin_service.get_all_reviews(page=page, page_size=page_size)
+    return await admin_service.get_all_reviews(
+        page=page,
+        page_size=page_size,
+        pagination=pagination.value,
+        cursor=cursor,
+        count_mode=count_mode.value if count_mode else None,
+    )
 
 
 @router.post(
@@ -254,7 +320,7 @@ async def approve_review(
     current_admin: Annotated[UserPublic, Depends(require_admin)],
 ):
     """Approve a review"""
-    review = admin_service.approve_review(review_id=review_id)
+    review = await admin_service.approve_review(review_id=review_id)
     return {"message": "Review approved successfully", "review_id": review.id}
 
 
@@ -270,7 +336,7 @@ async def reject_review(
     current_admin: Annotated[UserPublic, Depends(require_admin)],
 ):
     """Reject/delete a review"""
-    admin_service.reject_review(review_id=review_id)
+    await admin_service.reject_review(review_id=review_id)
     return None
 
 
@@ -287,7 +353,7 @@ async def get_low_stock_alerts(
     threshold: int = Query(10, ge=1, description="Stock threshold for alerts"),
 ):
     """Get low stock product alerts"""
-    return admin_service.get_low_stock_products(threshold=threshold)
+    return await admin_service.get_low_stock_products(threshold=threshold)
 
 
 @router.patch(
@@ -302,4 +368,4 @@ async def bulk_update_inventory(
     current_admin: Annotated[UserPublic, Depends(require_admin)],
 ):
     """Bulk update product inventory"""
-    return admin_service.bulk_update_inventory(updates=update_request.updates)
+    return await admin_service.bulk_update_inventory(updates=update_request.updates)
@@ -22,9 +22,11 @@ async def get_cart(
     # Authenticated user
     if current_user:
         session_id = request.cookies.get("session_id")
-        cart_service.merge_carts(current_user.id, session_id)
+        await cart_service.merge_carts(current_user.id, session_id)
 
-        cart = cart_service.get_or_create_cart(user_id=current_user.id, session_id=None)
+        cart = await cart_service.get_or_create_cart(
+            user_id=current_user.id, session_id=None
+        )
         return cart_service.get_cart_details(cart=cart)
 
     # Anonymous user
@@ -32,7 +34,7 @@ async def get_cart(
     if not session_id:
         session_id = generate_session_id()
 
-    cart = cart_service.get_or_create_cart(user_id=None, session_id=session_id)
+    cart = await cart_service.get_or_create_cart(user_id=None, session_id=session_id)
 
     response = JSONResponse(cart_service.get_cart_details(cart=cart))
     response.set_cookie("session_id", session_id, httponly=True, max_age=1296000)
@@ -47,12 +49,16 @@ async def add_item(
     cart_service: cart_dependency,
 ):
     if current_user:
-        cart = cart_service.get_or_create_cart(user_id=current_user.id, session_id=None)
+        cart = await cart_service.get_or_create_cart(
+            user_id=current_user.id, session_id=None
+        )
     else:
         session_id = request.cookies.get("session_id") or generate_session_id()
-        cart = cart_service.get_or_create_cart(user_id=None, session_id=session_id)
+        cart = await cart_service.get_or_create_cart(
+            user_id=None, session_id=session_id
+        )
 
-    item = cart_service.add_item(cart=cart, data=data)
+    item = await cart_service.add_item(cart=cart, data=data)
     return {"message": "Item added", "item_id": item.id}
 
 
@@ -65,14 +71,18 @@ async def update_item(
     cart_service: cart_dependency,
 ):
     if current_user:
-        cart = cart_service.get_or_create_cart(user_id=current_user.id, session_id=None)
+        cart = await cart_service.get_or_create_cart(
+            user_id=current_user.id, session_id=None
+        )
         logger.info("cart with user: {cart}")
     else:
         session_id = request.cookies.get("session_id")
         logger.info(f"we are using session: {session_id}")
-        cart = cart_service.get_or_create_cart(user_id=None, session_id=session_id)
+        cart = await cart_service.get_or_create_cart(
+            user_id=None, session_id=session_id
+        )
 
-    item = cart_service.update_item(cart, item_id, data)
+    item = await cart_service.update_item(cart, item_id, data)
     return {"message": "Item updated", "item_id": item.id}
 
 
@@ -84,10 +94,14 @@ async def remove_item(
     cart_service: cart_dependency,
 ):
     if current_user:
-        cart = cart_service.get_or_create_cart(user_id=current_user.id, session_id=None)
+        cart = await cart_service.get_or_create_cart(
+            user_id=current_user.id, session_id=None
+        )
     else:
         session_id = request.cookies.get("session_id")
-        cart = cart_service.get_or_create_cart(user_id=None, session_id=session_id)
+        cart = await cart_service.get_or_create_cart(
+            user_id=None, session_id=session_id
+        )
 
-    cart_service.remove_item(cart, item_id)
+    await cart_service.remove_item(cart, item_id)
     return {"message": "Item removed"}
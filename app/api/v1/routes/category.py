@@ -29,7 +29,7 @@ async def create_category(
 ):
     """Create a category and return its public representation."""
     # If needed, use current_admin (e.g., log "Created by {current_admin.id}")
-    category = category_service.create_category(create_dto)
+    category = await category_service.create_category(create_dto)
     return category
 
 
@@ -43,7 +43,7 @@ async def get_all_categories(
     category_service: category_dependency,
 ):
     """List all categories."""
-    return category_service.get_all_categories()
+    return await category_service.get_all_categories()
 
 
 @router.get(
@@ -59,7 +59,7 @@ async def get_category_by_id(
     current_admin: admin_dependency,
 ) -> CategoryPublic:
     """Get a category by id (admin only)."""
-    category = category_service.get_category_by_id(id)
+    category = await category_service.get_category_by_id(id)
     return category
 
 
@@ -72,7 +72,7 @@ async def get_category_by_slug(
     slug: str, category_service: category_dependency, current_admin: admin_dependency
 ):
     """Get a category by slug (admin only)."""
-    category = category_service.get_category_by_slug(slug)
+    category = await category_service.get_category_by_slug(slug)
     return category
 
 
@@ -88,7 +88,7 @@ async def update_category(
     current_admin: admin_dependency,
 ):
     """Update a category by id (admin only)."""
-    updated_category = category_service.update_category(id, update_dto)
+    updated_category = await category_service.update_category(id, update_dto)
     return updated_category
 
 
@@ -103,5 +103,5 @@ async def delete_category(
     current_admin: admin_dependency,
 ):
     """Delete a category by id (admin only)."""
-    category_service.delete_category(id)
+    await category_service.delete_category(id)
     return {"detail": "category deleted successfully"}
@@ -1,12 +1,20 @@
 from typing import Annotated
 
-from fastapi import APIRouter, Body, Depends
+from fastapi import APIRouter, Depends, Query
 
-from app.dependencies import get_elastic_service_dep
+from app.dependencies import get_elastic_service_dep, get_search_service_dep
+from app.schema.search_schema import (
+    ProductFacets,
+    ProductSearchQuery,
+    ProductSearchResponse,
+    SearchSort,
+)
 from app.services.elasticsearch_service import ElasticService
+from app.services.search_service import SearchService
 
 router = APIRouter(tags=["ELastic"])
 elastic_dependency = Annotated[ElasticService, Depends(get_elastic_service_dep)]
+search_dependency = Annotated[SearchService, Depends(get_search_service_dep)]
 
 
 @router.get("/health")
@@ -14,9 +22,73 @@ async def elastic_health_check(elastic_service: elastic_dependency):
     return await elastic_service.ping()
 
 
-@router.post("/search")
-async def search(elastic_service: elastic_dependency, query: dict = Body(...)):
-    return await elastic_service.search(query)
+@router.get("/search", response_model=ProductSearchResponse)
+async def search(
+    search_service: search_dependency,
+    text: Annotated[str | None, Query(min_length=1, max_length=100)] = None,
+    category: Annotated[str | None, Query(max_length=100)] = None,
+    min_price: Annotated[float | None, Query(ge=0)] = None,
+    max_price: Annotated[float | None, Query(ge=0)] = None,
+    in_stock: bool | None = None,
+    sort: SearchSort = SearchSort.RELEVANCE,
+    size: Annotated[int, Query(ge=1, le=50)] = 20,
+    cursor: Annotated[str | None, Query(max_length=4096)] = None,
+    snapshot: bool = False,
+    highlight: bool = False,
+    facets: bool = False,
+) -> ProductSearchResponse:
+    """
+    Search products by text, category, price range and stock.
+
+    Pass `next_cursor` back as `cursor` (with the same parameters) for the
+    next page; it is null on the last one. Pages reflect the index as it is
+    when each is read; set `snapshot` on the first page to read every page
+    from the same point in time instead, in which case cursors expire after
+    a minute without use. `highlight` adds `<em>`-tagged name and description
+    fragments to each hit; `facets` adds category, price range and in-stock
+    counts over all matching products.
+    """
+    return await search_service.search_products(
+        ProductSearchQuery(
+            text=text,
+            category=category,
+            min_price=min_price,
+            max_price=max_price,
+            in_stock=in_stock,
+            sort=sort,
+            size=size,
+            cursor=cursor,
+            snapshot=snapshot,
+            highlight=highlight,
+            facets=facets,
+        )
+    )
+
+
+@router.get("/facets", response_model=ProductFacets)
+async def facets(
+    search_service: search_dependency,
+    text: Annotated[str | None, Query(min_length=1, max_length=100)] = None,
+    category: Annotated[str | None, Query(max_length=100)] = None,
+    min_price: Annotated[float | None, Query(ge=0)] = None,
+    max_price: Annotated[float | None, Query(ge=0)] = None,
+    in_stock: bool | None = None,
+) -> ProductFacets:
+    """
+    Category, price range and in-stock counts for a search, without hits.
+
+    Counts are cached for a minute per filter set and computed from the
+    database while search is unavailable.
+    """
+    return await search_service.get_facets(
+        ProductSearchQuery(
+            text=text,
+            category=category,
+            min_price=min_price,
+            max_price=max_price,
+            in_stock=in_stock,
+        )
+    )
 
 
 @router.get("/suggest")
@@ -1,6 +1,6 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from app.db.database import check_db_health
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.dependencies import get_db
 from pydantic import BaseModel
 
@@ -13,11 +13,11 @@ class HealthCheckResponseModel(BaseModel):
 
 
 @router.get("", response_model=HealthCheckResponseModel)
-async def health_check(db: Session = Depends(get_db)):
+async def health_check(db: AsyncSession = Depends(get_db)):
     """
     Endpoint to check the health status of the database connection and overall server.
     """
-    if check_db_health(db):
+    if await check_db_health(db):
         return {"status": "ok", "database": "Database status is healthy"}
     else:
         raise HTTPException(
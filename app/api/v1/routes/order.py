@@ -12,12 +12,12 @@ order_dependency = Annotated[OrderService, Depends(get_order_service_dep)]
 
 
 @router.post("", response_model=OrderResponse)
-def place_order(
+async def place_order(
     payload: OrderCreateRequest,
     current_user: user_dependency,
     order_service: order_dependency,
 ):
-    return order_service.place_order(
+    return await order_service.place_order(
         user_id=current_user.id,
         shipping_id=payload.shipping_address_id,
         billing_id=payload.billing_address_id,
@@ -25,15 +25,15 @@ def place_order(
 
 
 @router.get("", response_model=list[OrderResponse])
-def list_orders(
+async def list_orders(
     current_user: user_dependency,
     order_service: order_dependency,
 ):
-    return order_service.list_orders(current_user.id)
+    return await order_service.list_orders(current_user.id)
 
 
 @router.get("/{order_id}", response_model=OrderResponse)
-def get_single_order(
+async def get_single_order(
     current_user: user_dependency, order_service: order_dependency, order_id: int
 ):
-    return order_service.get_one_order(current_user.id, order_id)
+    return await order_service.get_one_order(current_user.id, order_id)
@@ -1,6 +1,6 @@
 from typing import Annotated
 from fastapi import APIRouter, Depends, Request, Header, HTTPException
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.dependencies import get_db, get_payment_service_dep
 from app.schema.user_schema import UserPublic
 from app.services.payment_service import PaymentService
@@ -14,12 +14,14 @@ payment_service_dep = Annotated[PaymentService, Depends(get_payment_service_dep)
 
 
 @router.post("/create-intent", response_model=PaymentIntentResponse)
-def create_payment_intent(
+async def create_payment_intent(
     payment_data: PaymentIntentCreate,
     payment_service: payment_service_dep,
     current_user=Depends(get_current_user),
 ):
-    return payment_service.create_payment_intent(current_user.id, payment_data.order_id)
+    return await payment_service.create_payment_intent(
+        current_user.id, payment_data.order_id
+    )
 
 
 @router.post("/webhook")
@@ -32,4 +34,4 @@ async def stripe_webhook(
         raise HTTPException(status_code=400, detail="Missing Stripe signature")
 
     payload = await request.body()
-    return payment_service.handle_webhook(payload, stripe_signature)
+    return await payment_service.handle_webhook(payload, stripe_signature)
@@ -1,5 +1,5 @@
 from fastapi import APIRouter, Depends, Path, Query, status
-from app.schema.common_schema import PaginatedResponse
+from app.schema.common_schema import CountMode, PaginatedResponse, PaginationMode
 from app.schema.product_schema import ProductCreate, ProductUpdate, ProductResponse
 from app.schema.search_schema import (
     AvailabilityFilter,
@@ -25,7 +25,7 @@ async def create_prodcut(
     product_service: product_dependency,
     current_admin: admin_dependency,
 ) -> ProductResponse:
-    product = product_service.create_product(create_dto)
+    product = await product_service.create_product(create_dto)
     # for traceabilty purpose
     logger.info(
         f"current user creating the product: {current_admin.id} product: {product.id}"
@@ -46,26 +46,41 @@ async def get_all_products(
     availability: AvailabilityFilter = AvailabilityFilter.ALL,
     sort_by: SortByField = SortByField.ID,
     sort_order: SortOrder = SortOrder.ASC,
+    pagination: PaginationMode = PaginationMode.OFFSET,
+    cursor: Annotated[str | None, Query(max_length=512)] = None,
+    count_mode: CountMode | None = None,
 ) -> PaginatedResponse[ProductResponse]:
     """
     Get all products with advanced filtering and sorting.
 
     **Filters:**
-    - `search`: Search in product name and description (case-insensitive)
+    - `search`: Full-text search in product name and description, served by
+      Elasticsearch; falls back to substring matching while it is
+      unavailable, and for `min_rating`, rating/popularity/created_at sorts,
+      cursor paging or pages past the 10,000th result
     - `category_id`: Filter by category
     - `min_price`, `max_price`: Price range filter
     - `min_rating`: Minimum average rating (0-5)
     - `availability`: Stock availability (all, in_stock, out_of_stock)
 
     **Sorting:**
-    - `sort_by`: Field to sort by (id, name, price, rating, popularity, created_at)
+    - `sort_by`: Field to sort by (id, name, price, rating, popularity,
+      created_at, or relevance for searches)
     - `sort_order`: Sort direction (asc, desc)
 
     **Pagination:**
     - `page`: Page number (1-indexed)
     - `per_page`: Items per page (1-100)
+    - `pagination`: `offset` (default) or `cursor`. Cursor mode skips the
+      total count and stays fast on deep pages; follow `meta.next_cursor`
+      (or `links.next`) until it is null.
+    - `cursor`: Cursor from the previous page; implies cursor mode
+    - `count_mode`: How `meta.total_items` is obtained: `exact`, `cached`
+      (short-lived Redis copy), `estimated` (planner estimate, unfiltered
+      listings only) or `has_more` (no total). `meta.count_mode` reports the
+      mode actually used; the default is configurable.
     """
-    return product_service.get_all_products(
+    return await product_service.get_all_products(
         page,
         per_page,
         search,
@@ -76,6 +91,9 @@ async def get_all_products(
         availability.value,
         sort_by.value,
         sort_order.value,
+        pagination.value,
+        cursor,
+        count_mode.value if count_mode else None,
     )
 
 
@@ -90,23 +108,43 @@ async def get_product_autocomplete(
     **Requirements:**
     - Query must be at least 2 characters
     - Returns maximum 10 suggestions
-    - Results are cached for 1 hour
+    - Answered from an in-memory index kept current on product writes;
+      while it loads, results are cached for 10 minutes, or until a
+      product name changes
 
     **Matching:**
-    - Prioritizes products that start with the query
-    - Falls back to products containing the query
-    - Case-insensitive matching
+    - Product names with a word sequence starting with the query, case- and
+      accent-insensitive, most popular first
+    - While search is unavailable: products whose name starts with the
+      query, then products containing it
     """
     suggestions = await product_service.get_autocomplete_suggestions(q)
     return ProductAutocompleteResponse(suggestions=suggestions)
 
 
+@router.get("/batch", response_model=List[ProductResponse])
+async def get_products_batch(
+    product_service: product_dependency,
+    ids: Annotated[
+        List[int], Query(min_length=1, max_length=100, description="Product ids")
+    ],
+) -> List[ProductResponse]:
+    """
+    Get several products by id in one request, e.g. `?ids=3&ids=7&ids=12`.
+
+    Products are returned in the requested order; unknown ids are skipped.
+    Use this to render carts, wishlists and orders instead of one request
+    per product.
+    """
+    return await product_service.get_products_by_ids(ids)
+
+
 @router.get("/category/{slug}", response_model=List[ProductResponse])
 async def get_products_by_category_slug(
     slug: Annotated[str, Path(title="The category slug")],
     product_service: product_dependency,
 ) -> List[ProductResponse]:
-    return product_service.get_products_by_category_slug(slug)
+    return await product_service.get_products_by_category_slug(slug)
 
 
 @router.get("/id/{id}", response_model=ProductResponse)
@@ -121,7 +159,7 @@ async def get_product_by_slug(
     slug: Annotated[str, Path(title="The slug of the item to get")],
     product_service: product_dependency,
 ) -> ProductResponse:
-    return product_service.get_product_by_slug(slug)
+    return await product_service.get_product_by_slug(slug)
 
 
 @router.put("/{id}", response_model=ProductResponse)
@@ -131,12 +169,12 @@ async def update_product(
     product_service: product_dependency,
     current_admin: admin_dependency,
 ) -> ProductResponse:
-    return product_service.update_product(id, update_dto)
+    return await product_service.update_product(id, update_dto)
 
 
 @router.delete("/{id}")
 async def delete_product(
     id: int, product_service: product_dependency, current_admin: admin_dependency
 ):
-    product_service.delete_product(id)
+    await product_service.delete_product(id)
     return {"detail": "product deleted successfully"}
@@ -51,7 +51,7 @@ async def create_user(
     Raises:
     - HTTPException: If validation fails or a conflict occurs (e.g., duplicate email).
     """
-    user = user_service.create_user(create_user_data)
+    user = await user_service.create_user(create_user_data)
     return user
 
 
@@ -80,7 +80,7 @@ async def login(
     Raises:
     - HTTPException: If credentials are invalid (e.g., 401 Unauthorized).
     """
-    return user_service.login(user_login_data=user_login_data)
+    return await user_service.login(user_login_data=user_login_data)
 
 
 @router.get(
@@ -137,7 +137,7 @@ async def update_user(
     Raises:
     - HTTPException: If validation fails or the update operation encounters an error.
     """
-    updated_user = user_service.update_user(
+    updated_user = await user_service.update_user(
         id=current_user.id, update_user_data=update_user_data
     )
     return updated_user
@@ -171,7 +171,7 @@ async def delete_user(
     Raises:
     - HTTPException: If the user lacks permission or deletion fails (e.g., 403 Forbidden).
     """
-    user_service.delete_user(id=current_user.id)
+    await user_service.delete_user(id=current_user.id)
     return {"detail": "User deleted successfully"}
 
 
@@ -207,7 +207,9 @@ async def add_address_to_user(
     is_first = False
     if not current_user.addresses:
         is_first = True
-    address = address_service.add_address(user_id, is_first, address_data=address_data)
+    address = await address_service.add_address(
+        user_id, is_first, address_data=address_data
+    )
     return address
 
 
@@ -244,5 +246,5 @@ async def update_address(
     if not address_data:
         raise HTTPException(status_code=400, detail="No data provided for update")
 
-    address = address_service.update_address(address_id, address_data)
+    address = await address_service.update_address(address_id, address_data)
     return address
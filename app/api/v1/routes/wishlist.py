@@ -10,12 +10,14 @@ from app.schema.wishlist_schema import (
     WishlistActionResponse,
 )
 from app.schema.user_schema import UserPublic
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
 router = APIRouter(tags=["Wishlist"])
 
 
-def get_wishlist_service(db: Annotated[Session, Depends(get_db)]) -> WishlistService:
+async def get_wishlist_service(
+    db: Annotated[AsyncSession, Depends(get_db)],
+) -> WishlistService:
     """Dependency to get wishlist service"""
     return WishlistService(db=db)
 
@@ -31,7 +33,7 @@ async def get_wishlist(
     current_user: Annotated[UserPublic, Depends(get_current_user)],
 ):
     """Get user's wishlist with product details"""
-    return wishlist_service.get_wishlist(user_id=current_user.id)
+    return await wishlist_service.get_wishlist(user_id=current_user.id)
 
 
 @router.post(
@@ -47,7 +49,7 @@ async def add_to_wishlist(
     current_user: Annotated[UserPublic, Depends(get_current_user)],
 ):
     """Add a product to wishlist"""
-    return wishlist_service.add_product_to_wishlist(
+    return await wishlist_service.add_product_to_wishlist(
         user_id=current_user.id, product_id=request.product_id
     )
 
@@ -64,7 +66,7 @@ async def remove_from_wishlist(
     current_user: Annotated[UserPublic, Depends(get_current_user)],
 ):
     """Remove a product from wishlist"""
-    return wishlist_service.remove_product_from_wishlist(
+    return await wishlist_service.remove_product_from_wishlist(
         user_id=current_user.id, product_id=product_id
     )
 
@@ -80,7 +82,7 @@ async def clear_wishlist(
     current_user: Annotated[UserPublic, Depends(get_current_user)],
 ):
     """Clear entire wishlist"""
-    return wishlist_service.clear_wishlist(user_id=current_user.id)
+    return await wishlist_service.clear_wishlist(user_id=current_user.id)
 
 
 @router.get(
@@ -94,7 +96,7 @@ async def get_wishlist_count(
     current_user: Annotated[UserPublic, Depends(get_current_user)],
 ):
     """Get count of items in wishlist"""
-    return wishlist_service.get_wishlist_count(user_id=current_user.id)
+    return await wishlist_service.get_wishlist_count(user_id=current_user.id)
 
 
 @router.post(
@@ -109,4 +111,6 @@ async def move_to_cart(
     current_user: Annotated[UserPublic, Depends(get_current_user)],
 ):
     """Move a wishlist item to shopping cart"""
-    return wishlist_service.move_to_cart(user_id=current_user.id, product_id=product_id)
+    return await wishlist_service.move_to_cart(
+        user_id=current_user.id, product_id=product_id
+    )
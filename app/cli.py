@@ -0,0 +1,106 @@
+"""
+Operational commands, run from the project root:
+
+    python -m app.cli backfill-ratings
+    python -m app.cli recompute-popularity
+    python -m app.cli warm-cache
+    python -m app.cli reindex-search
+    python -m app.cli requeue-search-outbox
+    python -m app.cli bench-autocomplete
+"""
+
+import argparse
+import asyncio
+from typing import Awaitable, Callable, Dict, Optional, Sequence
+
+from app.core.config import settings
+from app.core.elastic_config import close_es_client, get_es_client
+from app.core.logger import logger
+from app.core.redis import redis_client
+from app.crud.product import ProductCrud
+from app.db.database import AsyncSessionLocal, async_engine
+from app.jobs import autocomplete_benchmark, cache_warmup, search_index, search_sync
+
+
+async def backfill_ratings() -> None:
+    """Recompute the denormalized rating columns on products from reviews."""
+    async with AsyncSessionLocal() as db:
+        updated = await ProductCrud(db=db).recompute_rating_aggregates()
+    logger.info(f"Recomputed rating aggregates for {updated} products")
+
+
+async def recompute_popularity() -> None:
+    """Rebuild sales_count and the forward-decayed popularity from order items."""
+    async with AsyncSessionLocal() as db:
+        updated = await ProductCrud(db=db).recompute_sales_stats(
+            settings.POPULARITY_HALF_LIFE_DAYS
+        )
+    logger.info(f"Recomputed sales stats for {updated} products with sales")
+    # Only order-driven changes reach the index through the outbox
+    logger.info("Run reindex-search to rank autocomplete by the new scores")
+
+
+async def warm_cache() -> None:
+    """Preload popular products, listings and autocomplete into the cache."""
+    await redis_client.connect()
+    try:
+        await cache_warmup.warm_cache()
+    finally:
+        await redis_client.close()
+
+
+async def reindex_search() -> None:
+    """Rebuild the products search index and swap the alias to it."""
+    await redis_client.connect()
+    try:
+        es = await get_es_client()
+        await search_index.ensure_product_index(es, force=True)
+    finally:
+        await close_es_client()
+        await redis_client.close()
+
+
+async def requeue_search_outbox() -> None:
+    """Retry dead-lettered search index updates."""
+    requeued = await search_sync.requeue_dead_letters()
+    logger.info(f"Requeued {requeued} dead-lettered search outbox rows")
+
+
+async def bench_autocomplete() -> None:
+    """Compare autocomplete latency of the SQL, completion and n-gram paths."""
+    try:
+        es = await get_es_client()
+        await autocomplete_benchmark.benchmark_autocomplete(es)
+    finally:
+        await close_es_client()
+
+
+COMMANDS: Dict[str, Callable[[], Awaitable[None]]] = {
+    "backfill-ratings": backfill_ratings,
+    "recompute-popularity": recompute_popularity,
+    "warm-cache": warm_cache,
+    "reindex-search": reindex_search,
+    "requeue-search-outbox": requeue_search_outbox,
+    "bench-autocomplete": bench_autocomplete,
+}
+
+
+async def _run(command: Callable[[], Awaitable[None]]) -> None:
+    try:
+        await command()
+    finally:
+        await async_engine.dispose()
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(prog="python -m app.cli")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    for name, command in COMMANDS.items():
+        subparsers.add_parser(name, help=command.__doc__)
+
+    args = parser.parse_args(argv)
+    asyncio.run(_run(COMMANDS[args.command]))
+
+
+if __name__ == "__main__":
+    main()
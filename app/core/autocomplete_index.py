@@ -0,0 +1,243 @@
+"""
+Per-worker autocomplete index: active product names in a PrefixTrie.
+
+GET /product/autocomplete is answered from memory in microseconds, with no
+database query and no per-query cache key. A name ranks by the highest
+popularity among the active products carrying it.
+
+- Loading: a worker starts from the Redis snapshot another worker wrote in
+  the last AUTOCOMPLETE_TRIE_SNAPSHOT_TTL_SECONDS, or else reads the
+  products from the database and writes a new snapshot. The trie is built
+  in a thread and swapped in whole; until the first load completes, the
+  cached search/SQL path answers instead.
+- Changes: product writes apply the change locally and publish it on
+  AUTOCOMPLETE_TRIE_CHANNEL; every worker applies it to its own trie.
+- Refresh: every AUTOCOMPLETE_TRIE_REFRESH_SECONDS, and after the change
+  listener reconnects, the trie is rebuilt from the database. This repairs
+  missed messages and picks up popularity changes from orders.
+"""
+
+import asyncio
+import json
+import time
+from contextlib import suppress
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import select
+
+from app.core.config import settings
+from app.core.logger import logger
+from app.core.redis import redis_client
+from app.db.database import AsyncSessionLocal
+from app.models.product import Product
+from app.utils.prefix_trie import PrefixTrie
+
+SNAPSHOT_KEY = "autocomplete:trie:snapshot"
+SUGGESTIONS = 10
+# Wait before retrying a load that failed
+RETRY_SECONDS = 30
+
+# (product id, name, popularity)
+Entry = Tuple[int, str, float]
+
+
+class ProductNames:
+    """The trie plus the products behind each name, to keep scores exact."""
+
+    def __init__(self, entries: Iterable[Entry] = ()):
+        self.products: Dict[int, Tuple[str, float]] = {}
+        self.by_name: Dict[str, Dict[int, float]] = {}
+        for product_id, name, popularity in entries:
+            self.products[product_id] = (name, popularity)
+            self.by_name.setdefault(name, {})[product_id] = popularity
+        self.trie = PrefixTrie.build(
+            ((name, max(ids.values())) for name, ids in self.by_name.items()),
+            k=SUGGESTIONS,
+            max_depth=settings.AUTOCOMPLETE_TRIE_MAX_DEPTH,
+        )
+
+    def set(self, product_id: int, name: Optional[str], popularity: float) -> None:
+        """Index the product under ``name``; None removes it."""
+        previous = self.products.pop(product_id, None)
+        if previous is not None:
+            ids = self.by_name[previous[0]]
+            del ids[product_id]
+            if ids:
+                self.trie.set(previous[0], max(ids.values()))
+            else:
+                del self.by_name[previous[0]]
+                self.trie.remove(previous[0])
+        if name is not None:
+            self.products[product_id] = (name, popularity)
+            ids = self.by_name.setdefault(name, {})
+            ids[product_id] = popularity
+            self.trie.set(name, max(ids.values()))
+
+
+class AutocompleteIndex:
+    def __init__(self) -> None:
+        self.names: Optional[ProductNames] = None
+        # Changes received while a load is in progress, replayed on its result
+        self._pending: Optional[List[Entry]] = None
+        self._reload = asyncio.Event()
+
+    @property
+    def ready(self) -> bool:
+        return self.names is not None
+
+    def complete(self, query: str, k: int = SUGGESTIONS) -> List[str]:
+        return self.names.trie.complete(query, k) if self.names is not None else []
+
+    def apply(self, product_id: int, name: Optional[str], popularity: float) -> None:
+        if self._pending is not None:
+            self._pending.append((product_id, name, popularity))
+        if self.names is not None:
+            self.names.set(product_id, name, popularity)
+
+    async def product_changed(
+        self, product_id: int, name: Optional[str], popularity: float = 0.0
+    ) -> None:
+        """
+        Record a product write in this worker and every other one; ``name``
+        is None for products deleted or deactivated.
+        """
+        if not settings.AUTOCOMPLETE_TRIE_ENABLED:
+            return
+        self.apply(product_id, name, popularity)
+        if not redis_client.available:
+            # The other workers catch up at their next refresh
+            return
+        try:
+            await redis_client.client.publish(
+                settings.AUTOCOMPLETE_TRIE_CHANNEL,
+                json.dumps({"id": product_id, "name": name, "popularity": popularity}),
+            )
+        except Exception as e:
+            # The other workers catch up at their next refresh
+            logger.warning(f"Failed to publish autocomplete change: {e}")
+
+    async def product_saved(self, product: Product) -> None:
+        """product_changed for a created or updated product."""
+        await self.product_changed(
+            product.id,
+            product.name if product.is_active else None,
+            product.popularity or 0.0,
+        )
+
+    async def load(self, use_snapshot: bool = True) -> None:
+        """Build a new trie and swap it in; see the module docstring."""
+        started = time.monotonic()
+        self._pending = []
+        try:
+            entries = await _read_snapshot() if use_snapshot else None
+            source = "snapshot"
+            if entries is None:
+                entries = await read_products()
+                source = "database"
+                await _write_snapshot(entries)
+            names = await asyncio.to_thread(ProductNames, entries)
+            # No await from here on: nothing can slip in before the swap
+            for change in self._pending:
+                names.set(*change)
+            self.names = names
+        finally:
+            self._pending = None
+        logger.info(
+            f"Autocomplete trie loaded from {source}: {len(names.trie)} names "
+            f"in {time.monotonic() - started:.2f}s"
+        )
+
+    async def run(self) -> None:
+        """Background task started in lifespan; runs until cancelled."""
+        listener = asyncio.create_task(self._listen())
+        use_snapshot = True
+        try:
+            while True:
+                try:
+                    await self.load(use_snapshot)
+                    use_snapshot = False
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    logger.warning(f"Autocomplete trie load failed: {e}")
+                delay = (
+                    settings.AUTOCOMPLETE_TRIE_REFRESH_SECONDS
+                    if self.ready
+                    else RETRY_SECONDS
+                )
+                with suppress(asyncio.TimeoutError):
+                    await asyncio.wait_for(self._reload.wait(), delay)
+                self._reload.clear()
+        finally:
+            listener.cancel()
+            with suppress(asyncio.CancelledError):
+                await listener
+
+    async def _listen(self) -> None:
+        """Apply the changes published by every worker."""
+        delay = 0.5
+        subscribed_before = False
+        while True:
+            if not redis_client.available:
+                subscribed_before = True
+                await asyncio.sleep(1.0)
+                continue
+            try:
+                async with redis_client.client.pubsub() as pubsub:
+                    await pubsub.subscribe(settings.AUTOCOMPLETE_TRIE_CHANNEL)
+                    # Changes sent while unsubscribed are lost: rebuild
+                    if subscribed_before:
+                        self._reload.set()
+                    subscribed_before = True
+                    delay = 0.5
+                    while True:
+                        message = await pubsub.get_message(
+                            ignore_subscribe_messages=True, timeout=1.0
+                        )
+                        if message is not None and message["type"] == "message":
+                            change = json.loads(message["data"])
+                            self.apply(
+                                change["id"], change["name"], change["popularity"]
+                            )
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Autocomplete change listener failed: {e}")
+                subscribed_before = True
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, 30)
+
+
+async def read_products() -> List[Entry]:
+    async with AsyncSessionLocal() as db:
+        rows = await db.execute(
+            select(Product.id, Product.name, Product.popularity).where(
+                Product.is_active == True
+            )
+        )
+        return [(row.id, row.name, row.popularity or 0.0) for row in rows]
+
+
+async def _read_snapshot() -> Optional[List[Entry]]:
+    try:
+        snapshot = await redis_client.get_json(SNAPSHOT_KEY)
+    except Exception as e:
+        logger.warning(f"Autocomplete snapshot unavailable: {e}")
+        return None
+    if not snapshot:
+        return None
+    return [tuple(entry) for entry in snapshot["products"]]
+
+
+async def _write_snapshot(entries: List[Entry]) -> None:
+    try:
+        await redis_client.set_json(
+            SNAPSHOT_KEY,
+            {"built_at": time.time(), "products": entries},
+            ex=settings.AUTOCOMPLETE_TRIE_SNAPSHOT_TTL_SECONDS,
+        )
+    except Exception as e:
+        logger.warning(f"Failed to write autocomplete snapshot: {e}")
+
+
+autocomplete_index = AutocompleteIndex()
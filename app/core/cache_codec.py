@@ -0,0 +1,205 @@
+"""
+Serialization of values cached in Redis.
+
+Every value is stored as a small frame::
+
+    <format version: 1 byte><codec id: 1 byte><compression id: 1 byte><payload>
+
+The header records how the payload was written, so readers decode values
+written under any codec or compression setting: changing CACHE_CODEC or
+CACHE_COMPRESSION is safe while old values are still cached. Values with an
+unknown format version (older releases, other writers) read as misses;
+bump FORMAT_VERSION when the frame layout changes.
+
+orjson, msgpack, zstandard and lz4 are declared dependencies. Where the
+configured one cannot be imported (no wheel for the platform, a trimmed
+install) the codec falls back to stdlib json and no compression, with a
+warning at startup.
+"""
+
+import json
+import time
+import zlib
+from typing import Any, Callable, Dict, NamedTuple, Optional
+
+from prometheus_client import Counter, Histogram
+
+from app.core.config import settings
+from app.core.logger import logger
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:  # pragma: no cover - optional dependency
+    msgpack = None
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - optional dependency
+    zstandard = None
+
+try:
+    import lz4.frame as lz4_frame
+except ImportError:  # pragma: no cover - optional dependency
+    lz4_frame = None
+
+FORMAT_VERSION = 1
+
+CACHE_PAYLOAD_BYTES = Histogram(
+    "cache_payload_bytes",
+    "Size of values written to the Redis cache, after compression",
+    ["codec", "compression"],
+    buckets=(64, 256, 1024, 4096, 16384, 65536, 262144, 1048576),
+)
+CACHE_CODEC_SECONDS = Histogram(
+    "cache_codec_seconds",
+    "Time spent serializing and deserializing cached values",
+    ["codec", "operation"],
+    buckets=(0.00001, 0.00005, 0.0001, 0.0005, 0.001, 0.005, 0.01, 0.05),
+)
+CACHE_DECODE_ERRORS = Counter(
+    "cache_decode_errors_total",
+    "Cached values that could not be decoded and were treated as misses",
+)
+
+
+class CodecError(ValueError):
+    """A cached value was not written by a known codec and format version."""
+
+
+class Format(NamedTuple):
+    id: int
+    dumps: Callable[[Any], bytes]
+    loads: Callable[[bytes], Any]
+
+
+def _json_dumps(value: Any) -> bytes:
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":")).encode()
+
+
+def _available_codecs() -> Dict[str, Format]:
+    codecs = {"json": Format(1, _json_dumps, json.loads)}
+    if orjson is not None:
+        codecs["orjson"] = Format(2, orjson.dumps, orjson.loads)
+    if msgpack is not None:
+        codecs["msgpack"] = Format(
+            3,
+            lambda value: msgpack.packb(value, use_bin_type=True),
+            lambda data: msgpack.unpackb(data, raw=False),
+        )
+    return codecs
+
+
+def _available_compressors() -> Dict[str, Format]:
+    compressors = {
+        "none": Format(0, bytes, bytes),
+        "zlib": Format(1, zlib.compress, zlib.decompress),
+    }
+    if zstandard is not None:
+        compressors["zstd"] = Format(
+            2,
+            zstandard.ZstdCompressor(level=3).compress,
+            zstandard.ZstdDecompressor().decompress,
+        )
+    if lz4_frame is not None:
+        compressors["lz4"] = Format(3, lz4_frame.compress, lz4_frame.decompress)
+    return compressors
+
+
+def _resolve(kind: str, name: str, available: Dict[str, Format], fallback: str):
+    if name in available:
+        return name
+    logger.warning(f"Cache {kind} {name!r} unavailable, using {fallback!r}")
+    return fallback
+
+
+class CacheCodec:
+    """
+    Encodes values to framed bytes and back.
+
+    ``compression`` applies only to payloads of at least
+    ``compress_min_bytes``, and only when it makes them smaller; small
+    values are not worth the CPU.
+    """
+
+    def __init__(
+        self,
+        codec: str = "orjson",
+        compression: str = "none",
+        compress_min_bytes: int = 1024,
+    ):
+        self._codecs = _available_codecs()
+        self._compressors = _available_compressors()
+        self._by_id = {fmt.id: name for name, fmt in self._codecs.items()}
+        self._compressors_by_id = {
+            fmt.id: name for name, fmt in self._compressors.items()
+        }
+        self.codec = _resolve("codec", codec, self._codecs, "json")
+        self.compression = _resolve(
+            "compression", compression, self._compressors, "none"
+        )
+        self.compress_min_bytes = compress_min_bytes
+
+    def encode(self, value: Any) -> bytes:
+        codec = self._codecs[self.codec]
+        started = time.perf_counter()
+        payload = codec.dumps(value)
+        compression = "none"
+        if self.compression != "none" and len(payload) >= self.compress_min_bytes:
+            compressed = self._compressors[self.compression].dumps(payload)
+            if len(compressed) < len(payload):
+                payload, compression = compressed, self.compression
+        CACHE_CODEC_SECONDS.labels(codec=self.codec, operation="encode").observe(
+            time.perf_counter() - started
+        )
+        header = bytes((FORMAT_VERSION, codec.id, self._compressors[compression].id))
+        CACHE_PAYLOAD_BYTES.labels(codec=self.codec, compression=compression).observe(
+            len(payload) + len(header)
+        )
+        return header + payload
+
+    def decode(self, data: bytes | str) -> Any:
+        """Decode a frame from encode; raises CodecError if it is not one."""
+        if isinstance(data, str):
+            data = data.encode()
+        if len(data) < 3 or data[0] != FORMAT_VERSION:
+            raise CodecError("unknown cache format version")
+        codec = self._by_id.get(data[1])
+        compression = self._compressors_by_id.get(data[2])
+        if codec is None or compression is None:
+            raise CodecError(
+                f"cached value uses an unavailable codec ({data[1]}, {data[2]})"
+            )
+        started = time.perf_counter()
+        try:
+            payload = self._compressors[compression].loads(data[3:])
+            value = self._codecs[codec].loads(payload)
+        except Exception as e:
+            raise CodecError(f"corrupt cached value: {e}") from e
+        CACHE_CODEC_SECONDS.labels(codec=codec, operation="decode").observe(
+            time.perf_counter() - started
+        )
+        return value
+
+    def try_decode(self, data: Optional[bytes | str], key: str) -> Any:
+        """decode, with undecodable values (and None) read as misses."""
+        if data is None:
+            return None
+        try:
+            return self.decode(data)
+        except CodecError as e:
+            CACHE_DECODE_ERRORS.inc()
+            logger.warning(f"Ignoring cached value for {key}: {e}")
+            return None
+
+
+def default_codec() -> CacheCodec:
+    return CacheCodec(
+        codec=settings.CACHE_CODEC,
+        compression=settings.CACHE_COMPRESSION,
+        compress_min_bytes=settings.CACHE_COMPRESS_MIN_BYTES,
+    )
@@ -0,0 +1,168 @@
+"""
+Declarative caching for service methods::
+
+    @cached("categories", ttl="CATEGORY_CACHE_TTL_SECONDS", tags=["categories"])
+    async def get_all_categories(self) -> list[CategoryPublic]: ...
+
+Async methods are cached in Redis through RedisClient.get_or_set, so they
+get its single-flight, early refresh and stale serving, and the L1 tier when
+it is enabled. Results are stored through a pydantic TypeAdapter built from
+the return annotation and are returned as validated models on every call.
+
+- ``ttl``: seconds, or the name of a setting holding them (read per call).
+- ``key``: template formatted with the call's arguments (``self``
+  excluded); defaults to ``cached:<name>:<arg>=<value>:...``.
+- ``tags``: templates formatted the same way; invalidate_cached drops every
+  entry carrying one of the resulting tags.
+- ``negative_ttl``: cache 404 HTTPExceptions this long (seconds or a
+  setting name), so lookups of missing rows do not hit the database.
+
+Only async methods can be decorated: a sync method cannot wait on Redis.
+"""
+
+import functools
+import hashlib
+import inspect
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence
+
+from fastapi import HTTPException, status
+from prometheus_client import Counter, Histogram
+from pydantic import TypeAdapter
+
+from app.core.config import settings
+from app.core.logger import logger
+from app.core.redis import redis_client
+
+CACHED_PREFIX = "cached"
+# Marks a cached 404 in place of a value
+NEGATIVE_MARKER = "__cached_status__"
+
+CACHED_CALLS = Counter(
+    "cached_calls_total",
+    "Calls to @cached methods by cache name and result (hit, miss, error)",
+    ["cache", "result"],
+)
+CACHED_CALL_SECONDS = Histogram(
+    "cached_call_seconds",
+    "Latency of @cached methods, including the load on a miss",
+    ["cache"],
+    buckets=(0.0001, 0.0005, 0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1),
+)
+
+
+def _is_negative(value: Any) -> bool:
+    return isinstance(value, dict) and NEGATIVE_MARKER in value
+
+
+def _seconds(ttl: int | str) -> int:
+    return getattr(settings, ttl) if isinstance(ttl, str) else ttl
+
+
+def _default_key(name: str, arguments: Dict[str, Any]) -> str:
+    suffix = ":".join(f"{k}={v}" for k, v in arguments.items())
+    if len(suffix) > 200:
+        suffix = hashlib.sha1(suffix.encode()).hexdigest()
+    return f"{CACHED_PREFIX}:{name}:{suffix}" if suffix else f"{CACHED_PREFIX}:{name}"
+
+
+def cached(
+    name: str,
+    ttl: int | str,
+    key: Optional[str] = None,
+    tags: Sequence[str] = (),
+    negative_ttl: Optional[int | str] = None,
+) -> Callable:
+    """Cache a service method's results; see the module docstring."""
+
+    def decorator(func: Callable) -> Callable:
+        if not inspect.iscoroutinefunction(func):
+            raise TypeError(f"@cached needs an async method, got {func.__qualname__}")
+        signature = inspect.signature(func)
+        adapter: Optional[TypeAdapter] = None
+
+        def get_adapter() -> TypeAdapter:
+            # Built lazily: return annotations may reference later imports
+            nonlocal adapter
+            if adapter is None:
+                hints = inspect.get_annotations(func, eval_str=True)
+                adapter = TypeAdapter(hints.get("return", Any))
+            return adapter
+
+        def resolve(args: tuple, kwargs: dict) -> tuple[str, List[str]]:
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            arguments = dict(bound.arguments)
+            arguments.pop("self", None)
+            cache_key = (
+                key.format(**arguments) if key else _default_key(name, arguments)
+            )
+            return cache_key, [tag.format(**arguments) for tag in tags]
+
+        def dump(result: Any) -> Any:
+            validated = get_adapter().validate_python(result, from_attributes=True)
+            return get_adapter().dump_python(validated, mode="json")
+
+        def restore(value: Any) -> Any:
+            if _is_negative(value):
+                raise HTTPException(
+                    status_code=value[NEGATIVE_MARKER], detail=value.get("detail")
+                )
+            return get_adapter().validate_python(value)
+
+        def negative(e: HTTPException) -> Optional[dict]:
+            if negative_ttl and e.status_code == status.HTTP_404_NOT_FOUND:
+                return {NEGATIVE_MARKER: e.status_code, "detail": e.detail}
+            return None
+
+        def ttl_for(value: Any) -> int:
+            return _seconds(negative_ttl if _is_negative(value) else ttl)
+
+        def record(result: str, started: float) -> None:
+            CACHED_CALLS.labels(cache=name, result=result).inc()
+            CACHED_CALL_SECONDS.labels(cache=name).observe(
+                time.perf_counter() - started
+            )
+
+        @functools.wraps(func)
+        async def async_wrapper(*args, **kwargs):
+            started = time.perf_counter()
+            cache_key, cache_tags = resolve(args, kwargs)
+            loaded = False
+
+            async def load() -> Any:
+                nonlocal loaded
+                loaded = True
+                try:
+                    return dump(await func(*args, **kwargs))
+                except HTTPException as e:
+                    marker = negative(e)
+                    if marker is None:
+                        raise
+                    return marker
+
+            try:
+                value = await redis_client.get_or_set(
+                    cache_key, load, ex=ttl_for, tags=cache_tags
+                )
+            except HTTPException:
+                record("miss", started)
+                raise
+            except Exception:
+                record("error", started)
+                raise
+            record("miss" if loaded else "hit", started)
+            return restore(value)
+
+        return async_wrapper
+
+    return decorator
+
+
+async def invalidate_cached(tags: Iterable[str]) -> None:
+    """Drop every @cached result carrying one of ``tags``; fails open."""
+    tags = list(tags)
+    try:
+        await redis_client.invalidate_tags(tags)
+    except Exception as e:
+        logger.warning(f"Failed to invalidate cached results {tags}: {e}")
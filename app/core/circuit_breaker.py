@@ -0,0 +1,144 @@
+"""
+Circuit breaker for calls to a dependency that may become unavailable.
+
+- closed: calls go through. ``failure_threshold`` consecutive failures open
+  the breaker.
+- open: calls fail immediately with CircuitOpenError, so callers fall back
+  without each waiting for a timeout first.
+- half-open: ``reset_timeout`` seconds after opening, a single trial call is
+  let through; success closes the breaker, failure opens it again.
+
+Only errors in ``failure_types`` (connection errors, timeouts) count as
+failures: any other error means the dependency answered.
+"""
+
+import time
+from typing import Awaitable, Callable, Optional, Tuple, Type, TypeVar
+
+from prometheus_client import Counter, Gauge
+
+from app.core.logger import logger
+
+T = TypeVar("T")
+
+CLOSED = "closed"
+HALF_OPEN = "half_open"
+OPEN = "open"
+
+# Gauge values, so dashboards can plot the state over time
+_STATE_VALUES = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}
+
+BREAKER_STATE = Gauge(
+    "circuit_breaker_state",
+    "Circuit breaker state (0 closed, 1 half-open, 2 open)",
+    ["breaker"],
+)
+BREAKER_TRANSITIONS = Counter(
+    "circuit_breaker_transitions_total",
+    "Circuit breaker state changes, by the state entered",
+    ["breaker", "state"],
+)
+BREAKER_REJECTED = Counter(
+    "circuit_breaker_rejected_total",
+    "Calls failed fast because the circuit breaker was open",
+    ["breaker"],
+)
+
+
+class CircuitOpenError(ConnectionError):
+    """The breaker is open; the call was not attempted."""
+
+
+class CircuitBreaker:
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int = 5,
+        reset_timeout: float = 5.0,
+        failure_types: Tuple[Type[BaseException], ...] = (ConnectionError,),
+        on_open: Optional[Callable[[], None]] = None,
+    ):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failure_types = failure_types
+        self.on_open = on_open
+        self._state = CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probing = False
+        BREAKER_STATE.labels(breaker=name).set(_STATE_VALUES[CLOSED])
+
+    @property
+    def state(self) -> str:
+        if (
+            self._state == OPEN
+            and time.monotonic() - self._opened_at >= self.reset_timeout
+        ):
+            self._transition(HALF_OPEN)
+        return self._state
+
+    @property
+    def is_closed(self) -> bool:
+        return self.state == CLOSED
+
+    def allow(self) -> bool:
+        """Whether a call may go ahead now; claims the trial when half-open."""
+        state = self.state
+        if state == CLOSED:
+            return True
+        if state == HALF_OPEN and not self._probing:
+            self._probing = True
+            return True
+        BREAKER_REJECTED.labels(breaker=self.name).inc()
+        return False
+
+    def record_success(self) -> None:
+        self._failures = 0
+        self._probing = False
+        if self._state != CLOSED:
+            logger.info(f"Circuit breaker {self.name} closed")
+            self._transition(CLOSED)
+
+    def record_failure(self) -> None:
+        self._failures += 1
+        self._probing = False
+        if self._state == HALF_OPEN or self._failures >= self.failure_threshold:
+            self.trip()
+
+    def trip(self) -> None:
+        """Open the breaker now, e.g. when the dependency is down at startup."""
+        self._opened_at = time.monotonic()
+        self._probing = False
+        if self._state != OPEN:
+            logger.warning(
+                f"Circuit breaker {self.name} opened for {self.reset_timeout}s"
+            )
+            self._transition(OPEN)
+            if self.on_open is not None:
+                self.on_open()
+
+    async def call(self, func: Callable[..., Awaitable[T]], *args, **kwargs) -> T:
+        """Await ``func(*args, **kwargs)`` through the breaker."""
+        if not self.allow():
+            raise CircuitOpenError(f"{self.name} circuit breaker is open")
+        trial = self._state == HALF_OPEN
+        try:
+            result = await func(*args, **kwargs)
+        except self.failure_types:
+            self.record_failure()
+            raise
+        except Exception:
+            self.record_success()
+            raise
+        finally:
+            # A cancelled trial must not keep the breaker half-open forever
+            if trial:
+                self._probing = False
+        self.record_success()
+        return result
+
+    def _transition(self, state: str) -> None:
+        self._state = state
+        BREAKER_STATE.labels(breaker=self.name).set(_STATE_VALUES[state])
+        BREAKER_TRANSITIONS.labels(breaker=self.name, state=state).inc()
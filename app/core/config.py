@@ -3,13 +3,128 @@ from pydantic_settings import BaseSettings, SettingsConfigDict
 
 class Setting(BaseSettings):
     Database_url: str = ""
+    # Optional explicit async URL; derived from Database_url when empty
+    ASYNC_DATABASE_URL: str = ""
+    # Connection pool (ignored for in-memory sqlite)
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: float = 30.0
+    DB_POOL_RECYCLE: int = 1800
+    DB_POOL_PRE_PING: bool = True
+    # Connections opened in lifespan before serving traffic; 0 disables
+    DB_POOL_WARMUP: int = 5
+    # Optional read replica; read-only queries fall back to the primary when
+    # it is unset, unreachable or lagging more than REPLICA_MAX_LAG_SECONDS
+    REPLICA_DATABASE_URL: str = ""
+    REPLICA_MAX_LAG_SECONDS: float = 5.0
+    REPLICA_CHECK_INTERVAL_SECONDS: float = 10.0
+    REPLICA_CHECK_TIMEOUT_SECONDS: float = 1.0
+    # Per-request query tracking: statement shapes repeated this many times
+    # are reported as N+1; strict mode raises instead (used by the tests)
+    SQL_N_PLUS_ONE_THRESHOLD: int = 5
+    SQL_N_PLUS_ONE_STRICT: bool = False
+    # Product popularity: sales count half as much every POPULARITY_HALF_LIFE_DAYS
+    # (forward decay, see app.utils.popularity; recompute-popularity after a change)
+    POPULARITY_HALF_LIFE_DAYS: float = 14.0
+    # Default strategy for listing totals when the client does not pick one
+    # (exact, cached, estimated, has_more); cached totals live this long
+    PAGINATION_COUNT_MODE: str = "exact"
+    COUNT_CACHE_TTL_SECONDS: int = 60
+    # GET /product pages; writes invalidate the affected pages by tag
+    PRODUCT_LIST_CACHE_TTL_SECONDS: int = 60
+    # RedisClient.get_or_set: how long an expired value may still be served
+    # while one request refreshes it, the cross-worker refresh lock TTL, and
+    # the early-refresh aggressiveness (0 disables early refresh)
+    CACHE_STALE_TTL_SECONDS: int = 60
+    CACHE_LOCK_TTL_SECONDS: float = 5.0
+    CACHE_EARLY_REFRESH_BETA: float = 1.0
+    # Cached value serialization: codec (orjson, msgpack, json) and
+    # compression (zstd, lz4, zlib, none) for payloads of at least
+    # CACHE_COMPRESS_MIN_BYTES; unavailable libraries fall back to json/none
+    CACHE_CODEC: str = "orjson"
+    CACHE_COMPRESSION: str = "zstd"
+    CACHE_COMPRESS_MIN_BYTES: int = 1024
+    # Optional per-worker L1 cache in front of Redis, bounded by entries,
+    # bytes and TTL; invalidations reach every worker over pub/sub
+    CACHE_L1_ENABLED: bool = False
+    CACHE_L1_MAX_ENTRIES: int = 10_000
+    CACHE_L1_MAX_BYTES: int = 64 * 1024 * 1024
+    CACHE_L1_TTL_SECONDS: float = 30.0
+    CACHE_INVALIDATION_CHANNEL: str = "cache:invalidate"
+    # @cached service methods (app.core.cached); 404s are cached briefly
+    PRODUCT_CACHE_TTL_SECONDS: int = 600
+    CATEGORY_CACHE_TTL_SECONDS: int = 300
+    REVIEW_CACHE_TTL_SECONDS: int = 120
+    ADMIN_ANALYTICS_CACHE_TTL_SECONDS: int = 60
+    CACHE_NEGATIVE_TTL_SECONDS: int = 30
+    # Cache warm-up (app.jobs.cache_warmup), run in the background at startup
+    # and by `python -m app.cli warm-cache`
+    CACHE_WARMUP_ON_STARTUP: bool = True
+    CACHE_WARMUP_TOP_PRODUCTS: int = 500
+    CACHE_WARMUP_CATEGORY_LISTINGS: int = 20
+    CACHE_WARMUP_AUTOCOMPLETE_PREFIXES: int = 100
+    CACHE_WARMUP_CONCURRENCY: int = 4
+    CACHE_WARMUP_TIMEOUT_SECONDS: float = 30.0
     JWT_ALGORITHM: str = ""
     JWT_SECRET_KEY: str = ""
     JWT_DEFAULT_EXP_MINUTES: int = 30
     STRIPE_SECRET_KEY: str = ""
     STRIPE_WEBHOOK_SECRET: str = ""
     REDIS_URL: str = "redis://localhost:6379/0"
+    # Redis is a cache: fail fast on short socket timeouts, and after
+    # REDIS_BREAKER_FAILURE_THRESHOLD consecutive failures stop calling it
+    # (reads go to the database) and probe it every REDIS_BREAKER_RESET_SECONDS
+    REDIS_SOCKET_TIMEOUT_SECONDS: float = 0.25
+    REDIS_CONNECT_TIMEOUT_SECONDS: float = 0.25
+    REDIS_BREAKER_FAILURE_THRESHOLD: int = 5
+    REDIS_BREAKER_RESET_SECONDS: float = 5.0
     ELASTIC_URL: str = "http://elasticsearch:9200"
+    # Products search index (app.jobs.search_index): rebuilt in the background
+    # at startup when out of date, and by `python -m app.cli reindex-search`
+    ES_REINDEX_ON_STARTUP: bool = True
+    ES_REINDEX_LOCK_TTL_SECONDS: int = 1800
+    ES_INDEX_KEEP_PREVIOUS: int = 1
+    # Index builds stream products over ES_BULK_PARALLELISM id partitions in
+    # bulk requests of ES_BULK_CHUNK_SIZE documents (ES_BULK_MAX_CHUNK_BYTES at
+    # most); replicas are added once the build is done
+    ES_BULK_PARALLELISM: int = 4
+    ES_BULK_CHUNK_SIZE: int = 1000
+    ES_BULK_MAX_CHUNK_BYTES: int = 10 * 1024 * 1024
+    ES_INDEX_REPLICAS: int = 1
+    # Search outbox worker (app.jobs.search_sync): changes within one poll
+    # interval are coalesced per product; rows whose document is rejected
+    # ES_OUTBOX_MAX_ATTEMPTS times are dead-lettered (outages do not count)
+    ES_OUTBOX_WORKER_ENABLED: bool = True
+    ES_OUTBOX_POLL_SECONDS: float = 1.0
+    ES_OUTBOX_BATCH_SIZE: int = 500
+    ES_OUTBOX_MAX_ATTEMPTS: int = 10
+    # Search reads (app.services.search_service): after ES_BREAKER_FAILURE_
+    # THRESHOLD consecutive connection failures facets come from the database
+    # until a probe every ES_BREAKER_RESET_SECONDS succeeds; facet counts are
+    # cached per filter set for SEARCH_FACET_CACHE_TTL_SECONDS
+    ES_BREAKER_FAILURE_THRESHOLD: int = 5
+    ES_BREAKER_RESET_SECONDS: float = 10.0
+    SEARCH_FACET_CACHE_TTL_SECONDS: int = 60
+    # GET /product?search= resolves ids in Elasticsearch (SQL ILIKE when
+    # disabled, or when the cluster is unhealthy or slower than the timeout)
+    PRODUCT_SEARCH_ELASTICSEARCH: bool = True
+    ES_LISTING_TIMEOUT_SECONDS: float = 1.0
+    # GET /product/autocomplete: search-as-you-type in Elasticsearch (SQL
+    # prefix matching when disabled or unavailable); results are cached
+    # until a name change or for AUTOCOMPLETE_CACHE_TTL_SECONDS, so that
+    # popularity changes show up
+    AUTOCOMPLETE_ELASTICSEARCH: bool = True
+    ES_AUTOCOMPLETE_TIMEOUT_SECONDS: float = 0.3
+    AUTOCOMPLETE_CACHE_TTL_SECONDS: int = 600
+    # In-process autocomplete trie (app.core.autocomplete_index): loaded per
+    # worker from a Redis snapshot younger than the snapshot TTL or else the
+    # database, kept current by product writes published on the channel, and
+    # rebuilt from the database every AUTOCOMPLETE_TRIE_REFRESH_SECONDS
+    AUTOCOMPLETE_TRIE_ENABLED: bool = True
+    AUTOCOMPLETE_TRIE_MAX_DEPTH: int = 20
+    AUTOCOMPLETE_TRIE_REFRESH_SECONDS: int = 600
+    AUTOCOMPLETE_TRIE_SNAPSHOT_TTL_SECONDS: int = 120
+    AUTOCOMPLETE_TRIE_CHANNEL: str = "autocomplete:trie"
 
     model_config = SettingsConfigDict(
         env_file=".env", env_file_encoding="utf-8", case_sensitive=False
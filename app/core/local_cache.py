@@ -0,0 +1,103 @@
+"""
+In-process (L1) cache in front of the Redis (L2) cache.
+
+Each worker keeps recently read cache frames in memory, bounded by entry
+count, total bytes and a short TTL. Entries hold the encoded frame rather
+than the decoded value, so callers never share (and mutate) cached objects
+and sizes are exact.
+
+Writes that invalidate keys publish them on CACHE_INVALIDATION_CHANNEL and
+every worker's RedisClient evicts them from its L1 (see RedisClient._listen).
+The TTL bounds staleness if an invalidation message is ever missed.
+"""
+
+import time
+from collections import OrderedDict
+from typing import Iterable, NamedTuple, Optional
+
+from prometheus_client import Counter, Gauge
+
+CACHE_LOOKUPS = Counter(
+    "cache_lookups_total",
+    "Cache lookups by tier (l1 in-process, l2 Redis) and result",
+    ["tier", "result"],
+)
+L1_ENTRIES = Gauge("cache_l1_entries", "Entries held in this worker's L1 cache")
+L1_BYTES = Gauge("cache_l1_bytes", "Bytes held in this worker's L1 cache")
+L1_EVICTIONS = Counter(
+    "cache_l1_evictions_total",
+    "L1 entries dropped before their TTL, by reason",
+    ["reason"],
+)
+
+
+class _Entry(NamedTuple):
+    value: bytes
+    expires_at: float
+
+
+class LocalCache:
+    """LRU cache of bytes with per-entry TTL, bounded in entries and bytes."""
+
+    def __init__(self, max_entries: int, max_bytes: int, ttl: float):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._entries: OrderedDict[str, _Entry] = OrderedDict()
+        self._bytes = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def size_bytes(self) -> int:
+        return self._bytes
+
+    def get(self, key: str) -> Optional[bytes]:
+        entry = self._entries.get(key)
+        if entry is None:
+            CACHE_LOOKUPS.labels(tier="l1", result="miss").inc()
+            return None
+        if time.monotonic() >= entry.expires_at:
+            self._remove(key)
+            CACHE_LOOKUPS.labels(tier="l1", result="miss").inc()
+            return None
+        self._entries.move_to_end(key)
+        CACHE_LOOKUPS.labels(tier="l1", result="hit").inc()
+        return entry.value
+
+    def set(self, key: str, value: bytes, ttl: Optional[float] = None) -> None:
+        """Store ``value`` for ``ttl`` seconds (capped at the cache TTL)."""
+        ttl = self.ttl if ttl is None else min(ttl, self.ttl)
+        if ttl <= 0 or len(value) > self.max_bytes:
+            return
+        self._remove(key)
+        self._entries[key] = _Entry(value, time.monotonic() + ttl)
+        self._bytes += len(value)
+        while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+            oldest = next(iter(self._entries))
+            self._remove(oldest)
+            L1_EVICTIONS.labels(reason="capacity").inc()
+        self._report()
+
+    def evict(self, keys: Iterable[str]) -> None:
+        for key in keys:
+            if self._remove(key):
+                L1_EVICTIONS.labels(reason="invalidated").inc()
+        self._report()
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._bytes = 0
+        self._report()
+
+    def _remove(self, key: str) -> bool:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return False
+        self._bytes -= len(entry.value)
+        return True
+
+    def _report(self) -> None:
+        L1_ENTRIES.set(len(self._entries))
+        L1_BYTES.set(self._bytes)
@@ -0,0 +1,116 @@
+"""
+Redis caches for product details, listing pages (GET /product) and
+autocomplete.
+
+Pages are keyed by a hash of every listing parameter and tagged so writes
+drop exactly the pages they can affect:
+
+- ``products:product:<id>`` on every page showing the product, for changes
+  to what the page displays (stock, image, ...);
+- ``products:category:<id>``, or ``products:category:all`` for listings
+  not filtered by category, for changes that can add, remove or reorder
+  products in those listings (create, delete, price, ...).
+
+Product details are cached per id and deleted with the product's tag.
+
+Search facet counts are keyed by a hash of the search filters and only
+expire: counts a minute old are fine for a filter sidebar.
+
+Autocomplete keys live in a versioned namespace; any change to product names
+bumps the version, dropping every cached suggestion list at once.
+
+The caches fail open: if Redis is unavailable reads go to the database and
+writes skip invalidation.
+"""
+
+import hashlib
+import json
+from typing import Any, Iterable, Optional
+
+from app.core.config import settings
+from app.core.logger import logger
+from app.core.redis import redis_client
+
+LISTING_PREFIX = "products:list"
+FACETS_PREFIX = "search:facets"
+ALL_CATEGORIES = "all"
+AUTOCOMPLETE_NAMESPACE = "autocomplete"
+
+
+def product_cache_key(product_id: int) -> str:
+    return f"product:{product_id}"
+
+
+def listing_cache_key(**params: Any) -> str:
+    canonical = json.dumps(params, sort_keys=True, default=str)
+    return f"{LISTING_PREFIX}:{hashlib.sha1(canonical.encode()).hexdigest()}"
+
+
+def facets_cache_key(**filters: Any) -> str:
+    canonical = json.dumps(filters, sort_keys=True, default=str)
+    return f"{FACETS_PREFIX}:{hashlib.sha1(canonical.encode()).hexdigest()}"
+
+
+def product_tag(product_id: int) -> str:
+    return f"products:product:{product_id}"
+
+
+def category_tag(category_id: int | str) -> str:
+    return f"products:category:{category_id}"
+
+
+async def get_cached_listing(key: str) -> Optional[dict]:
+    try:
+        return await redis_client.get_json(key)
+    except Exception as e:
+        logger.warning(f"Product listing cache unavailable: {e}")
+        return None
+
+
+async def cache_listing(
+    key: str,
+    listing: dict,
+    category_id: Optional[int],
+    product_ids: Iterable[int],
+) -> None:
+    tags = [category_tag(category_id or ALL_CATEGORIES)]
+    tags.extend(product_tag(product_id) for product_id in product_ids)
+    try:
+        await redis_client.set_json_tagged(
+            key, listing, tags, ex=settings.PRODUCT_LIST_CACHE_TTL_SECONDS
+        )
+    except Exception as e:
+        logger.warning(f"Failed to cache product listing {key}: {e}")
+
+
+async def invalidate_product_listings(
+    product_ids: Iterable[int] = (),
+    category_ids: Iterable[Optional[int]] = (),
+) -> None:
+    """
+    Drop cached listing pages and product details after a write.
+
+    ``product_ids``: products whose displayed data changed.
+    ``category_ids``: categories whose listings may gain, lose or reorder
+    products; the unfiltered listings are always included with them.
+    """
+    product_ids = list(product_ids)
+    tags = [product_tag(product_id) for product_id in product_ids]
+    category_ids = list(category_ids)
+    if category_ids:
+        tags.append(category_tag(ALL_CATEGORIES))
+        tags.extend(category_tag(c) for c in category_ids if c is not None)
+    if not tags:
+        return
+    try:
+        await redis_client.invalidate_tags(tags)
+        await redis_client.delete_many(product_cache_key(p) for p in product_ids)
+    except Exception as e:
+        logger.warning(f"Failed to invalidate product listings {tags}: {e}")
+
+
+async def invalidate_autocomplete() -> None:
+    try:
+        await redis_client.bump_namespace(AUTOCOMPLETE_NAMESPACE)
+    except Exception as e:
+        logger.warning(f"Failed to invalidate autocomplete cache: {e}")
@@ -1,17 +1,132 @@
 # app/core/redis.py
+import asyncio
 import json
-from contextlib import asynccontextmanager
-from typing import Any, AsyncGenerator, Optional
+import math
+import random
+import time
+import uuid
+from contextlib import asynccontextmanager, suppress
+from typing import (
+    Any,
+    AsyncGenerator,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+)
 
 import redis.asyncio as redis
+from redis.asyncio.client import Pipeline
+
+from app.core.cache_codec import CacheCodec, default_codec
+from app.core.circuit_breaker import OPEN, CircuitBreaker
+from app.core.local_cache import CACHE_LOOKUPS, LocalCache
 from app.core.logger import logger
 from app.core.config import settings
 
+Loader = Callable[[], Awaitable[Any]]
+BatchLoader = Callable[[List[str]], Awaitable[Dict[str, Any]]]
+
+# Keys per SCAN/SSCAN page and per UNLINK call; keeps each command short so
+# bulk invalidation never blocks the server for other clients
+SCAN_BATCH_SIZE = 500
+
+# Errors meaning Redis is unreachable or too slow, as opposed to errors
+# it answered with; only these count towards opening the circuit breaker
+REDIS_UNAVAILABLE = (
+    redis.ConnectionError,
+    redis.TimeoutError,
+    OSError,
+    asyncio.TimeoutError,
+)
+
+
+class _LoadAbandoned(Exception):
+    """The coroutine loading a key was cancelled; waiters load it themselves."""
+
+
+def should_refresh_early(
+    expires_at: float, delta: float, beta: float, now: Optional[float] = None
+) -> bool:
+    """
+    Probabilistic early expiration ("XFetch").
+
+    Returns True with a probability that rises as ``expires_at`` approaches,
+    scaled by ``delta`` (how long the value took to compute), so one request
+    usually recomputes a hot key shortly before it expires instead of every
+    request recomputing it right after.
+    """
+    now = time.time() if now is None else now
+    return now - delta * beta * math.log(1.0 - random.random()) >= expires_at
+
+
+def _default_local_cache() -> Optional[LocalCache]:
+    if not settings.CACHE_L1_ENABLED:
+        return None
+    return LocalCache(
+        max_entries=settings.CACHE_L1_MAX_ENTRIES,
+        max_bytes=settings.CACHE_L1_MAX_BYTES,
+        ttl=settings.CACHE_L1_TTL_SECONDS,
+    )
+
+
+class _GuardedPipeline(Pipeline):
+    breaker: CircuitBreaker
+
+    async def execute(self, raise_on_error: bool = True) -> List[Any]:
+        return await self.breaker.call(super().execute, raise_on_error)
+
+
+class _GuardedRedis(redis.Redis):
+    """redis.Redis whose commands and pipelines go through ``breaker``."""
+
+    def __init__(self, *args, breaker: CircuitBreaker, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.breaker = breaker
+
+    async def execute_command(self, *args, **options):
+        return await self.breaker.call(super().execute_command, *args, **options)
+
+    def pipeline(
+        self, transaction: bool = True, shard_hint: Optional[str] = None
+    ) -> Pipeline:
+        pipe = _GuardedPipeline(
+            self.connection_pool, self.response_callbacks, transaction, shard_hint
+        )
+        pipe.breaker = self.breaker
+        return pipe
+
 
 class RedisClient:
-    def __init__(self):
+    def __init__(
+        self,
+        codec: Optional[CacheCodec] = None,
+        local: Optional[LocalCache] = None,
+    ):
         self._client: Optional[redis.Redis] = None
         self._pool: Optional[redis.ConnectionPool] = None
+        # Cached values are framed binary (see cache_codec), so the
+        # connection returns raw bytes rather than decoded strings
+        self.codec = codec or default_codec()
+        # Optional in-process L1 in front of Redis, kept consistent across
+        # workers by invalidations published over pub/sub
+        self.local = local if local is not None else _default_local_cache()
+        self._listener: Optional[asyncio.Task] = None
+        # While Redis is unreachable calls fail fast and callers fall back
+        # to the database; a background task pings it until it is back
+        self.breaker = CircuitBreaker(
+            "redis",
+            failure_threshold=settings.REDIS_BREAKER_FAILURE_THRESHOLD,
+            reset_timeout=settings.REDIS_BREAKER_RESET_SECONDS,
+            failure_types=REDIS_UNAVAILABLE,
+            on_open=self._start_reconnect,
+        )
+        self._reconnect_task: Optional[asyncio.Task] = None
+        # Keys being loaded by this worker, for in-process single-flight
+        self._inflight: Dict[str, asyncio.Future] = {}
 
     async def connect(self) -> None:
         if self._client is not None:
@@ -19,21 +134,34 @@ class RedisClient:
 
         self._pool = redis.ConnectionPool.from_url(
             settings.REDIS_URL,
-            encoding="utf-8",
-            decode_responses=True,
+            decode_responses=False,
             max_connections=20,
-            retry_on_timeout=True,
+            # No retries: a slow Redis should cost a request at most one
+            # short timeout, and the breaker takes it out of the path
+            socket_timeout=settings.REDIS_SOCKET_TIMEOUT_SECONDS,
+            socket_connect_timeout=settings.REDIS_CONNECT_TIMEOUT_SECONDS,
         )
-        self._client = redis.Redis(connection_pool=self._pool)
+        self._client = _GuardedRedis(connection_pool=self._pool, breaker=self.breaker)
 
         try:
             await self._client.ping()
             logger.info("Redis connected successfully")
         except redis.RedisError as e:
-            logger.error(f"Failed to connect to Redis: {e}")
-            raise
+            # Start without the cache rather than not at all
+            logger.error(f"Failed to connect to Redis, running without cache: {e}")
+            self.breaker.trip()
+
+        if self.local is not None:
+            self._listener = asyncio.create_task(self._listen())
 
     async def close(self) -> None:
+        for task in (self._listener, self._reconnect_task):
+            if task is not None:
+                task.cancel()
+                with suppress(asyncio.CancelledError):
+                    await task
+        self._listener = None
+        self._reconnect_task = None
         if self._client is not None:
             await self._client.close()
             if self._pool:
@@ -50,27 +178,526 @@ class RedisClient:
             )
         return self._client
 
+    @property
+    def available(self) -> bool:
+        """False while the breaker is open and Redis calls fail fast."""
+        return self.breaker.state != OPEN
+
+    def _start_reconnect(self) -> None:
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        if self._reconnect_task is None or self._reconnect_task.done():
+            self._reconnect_task = asyncio.create_task(self._reconnect())
+
+    async def _reconnect(self) -> None:
+        """Ping Redis while the breaker is open; a reply closes it."""
+        while not self.breaker.is_closed:
+            await asyncio.sleep(self.breaker.reset_timeout)
+            try:
+                await self.client.ping()
+            except Exception as e:
+                logger.debug(f"Redis still unavailable: {e}")
+
     async def get_json(self, key: str) -> Any:
-        value = await self.client.get(key)
-        if value is None:
+        """
+        Cached value for ``key``; None when missing or undecodable, or while
+        Redis is unavailable.
+        """
+        raw = self.local.get(key) if self.local is not None else None
+        if raw is None:
+            if not self.available:
+                return None
+            try:
+                if self.local is None:
+                    raw = await self.client.get(key)
+                else:
+                    # The L1 copy must not outlive the Redis one
+                    pipe = self.client.pipeline(transaction=False)
+                    pipe.get(key)
+                    pipe.pttl(key)
+                    raw, pttl = await pipe.execute()
+                    if raw is not None:
+                        ttl = pttl / 1000 if pttl > 0 else None
+                        self.local.set(key, raw, ttl=ttl)
+            except REDIS_UNAVAILABLE as e:
+                logger.warning(f"Cache read failed for {key}: {e}")
+                return None
+            self._record_l2(raw)
+        return self.codec.try_decode(raw, key)
+
+    async def set_json(self, key: str, value: Any, ex: Optional[int] = 3600) -> None:
+        """
+        Cache a JSON-compatible ``value``; pass dicts, not JSON strings.
+
+        Overwrites are not broadcast: other workers may serve their L1 copy
+        until it expires. Use delete/invalidate_tags to drop a key everywhere.
+        Skipped while Redis is unavailable.
+        """
+        if not self.available:
+            return
+        try:
+            await self.client.set(key, self.codec.encode(value), ex=ex)
+        except REDIS_UNAVAILABLE as e:
+            logger.warning(f"Cache write failed for {key}: {e}")
+            return
+        if self.local is not None:
+            self.local.evict([key])
+
+    async def get_many(self, keys: List[str]) -> Dict[str, Any]:
+        """
+        Cached values for ``keys`` in one MGET; missing keys are omitted, and
+        so are all but L1 hits while Redis is unavailable.
+        """
+        values = {}
+        for key, raw in (await self._get_many_raw(keys)).items():
+            value = self.codec.try_decode(raw, key)
+            if value is not None:
+                values[key] = value
+        return values
+
+    async def set_many(self, values: Dict[str, Any], ex: int = 3600) -> None:
+        """set_json for several keys in one pipelined round trip."""
+        if not self.available:
+            return
+        pipe = self.client.pipeline(transaction=False)
+        for key, value in values.items():
+            pipe.set(key, self.codec.encode(value), ex=ex)
+        try:
+            await pipe.execute()
+        except REDIS_UNAVAILABLE as e:
+            logger.warning(f"Cache write failed for {len(values)} keys: {e}")
+            return
+        if self.local is not None:
+            self.local.evict(values)
+
+    async def _get_many_raw(self, keys: List[str]) -> Dict[str, bytes]:
+        found = {}
+        remote = []
+        for key in keys:
+            raw = self.local.get(key) if self.local is not None else None
+            if raw is None:
+                remote.append(key)
+            else:
+                found[key] = raw
+        if remote and self.available:
+            try:
+                raws = await self.client.mget(remote)
+            except REDIS_UNAVAILABLE as e:
+                logger.warning(f"Cache read failed for {len(remote)} keys: {e}")
+                return found
+            for key, raw in zip(remote, raws):
+                self._record_l2(raw)
+                if raw is not None:
+                    found[key] = raw
+        return found
+
+    @staticmethod
+    def tag_key(tag: str) -> str:
+        return f"tag:{tag}"
+
+    async def set_json_tagged(
+        self, key: str, value: Any, tags: Iterable[str], ex: int = 3600
+    ) -> None:
+        """
+        Store ``value`` like set_json and record ``key`` under each tag, so
+        invalidate_tags can later drop every key carrying a tag.
+        """
+        await self._set_tagged(key, self.codec.encode(value), tags, ex)
+        if self.local is not None:
+            self.local.evict([key])
+
+    async def _set_tagged(
+        self, key: str, raw: bytes, tags: Iterable[str], ex: int
+    ) -> None:
+        pipe = self.client.pipeline(transaction=True)
+        pipe.set(key, raw, ex=ex)
+        for tag in tags:
+            pipe.sadd(self.tag_key(tag), key)
+            # A new set expires with this member; an existing one is only
+            # ever extended, so it outlives every member it records. (GT
+            # alone would never apply: a set without expiry counts as
+            # infinite.) Needs Redis 7.
+            pipe.expire(self.tag_key(tag), ex, nx=True)
+            pipe.expire(self.tag_key(tag), ex, gt=True)
+        await pipe.execute()
+
+    async def invalidate_tags(self, tags: Iterable[str]) -> int:
+        """Delete every key recorded under any of ``tags``, and the tag sets."""
+        deleted = 0
+        for tag in set(tags):
+            # Detach the set first so keys tagged from now on start a new
+            # set instead of being lost between the scan and the delete
+            detached = f"{self.tag_key(tag)}:invalidating:{uuid.uuid4().hex}"
+            try:
+                await self.client.rename(self.tag_key(tag), detached)
+            except redis.ResponseError:
+                continue  # no keys carry this tag
+            deleted += await self._unlink_batched(
+                self.client.sscan_iter(detached, count=SCAN_BATCH_SIZE)
+            )
+            await self.client.unlink(detached)
+        return deleted
+
+    @staticmethod
+    def namespace_version_key(namespace: str) -> str:
+        return f"ns:{namespace}"
+
+    async def namespaced_key(self, namespace: str, key: str) -> str:
+        """
+        ``key`` inside the current version of ``namespace``.
+
+        bump_namespace invalidates every key of the namespace in O(1): later
+        lookups use the next version and the old keys expire on their own.
+        Costs one extra GET per lookup, served from the L1 cache when it
+        is enabled.
+        """
+        version_key = self.namespace_version_key(namespace)
+        version = self.local.get(version_key) if self.local is not None else None
+        if version is None and not self.available:
+            # Keys are not read while Redis is down, and warning on every
+            # lookup would flood the log
+            version = b"0"
+        elif version is None:
+            try:
+                version = await self.client.get(version_key) or b"0"
+            except Exception as e:
+                logger.warning(f"Namespace version unavailable for {namespace}: {e}")
+                version = b"0"
+            else:
+                if self.local is not None:
+                    self.local.set(version_key, version)
+        return f"{namespace}:v{int(version)}:{key}"
+
+    async def bump_namespace(self, namespace: str) -> int:
+        version_key = self.namespace_version_key(namespace)
+        version = await self.client.incr(version_key)
+        await self._publish_invalidation([version_key])
+        return version
+
+    async def get_or_set(
+        self,
+        key: str,
+        loader: Loader,
+        ex: int | Callable[[Any], int] = 3600,
+        stale_ttl: int = settings.CACHE_STALE_TTL_SECONDS,
+        should_cache: Optional[Callable[[Any], bool]] = None,
+        tags: Iterable[str] = (),
+    ) -> Any:
+        """
+        Return the cached value for ``key``, calling ``loader`` to fill it.
+
+        Protects the loader's backend from stampedes:
+
+        - Single-flight: concurrent misses in this worker share one
+          ``loader`` call, and a short Redis lock lets one worker fill the
+          key while the others wait for its result.
+        - Early refresh: shortly before ``ex`` runs out one request (chosen
+          probabilistically) recomputes the value.
+        - Stale-while-revalidate: for ``stale_ttl`` seconds after ``ex`` the
+          old value is still served to everyone except the single request
+          that holds the refresh lock and recomputes it.
+
+        ``ex`` may be a function of the loaded value (e.g. shorter TTLs for
+        negative results). ``tags`` are recorded like set_json_tagged does.
+
+        Values are stored in an envelope with their logical expiry, so keys
+        written by set_json read as misses. If Redis is unavailable the
+        loader is called directly (still single-flight within the worker).
+        """
+        tags = list(tags)
+
+        def store() -> Awaitable[Any]:
+            return self._store(key, loader, ex, stale_ttl, should_cache, tags)
+
+        if self.local is not None:
+            envelope = self._unwrap(self.local.get(key))
+            if envelope is not None and time.time() < envelope["x"]:
+                return envelope["v"]
+
+        if not self.available:
+            return await self._single_flight(key, loader)
+
+        try:
+            raw = await self.client.get(key)
+        except Exception as e:
+            logger.warning(f"Cache read failed for {key}, loading directly: {e}")
+            return await self._single_flight(key, loader)
+        self._record_l2(raw)
+        envelope = self._unwrap(raw)
+
+        if envelope is None:
+            return await self._single_flight(key, lambda: self._fill(key, store))
+
+        expired = time.time() >= envelope["x"]
+        if not expired and self.local is not None:
+            self.local.set(key, raw, ttl=envelope["x"] - time.time())
+        if not expired and not should_refresh_early(
+            envelope["x"], envelope["d"], settings.CACHE_EARLY_REFRESH_BETA
+        ):
+            return envelope["v"]
+
+        # Expired (stale) or picked for early refresh: one request refreshes,
+        # everyone else keeps getting the current value meanwhile
+        if key in self._inflight:
+            return envelope["v"]
+        token = await self._try_lock(key)
+        if token is None:
+            return envelope["v"]
+        try:
+            return await self._single_flight(key, store)
+        finally:
+            await self._unlock(key, token)
+
+    async def get_or_set_many(
+        self,
+        keys: List[str],
+        loader: BatchLoader,
+        ex: int = 3600,
+        stale_ttl: int = settings.CACHE_STALE_TTL_SECONDS,
+    ) -> Dict[str, Any]:
+        """
+        Batch get_or_set: one MGET for ``keys``, a single ``loader`` call
+        with the keys that missed, and one pipelined write of its results.
+
+        ``loader`` returns values by key; keys it leaves out (e.g. rows that
+        do not exist) are not cached and are missing from the result. Shares
+        the envelope format with get_or_set, so both read each other's keys.
+        Expired values count as misses; there is no single-flight or early
+        refresh for batches.
+        """
+        found = {}
+        try:
+            if self.available:
+                found = await self._get_many_raw(keys)
+        except Exception as e:
+            logger.warning(f"Cache read failed for {len(keys)} keys: {e}")
+
+        now = time.time()
+        values = {}
+        for key, raw in found.items():
+            envelope = self._unwrap(raw)
+            if envelope is not None and now < envelope["x"]:
+                values[key] = envelope["v"]
+                if self.local is not None:
+                    self.local.set(key, raw, ttl=envelope["x"] - now)
+
+        missing = [key for key in keys if key not in values]
+        if missing and not self.available:
+            values.update(await loader(missing))
+        elif missing:
+            started = time.monotonic()
+            loaded = await loader(missing)
+            delta = time.monotonic() - started
+            values.update(loaded)
+            encoded = {
+                key: self.codec.encode({"v": value, "x": time.time() + ex, "d": delta})
+                for key, value in loaded.items()
+            }
+            try:
+                pipe = self.client.pipeline(transaction=False)
+                for key, raw in encoded.items():
+                    pipe.set(key, raw, ex=ex + stale_ttl)
+                await pipe.execute()
+            except Exception as e:
+                logger.warning(f"Cache write failed for {len(encoded)} keys: {e}")
+            else:
+                if self.local is not None:
+                    for key, raw in encoded.items():
+                        self.local.set(key, raw, ttl=ex)
+
+        return {key: values[key] for key in keys if key in values}
+
+    def _unwrap(self, raw: Optional[bytes]) -> Optional[dict]:
+        envelope = self.codec.try_decode(raw, "get_or_set")
+        if not isinstance(envelope, dict) or not {"v", "x", "d"} <= envelope.keys():
             return None
+        return envelope
+
+    async def _single_flight(self, key: str, load: Loader) -> Any:
+        pending = self._inflight.get(key)
+        if pending is not None:
+            try:
+                return await asyncio.shield(pending)
+            except _LoadAbandoned:
+                return await load()
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
         try:
-            return json.loads(value)
-        except json.JSONDecodeError:
-            logger.warning(f"Failed to decode JSON for key: {key}")
+            result = await load()
+        except asyncio.CancelledError:
+            future.set_exception(_LoadAbandoned())
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            # Mark the exception retrieved even if nobody was waiting
+            if future.done() and not future.cancelled():
+                future.exception()
+            self._inflight.pop(key, None)
+
+    async def _fill(self, key: str, store: Loader) -> Any:
+        token = await self._try_lock(key)
+        if token is None:
+            # Another worker is loading this key: wait for its result, but
+            # never longer than its lock, then load it ourselves
+            deadline = time.monotonic() + settings.CACHE_LOCK_TTL_SECONDS
+            while time.monotonic() < deadline:
+                await asyncio.sleep(0.05)
+                try:
+                    envelope = self._unwrap(await self.client.get(key))
+                except Exception:
+                    break
+                if envelope is not None:
+                    return envelope["v"]
+        try:
+            return await store()
+        finally:
+            if token is not None:
+                await self._unlock(key, token)
+
+    async def _store(
+        self,
+        key: str,
+        loader: Loader,
+        ex: int | Callable[[Any], int],
+        stale_ttl: int,
+        should_cache: Optional[Callable[[Any], bool]],
+        tags: List[str],
+    ) -> Any:
+        started = time.monotonic()
+        value = await loader()
+        if should_cache is not None and not should_cache(value):
             return value
 
-    async def set_json(self, key: str, value: Any, ex: Optional[int] = 3600) -> None:
-        await self.client.set(key, json.dumps(value, ensure_ascii=False), ex=ex)
+        ttl = ex(value) if callable(ex) else ex
+        envelope = {
+            "v": value,
+            "x": time.time() + ttl,
+            "d": time.monotonic() - started,
+        }
+        raw = self.codec.encode(envelope)
+        try:
+            if tags:
+                await self._set_tagged(key, raw, tags, ttl + stale_ttl)
+            else:
+                await self.client.set(key, raw, ex=ttl + stale_ttl)
+        except Exception as e:
+            logger.warning(f"Cache write failed for {key}: {e}")
+            return value
+        if self.local is not None:
+            self.local.set(key, raw, ttl=ttl)
+        return value
+
+    async def _try_lock(self, key: str) -> Optional[str]:
+        token = uuid.uuid4().hex
+        try:
+            acquired = await self.client.set(
+                f"lock:{key}",
+                token,
+                nx=True,
+                px=int(settings.CACHE_LOCK_TTL_SECONDS * 1000),
+            )
+        except Exception as e:
+            logger.warning(f"Cache lock failed for {key}: {e}")
+            return None
+        return token if acquired else None
+
+    async def _unlock(self, key: str, token: str) -> None:
+        try:
+            # Only release our own lock; it may have expired and been retaken
+            if await self.client.get(f"lock:{key}") == token.encode():
+                await self.client.delete(f"lock:{key}")
+        except Exception as e:
+            logger.warning(f"Cache unlock failed for {key}: {e}")
 
     async def delete(self, key: str) -> int:
-        return await self.client.delete(key)
+        """Delete ``key`` from Redis and from every worker's L1 cache."""
+        deleted = await self.client.delete(key)
+        await self._publish_invalidation([key])
+        return deleted
+
+    async def delete_many(self, keys: Iterable[str]) -> int:
+        """Delete ``keys`` from Redis and from every worker's L1 cache."""
+        keys = list(keys)
+        return await self._unlink(keys) if keys else 0
 
     async def delete_pattern(self, pattern: str) -> int:
-        keys = await self.client.keys(pattern)
-        if not keys:
-            return 0
-        return await self.client.delete(*keys)
+        """
+        Delete keys matching ``pattern`` with incremental SCAN and batched
+        UNLINK rather than KEYS, which blocks the server for the whole scan.
+        Prefer tags or namespaces for groups that are invalidated regularly.
+        """
+        return await self._unlink_batched(
+            self.client.scan_iter(match=pattern, count=SCAN_BATCH_SIZE)
+        )
+
+    async def _unlink_batched(self, keys: AsyncIterator[str]) -> int:
+        deleted = 0
+        batch = []
+        async for key in keys:
+            batch.append(key)
+            if len(batch) >= SCAN_BATCH_SIZE:
+                deleted += await self._unlink(batch)
+                batch = []
+        if batch:
+            deleted += await self._unlink(batch)
+        return deleted
+
+    async def _unlink(self, keys: list) -> int:
+        # UNLINK frees the memory in a background thread on the server
+        deleted = await self.client.unlink(*keys)
+        await self._publish_invalidation(keys)
+        return deleted
+
+    @staticmethod
+    def _record_l2(raw: Optional[bytes]) -> None:
+        CACHE_LOOKUPS.labels(tier="l2", result="miss" if raw is None else "hit").inc()
+
+    async def _publish_invalidation(self, keys: list) -> None:
+        """Evict ``keys`` from the L1 cache of this and every other worker."""
+        if self.local is None:
+            return
+        keys = [k.decode() if isinstance(k, bytes) else k for k in keys]
+        self.local.evict(keys)
+        try:
+            await self.client.publish(
+                settings.CACHE_INVALIDATION_CHANNEL, json.dumps({"keys": keys})
+            )
+        except Exception as e:
+            logger.warning(f"Failed to publish cache invalidation: {e}")
+
+    async def _listen(self) -> None:
+        """Apply invalidations published by any worker to the L1 cache."""
+        delay = 0.5
+        while True:
+            try:
+                async with self.client.pubsub() as pubsub:
+                    await pubsub.subscribe(settings.CACHE_INVALIDATION_CHANNEL)
+                    # Invalidations sent while unsubscribed are lost
+                    self.local.clear()
+                    delay = 0.5
+                    while True:
+                        # Polled with a timeout: a blocking read would trip
+                        # the short socket timeout between messages
+                        message = await pubsub.get_message(
+                            ignore_subscribe_messages=True, timeout=1.0
+                        )
+                        if message is not None and message["type"] == "message":
+                            self.local.evict(json.loads(message["data"])["keys"])
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Cache invalidation listener failed: {e}")
+                self.local.clear()
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, 30)
 
 
 redis_client = RedisClient()
@@ -0,0 +1,50 @@
+"""
+Transactional outbox keeping the products search index in sync.
+
+Product writes call enqueue_search_sync on their own session before
+committing, so the outbox rows commit or roll back with the change itself:
+no change is lost between the database and Elasticsearch, and none is
+indexed that did not happen. app.jobs.search_sync applies the rows.
+"""
+
+from typing import Iterable, List, Optional
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.search_outbox import SearchOutbox
+
+UPSERT = "upsert"
+DELETE = "delete"
+
+# Product columns -> the search document fields derived from them
+# (see app.utils.es_utils.product_source)
+SEARCH_FIELDS = {
+    "name": ("name", "suggest"),
+    "description": ("description",),
+    "price": ("price",),
+    "stock_quantity": ("in_stock",),
+    "category_id": ("category", "category_id", "suggest"),
+    "is_active": ("is_active",),
+    "popularity": ("popularity",),
+}
+
+
+def search_fields(columns: Iterable[str]) -> List[str]:
+    """Document fields affected by changes to the product ``columns``."""
+    return sorted({field for c in columns for field in SEARCH_FIELDS.get(c, ())})
+
+
+def enqueue_search_sync(
+    db: AsyncSession,
+    product_ids: Iterable[int],
+    operation: str = UPSERT,
+    fields: Optional[List[str]] = None,
+) -> None:
+    """
+    Record that the search documents of ``product_ids`` must be updated
+    (only ``fields`` of them, or the whole document when None) or deleted.
+    """
+    db.add_all(
+        SearchOutbox(product_id=product_id, operation=operation, fields=fields)
+        for product_id in product_ids
+    )
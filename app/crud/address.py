@@ -1,15 +1,15 @@
-from sqlalchemy import select
+from sqlalchemy import select, update
 from app.models.address import Address
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.schema.address_schema import AddressCreate, AddressUpdate, AddressPublic
 from app.core.logger import logger
 
 
 class AddressCrud:
-    def __init__(self, db: Session):
+    def __init__(self, db: AsyncSession):
         self.db = db
 
-    def create_address(
+    async def create_address(
         self, id: int, is_first: bool, address_data: AddressCreate
     ) -> Address:
         """
@@ -21,33 +21,36 @@ class AddressCrud:
 
         db_address = Address(**data, user_id=id)
         self.db.add(db_address)
-        self.db.commit()
-        self.db.refresh(db_address)
+        await self.db.commit()
+        await self.db.refresh(db_address)
         return db_address
 
-    def update_defualt_address(self, user_id: int):
+    async def update_defualt_address(self, user_id: int):
         """
         Update default address for a user
         """
-        self.db.query(Address).filter(
-            Address.user_id == user_id, Address.is_default == True
-        ).update({"is_default": False})
-        self.db.commit()
+        stmt = (
+            update(Address)
+            .where(Address.user_id == user_id, Address.is_default == True)
+            .values(is_default=False)
+        )
+        await self.db.execute(stmt)
+        await self.db.commit()
 
-    def get_single_address(self, address_id: int) -> Address:
+    async def get_single_address(self, address_id: int) -> Address:
         """
         Get a single address by ID
         """
-        db_address = self.db.query(Address).filter(Address.id == address_id).first()
+        db_address = await self.db.get(Address, address_id)
         return db_address
 
-    def delete_address(self, address_id: int) -> bool:
+    async def delete_address(self, address_id: int) -> bool:
         """
         Delete an address by ID
         """
-        db_address = self.db.query(Address).filter(Address.id == address_id).first()
+        db_address = await self.db.get(Address, address_id)
         if not db_address:
             return False
-        self.db.delete(db_address)
-        self.db.commit()
+        await self.db.delete(db_address)
+        await self.db.commit()
         return True
@@ -1,8 +1,9 @@
 from datetime import datetime, timedelta
 from typing import Optional
 from fastapi import HTTPException, status
-from sqlalchemy.orm import Session
-from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+from sqlalchemy import func, select, update
 
 
 from app.models.order import Order
@@ -11,29 +12,39 @@ from app.models.product import Product
 from app.models.cart_item import CartItem
 from app.models.address import Address
 from app.core.exceptions import OrderException
+from app.core.product_cache import invalidate_product_listings
+from app.core.search_outbox import enqueue_search_sync
 from app.models.user import User
 from app.utils.order_utils import generate_order_number, generate_trx_ref
+from app.utils.popularity import sale_weight
+from app.core.config import settings
+from app.db.counting import Count
+from app.schema.common_schema import CountMode
+from app.utils.pagination import paginate_keyset, paginate_offset
 from app.crud.address import AddressCrud
 
 
 class OrderCrud:
-    def __init__(self, db: Session):
+    def __init__(self, db: AsyncSession, read_db: Optional[AsyncSession] = None):
         self.db = db
+        # Session for read-only queries; may be bound to a replica
+        self.read_db = read_db or db
         self.address_crud = AddressCrud(db=db)
 
-    def validate_address(self, user_id: int, address_id: int):
-        address = self.address_crud.get_single_address(address_id)
+    async def validate_address(self, user_id: int, address_id: int):
+        address = await self.address_crud.get_single_address(address_id)
         if not address or address.user_id != user_id:
             raise OrderException("Invalid address")
         return address
 
-    def get_cart_items(self, user_id: int):
+    async def get_cart_items(self, user_id: int):
         stmt = (
             select(CartItem)
             .join(CartItem.cart)
             .where(CartItem.cart.has(user_id=user_id))
+            .options(selectinload(CartItem.product))
         )
-        items = self.db.scalars(stmt).all()
+        items = (await self.db.scalars(stmt)).all()
         if not items:
             raise OrderException("Your cart is empty.")
         return items
@@ -46,13 +57,13 @@ class OrderCrud:
                     f"Available: {item.product.stock_quantity}"
                 )
 
-    def create_order(self, user_id: int, shipping_id: int, billing_id: int):
+    async def create_order(self, user_id: int, shipping_id: int, billing_id: int):
         # Validate addresses
-        self.validate_address(user_id, shipping_id)
-        self.validate_address(user_id, billing_id)
+        await self.validate_address(user_id, shipping_id)
+        await self.validate_address(user_id, billing_id)
 
         # Fetch cart items
-        items = self.get_cart_items(user_id)
+        items = await self.get_cart_items(user_id)
         self.validate_stock(items)
 
         # Compute total
@@ -68,9 +79,12 @@ class OrderCrud:
             tx_ref=generate_trx_ref(),
         )
         self.db.add(order)
-        self.db.flush()  # Get order.id
+        await self.db.flush()  # Get order.id
 
         # Create order items + reduce stock
+        weight = sale_weight()
+        sold_out_ids = []
+        sold_out_categories = set()
         for item in items:
             order_item = OrderItem(
                 order_id=order.id,
@@ -81,151 +95,230 @@ class OrderCrud:
             self.db.add(order_item)
 
             # Reduce stock
+            if item.product.stock_quantity <= item.quantity:
+                sold_out_ids.append(item.product_id)
+                sold_out_categories.add(item.product.category_id)
             item.product.stock_quantity -= item.quantity
 
+            # Sales stats for popularity sorting, as an in-database increment
+            await self.db.execute(
+                update(Product)
+                .where(Product.id == item.product_id)
+                .values(
+                    sales_count=Product.sales_count + item.quantity,
+                    popularity=Product.popularity + item.quantity * weight,
+                )
+                .execution_options(synchronize_session=False)
+            )
+
         # Clear cart
         for item in items:
-            self.db.delete(item)
+            await self.db.delete(item)
 
-        self.db.commit()
-        self.db.refresh(order)
-        return order
-
-    def get_orders(self, user_id: int):
-        stmt = select(Order).where(Order.user_id == user_id)
-        return self.db.scalars(stmt).all()
+        # Popularity ranks autocomplete suggestions
+        enqueue_search_sync(
+            self.db, [item.product_id for item in items], fields=["popularity"]
+        )
+        enqueue_search_sync(self.db, sold_out_ids, fields=["in_stock"])
+        await self.db.commit()
+        await invalidate_product_listings(
+            product_ids=[item.product_id for item in items],
+            category_ids=sold_out_categories,
+        )
+        return await self.get_order_by_id(user_id, order.id)
 
-    def get_order_by_id(self, user_id: int, order_id: int):
-        order = self.db.get(Order, order_id)
+    async def get_orders(self, user_id: int):
+        stmt = (
+            select(Order)
+            .where(Order.user_id == user_id)
+            .options(selectinload(Order.order_items))
+        )
+        return (await self.db.scalars(stmt)).all()
+
+    async def get_order_by_id(self, user_id: int, order_id: int):
+        order = await self.db.get(
+            Order,
+            order_id,
+            options=[selectinload(Order.order_items)],
+            populate_existing=True,
+        )
         if not order or order.user_id != user_id:
             raise OrderException("Order not found")
         return order
 
-    def get_total_orders(self):
-        total_orders = self.db.query(func.count()).scalar() or 0
+    async def get_total_orders(self):
+        total_orders = await self.read_db.scalar(select(func.count(Order.id))) or 0
         return total_orders
 
-    def get_total_revenue(self):
-        total_revenue = self.db.query(func.sum(Order.total_amount)).scalar() or 0.0
+    async def get_total_revenue(self):
+        total_revenue = (
+            await self.read_db.scalar(select(func.sum(Order.total_amount))) or 0.0
+        )
         return total_revenue
 
-    def get_pending_orders(self):
+    async def get_pending_orders(self):
         pending_orders = (
-            self.db.query(func.count(Order.id))
-            .filter(Order.status == "pending")
-            .scalar()
+            await self.read_db.scalar(
+                select(func.count(Order.id)).where(Order.status == "pending")
+            )
             or 0
         )
         return pending_orders
 
-    def get_paid_orders(self):
+    async def get_paid_orders(self):
         paid_orders = (
-            self.db.query(func.count(Order.id)).filter(Order.status == "paid").scalar()
+            await self.read_db.scalar(
+                select(func.count(Order.id)).where(Order.status == "paid")
+            )
             or 0
         )
         return paid_orders
 
-    def get_shipped_orders_count(self):
+    async def get_shipped_orders_count(self):
         shipped_orders = (
-            self.db.query(func.count(Order.id))
-            .filter(Order.status == "shipped")
-            .scalar()
+            await self.read_db.scalar(
+                select(func.count(Order.id)).where(Order.status == "shipped")
+            )
             or 0
         )
         return shipped_orders
 
-    def get_delivered_orders_count(self):
+    async def get_delivered_orders_count(self):
         delivered_orders = (
-            self.db.query(func.count(Order.id))
-            .filter(Order.status == "delivered")
-            .scalar()
+            await self.read_db.scalar(
+                select(func.count(Order.id)).where(Order.status == "delivered")
+            )
             or 0
         )
         return delivered_orders
 
-    def get_cancelled_orders_count(self):
+    async def get_cancelled_orders_count(self):
         cancelled_orders = (
-            self.db.query(func.count(Order.id))
-            .filter(Order.status == "cancelled")
-            .scalar()
+            await self.read_db.scalar(
+                select(func.count(Order.id)).where(Order.status == "cancelled")
+            )
             or 0
         )
         return cancelled_orders
 
-    def revenue_last_thirty_days(self):
+    async def get_order_counts_by_status(self) -> dict[str, int]:
+        rows = await self.read_db.execute(
+            select(Order.status, func.count(Order.id)).group_by(Order.status)
+        )
+        return {order_status: count for order_status, count in rows.all()}
+
+    async def revenue_last_thirty_days(self):
         thirty_days_ago = datetime.now() - timedelta(days=30)
         revenue_last_30_days = (
-            self.db.query(func.sum(Order.total_amount))
-            .filter(Order.order_date >= thirty_days_ago)
-            .scalar()
+            await self.read_db.scalar(
+                select(func.sum(Order.total_amount)).where(
+                    Order.order_date >= thirty_days_ago
+                )
+            )
             or 0.0
         )
         return revenue_last_30_days
 
-    def total_order_by_user(self, user_id: int):
+    async def total_order_by_user(self, user_id: int):
         total_orders = (
-            self.db.query(func.count(Order.id))
-            .filter(Order.user_id == user_id)
-            .scalar()
+            await self.read_db.scalar(
+                select(func.count(Order.id)).where(Order.user_id == user_id)
+            )
             or 0
         )
         return total_orders
 
-    def total_spent_by_user(self, user_id: int):
+    async def total_spent_by_user(self, user_id: int):
         total_spent = (
-            self.db.query(func.sum(Order.total_amount))
-            .filter(Order.user_id == user_id)
-            .scalar()
+            await self.read_db.scalar(
+                select(func.sum(Order.total_amount)).where(Order.user_id == user_id)
+            )
             or 0.0
         )
         return total_spent
 
-    def get_all_orders(
+    async def get_order_totals_by_users(
+        self, user_ids: list[int]
+    ) -> dict[int, tuple[int, float]]:
+        """Order count and amount spent per user, keyed by user id."""
+        if not user_ids:
+            return {}
+        rows = await self.read_db.execute(
+            select(Order.user_id, func.count(Order.id), func.sum(Order.total_amount))
+            .where(Order.user_id.in_(user_ids))
+            .group_by(Order.user_id)
+        )
+        return {user_id: (count, total or 0.0) for user_id, count, total in rows.all()}
+
+    async def get_all_orders(
         self,
         page: int = 1,
         page_size: int = 20,
         status: Optional[str] = None,
         user_id: Optional[int] = None,
+        pagination: str = "offset",
+        cursor: Optional[str] = None,
+        count_mode: Optional[str] = None,
     ):
-        """Get paginated list of all orders with optional filters"""
-        query = self.db.query(Order).join(User, Order.user_id == User.id)
+        """
+        Get paginated list of all orders with optional filters.
+
+        Returns ``(count, orders, next_cursor)``. In cursor mode (``cursor``
+        given or ``pagination="cursor"``) nothing is counted.
+        """
+        query = select(Order).join(User, Order.user_id == User.id)
 
         # Apply filters
         if status:
-            query = query.filter(Order.status == status)
+            query = query.where(Order.status == status)
         if user_id:
-            query = query.filter(Order.user_id == user_id)
-
-        # Get total count
-        total = query.count()
+            query = query.where(Order.user_id == user_id)
+
+        if pagination == "cursor" or cursor:
+            orders, next_cursor = await paginate_keyset(
+                self.read_db,
+                query.options(selectinload(Order.user)),
+                Order.order_date,
+                Order.id,
+                sort_key="order_date:desc",
+                descending=True,
+                limit=page_size,
+                cursor=cursor,
+            )
+            count = Count(None, CountMode.HAS_MORE, next_cursor is not None)
+            return count, orders, next_cursor
 
         # Apply pagination and ordering (newest first)
-        offset = (page - 1) * page_size
-        orders = (
-            query.order_by(Order.order_date.desc())
-            .offset(offset)
-            .limit(page_size)
-            .all()
+        orders, count = await paginate_offset(
+            self.read_db,
+            query.options(selectinload(Order.user)).order_by(
+                Order.order_date.desc(), Order.id.desc()
+            ),
+            page,
+            page_size,
+            CountMode(count_mode or settings.PAGINATION_COUNT_MODE),
+            cache_namespace="orders",
+            filters={"status": status, "user_id": user_id},
         )
-        return total, orders
+        return count, orders, None
 
-    def update_order_status(self, order_id: int, new_status: str) -> Order:
-        order = self.db.query(Order).filter(Order.id == order_id).first()
+    async def update_order_status(self, order_id: int, new_status: str) -> Order:
+        order = await self.db.get(Order, order_id)
         if not order:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND, detail="Order not found"
             )
 
         order.status = new_status
-        self.db.commit()
-        self.db.refresh(order)
+        await self.db.commit()
+        await self.db.refresh(order)
         return order
 
-    def mark_order_shipped(
+    async def mark_order_shipped(
         self, order_id: int, shipped_at: Optional[datetime] = None
     ) -> Order:
         """Mark an order as shipped"""
-        order = self.db.query(Order).filter(Order.id == order_id).first()
+        order = await self.db.get(Order, order_id)
         if not order:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND, detail="Order not found"
@@ -233,6 +326,6 @@ class OrderCrud:
 
         order.status = "shipped"
         order.shipped_at = shipped_at or datetime.now()
-        self.db.commit()
-        self.db.refresh(order)
+        await self.db.commit()
+        await self.db.refresh(order)
         return order
@@ -1,14 +1,14 @@
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 from app.models.payment import Payment
 from datetime import datetime
 
 
 class PaymentCrud:
-    def __init__(self, db: Session):
+    def __init__(self, db: AsyncSession):
         self.db = db
 
-    def create_payment(
+    async def create_payment(
         self,
         order_id: int,
         amount: float,
@@ -23,18 +23,18 @@ class PaymentCrud:
             status="pending",
         )
         self.db.add(payment)
-        self.db.commit()
-        self.db.refresh(payment)
+        await self.db.commit()
+        await self.db.refresh(payment)
         return payment
 
-    def get_payment_by_transaction_id(self, transaction_id: str):
+    async def get_payment_by_transaction_id(self, transaction_id: str):
         stmt = select(Payment).where(Payment.transaction_id == transaction_id)
-        return self.db.execute(stmt).scalar_one_or_none()
+        return (await self.db.execute(stmt)).scalar_one_or_none()
 
-    def update_payment_status(self, payment: Payment, status: str):
+    async def update_payment_status(self, payment: Payment, status: str):
         payment.status = status
         if status == "completed":
             payment.paid_at = datetime.utcnow()
-        self.db.commit()
-        self.db.refresh(payment)
+        await self.db.commit()
+        await self.db.refresh(payment)
         return payment
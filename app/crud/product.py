@@ -1,27 +1,159 @@
+import datetime
+
 from pydantic import HttpUrl
-from sqlalchemy import and_, delete, func, select, update
+from sqlalchemy import and_, bindparam, case, delete, func, select, update
 from sqlalchemy.exc import IntegrityError
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.autocomplete_index import autocomplete_index
+from app.core.config import settings
 from app.core.exceptions import ProductException
 from app.core.logger import logger
+from app.core.product_cache import (
+    invalidate_autocomplete,
+    invalidate_product_listings,
+)
+from app.core.search_outbox import DELETE, enqueue_search_sync, search_fields
+from app.db.counting import Count
 from app.models.category import Category
 from app.models.product import Product
 from app.schema.admin_schema import BulkInventoryUpdateItem, BulkInventoryUpdateResponse
-from app.schema.common_schema import PaginatedResponse, PaginationLinks, PaginationMeta
+from app.schema.common_schema import (
+    CountMode,
+    PaginatedResponse,
+    PaginationLinks,
+    PaginationMeta,
+)
 from app.schema.product_schema import ProductCreate, ProductResponse, ProductUpdate
+from app.schema.search_schema import (
+    FacetBucket,
+    PriceRangeBucket,
+    ProductFacets,
+    ProductSearchQuery,
+)
+from app.utils.es_query import CATEGORY_FACET_SIZE, PRICE_RANGES, price_range_key
 from app.utils.generate_slug import generate_sku, generate_slug
-from typing import List, Literal
+from app.utils.pagination import paginate_keyset, paginate_offset
+from app.utils.popularity import sale_weight
+from typing import Any, List, Literal, Optional, Sequence
 
 allowed_sort_order = Literal["asc", "desc"]
-allowed_sort_by = Literal["id", "price", "name", "created_at", "rating", "popularity"]
+allowed_sort_by = Literal[
+    "id", "price", "name", "created_at", "rating", "popularity", "relevance"
+]
+
+
+# Product fields that can add a product to, drop it from or move it within
+# listings (filters, search and sorting); other edits only change its card
+LISTING_FIELDS = {
+    "name",
+    "description",
+    "price",
+    "category_id",
+    "is_active",
+    "stock_quantity",
+}
+# Fields autocomplete suggestions depend on
+AUTOCOMPLETE_FIELDS = {"name", "is_active"}
+
+
+def listing_base_url(
+    search: str | None = None,
+    category_id: int | None = None,
+    min_price: float | None = None,
+    max_price: float | None = None,
+    min_rating: float | None = None,
+    availability: str | None = "all",
+    sort_by: str | None = "id",
+    sort_order: str = "asc",
+    count_mode: str | None = None,
+) -> str:
+    """GET /product link with the listing's filters, ready for paging params."""
+    base = "/products"
+    query_params = []
+    if search:
+        query_params.append(f"search={search}")
+    if category_id:
+        query_params.append(f"category_id={category_id}")
+    if min_price is not None:
+        query_params.append(f"min_price={min_price}")
+    if max_price is not None:
+        query_params.append(f"max_price={max_price}")
+    if min_rating is not None:
+        query_params.append(f"min_rating={min_rating}")
+    if availability != "all":
+        query_params.append(f"availability={availability}")
+    if sort_by != "id":
+        query_params.append(f"sort_by={sort_by}")
+    if sort_order != "asc":
+        query_params.append(f"sort_order={sort_order}")
+    if count_mode:
+        query_params.append(f"count_mode={count_mode}")
+
+    query_string = "&".join(query_params)
+    return f"{base}?{query_string}&" if query_params else f"{base}?"
+
+
+def offset_listing_page(
+    items: Sequence[Any],
+    page: int,
+    per_page: int,
+    count: Count,
+    base_with_params: str,
+) -> PaginatedResponse:
+    """An OFFSET listing page with its meta and HATEOAS links."""
+    total_pages = (
+        (count.total + per_page - 1) // per_page if count.total is not None else None
+    )
+    offset = (page - 1) * per_page
+    from_item = offset + 1 if items else None
+    to_item = offset + len(items) if items else None
+
+    meta = PaginationMeta(
+        current_page=page,
+        per_page=per_page,
+        total_pages=total_pages,
+        total_items=count.total,
+        count_mode=count.mode,
+        has_more=count.has_more,
+        from_item=from_item,
+        to_item=to_item,
+    )
+
+    links = PaginationLinks(
+        self=f"{base_with_params}page={page}&per_page={per_page}",
+        first=f"{base_with_params}page=1&per_page={per_page}",
+        last=(
+            f"{base_with_params}page={total_pages}&per_page={per_page}"
+            if total_pages is not None
+            else None
+        ),
+        prev=(
+            f"{base_with_params}page={page - 1}&per_page={per_page}"
+            if page > 1
+            else None
+        ),
+        next=(
+            f"{base_with_params}page={page + 1}&per_page={per_page}"
+            if count.has_more
+            else None
+        ),
+    )
+
+    return PaginatedResponse(
+        data=items,
+        meta=meta,
+        links=links,
+    )
 
 
 class ProductCrud:
-    def __init__(self, db: Session):
+    def __init__(self, db: AsyncSession, read_db: Optional[AsyncSession] = None):
         self.db = db
+        # Session for read-only queries; may be bound to a replica
+        self.read_db = read_db or db
 
-    def create_product(self, create_dto: ProductCreate) -> Product:
+    async def create_product(self, create_dto: ProductCreate) -> Product:
         """Create a new product with generated slug and sku."""
         try:
             create_data = create_dto.model_dump()
@@ -33,35 +165,65 @@ class ProductCrud:
             if not product_name:
                 raise ValueError("Product name is required for slug generation.")
 
-            gen_slug = generate_slug(self.db, product_name, context="product")
+            gen_slug = await generate_slug(self.db, product_name, context="product")
             gen_sku = generate_sku(product_name)
 
             product = Product(**create_data, slug=gen_slug, sku=gen_sku)
 
             self.db.add(product)
-            self.db.commit()
-            self.db.refresh(product)
-            return product
+            await self.db.flush()
+            enqueue_search_sync(self.db, [product.id])
+            await self.db.commit()
+            await invalidate_product_listings(category_ids=[product.category_id])
+            await invalidate_autocomplete()
+            created = await self.get_product_by_id(product.id)
+            await autocomplete_index.product_saved(created)
+            return created
         except IntegrityError as e:
-            self.db.rollback()
+            await self.db.rollback()
             logger.info(f"exception: {e}")
             raise ProductException(str(e)) from e
 
-    def get_product_detail(self, slug: str) -> Product:
+    async def get_product_detail(self, slug: str) -> Product:
         """Retrieve a product by slug; returns None if not found."""
         stmt = select(Product).where(Product.slug == slug)
-        product = self.db.scalar(stmt)
+        product = await self.read_db.scalar(stmt)
         if not product:
             return None
         return product
 
-    def get_product_by_id(self, id: int) -> Product | None:
+    async def get_product_by_id(self, id: int) -> Product | None:
         """Retrieve a product by id; returns None if not found."""
-        stmt = select(Product).where(Product.id == id)
-        result = self.db.scalar(stmt)
+        stmt = (
+            select(Product)
+            .where(Product.id == id)
+            .execution_options(populate_existing=True)
+        )
+        result = await self.db.scalar(stmt)
         return result
 
-    def get_all_products(
+    async def get_products_by_ids(self, ids: List[int]) -> list[Product]:
+        """Products with the given ids in one query; missing ids are skipped."""
+        if not ids:
+            return []
+        stmt = (
+            select(Product)
+            .where(Product.id.in_(ids))
+            .execution_options(populate_existing=True)
+        )
+        return (await self.db.scalars(stmt)).all()
+
+    async def get_popular_products(self, limit: int):
+        """Ids and names of the ``limit`` most popular active products."""
+        stmt = (
+            select(Product.id, Product.name)
+            .where(Product.is_active == True)
+            .order_by(Product.popularity.desc(), Product.id)
+            .limit(limit)
+        )
+        return (await self.read_db.execute(stmt)).all()
+
+    async def get_all_products(
         self,
         page: int = 1,
         per_page: int = 10,
@@ -73,6 +235,9 @@ class ProductCrud:
         availability: str | None = "all",
         sort_by: allowed_sort_by | None = "id",
         sort_order: allowed_sort_order = "asc",
+        pagination: str = "offset",
+        cursor: str | None = None,
+        count_mode: str | None = None,
     ) -> PaginatedResponse[ProductResponse]:
         """
         List all products with advanced filtering and sorting.
@@ -88,6 +253,10 @@ class ProductCrud:
             availability: Filter by stock ('all', 'in_stock', 'out_of_stock')
             sort_by: Field to sort by
             sort_order: Sort direction ('asc' or 'desc')
+            pagination: 'offset' (page numbers and totals) or 'cursor' (keyset)
+            cursor: Opaque cursor from a previous page; implies cursor mode
+            count_mode: How total_items is obtained (see CountMode); defaults
+                to settings.PAGINATION_COUNT_MODE
         """
         logger.info(f"page: {page} - per_page: {per_page}")
         logger.info(
@@ -118,7 +287,7 @@ class ProductCrud:
         if max_price is not None:
             stmt = stmt.where(Product.price <= max_price)
 
-        # Rating filter (using hybrid property)
+        # Rating filter (denormalized column maintained by ReviewCrud)
         if min_rating is not None:
             stmt = stmt.where(Product.average_rating >= min_rating)
 
@@ -130,149 +299,173 @@ class ProductCrud:
         # 'all' - no filter needed
 
         # Sorting
-        from app.models.order_item import OrderItem
-
         allowed_sorting_fields = {
             "id": Product.id,
             "name": Product.name,
             "price": Product.price,
             "created_at": Product.created_at,
             "rating": Product.average_rating,
-            "popularity": (
-                select(func.count(OrderItem.id))
-                .where(OrderItem.product_id == Product.id)
-                .correlate_except(OrderItem)
-                .scalar_subquery()
-            ),
+            "popularity": Product.popularity,
         }
 
         sort_field = allowed_sorting_fields.get(sort_by, Product.id)
-        if sort_order == "desc":
-            stmt = stmt.order_by(sort_field.desc())
-        else:
-            stmt = stmt.order_by(sort_field.asc())
-
-        # Count total items matching filters
-        count_stmt = stmt.with_only_columns(func.count())
-        total_items = self.db.scalar(count_stmt)
-
-        # Pagination
-        offset = (page - 1) * per_page
-        items = self.db.scalars(stmt.offset(offset).limit(per_page)).all()
-
-        total_pages = (total_items + per_page - 1) // per_page
-        from_item = offset + 1 if items else None
-        to_item = offset + len(items) if items else None
-
-        meta = PaginationMeta(
-            current_page=page,
-            per_page=per_page,
-            total_pages=total_pages,
-            total_items=total_items,
-            from_item=from_item,
-            to_item=to_item,
-        )
 
         # Build query string for HATEOAS links
-        base = "/products"
-        query_params = []
-        if search:
-            query_params.append(f"search={search}")
-        if category_id:
-            query_params.append(f"category_id={category_id}")
-        if min_price is not None:
-            query_params.append(f"min_price={min_price}")
-        if max_price is not None:
-            query_params.append(f"max_price={max_price}")
-        if min_rating is not None:
-            query_params.append(f"min_rating={min_rating}")
-        if availability != "all":
-            query_params.append(f"availability={availability}")
-        if sort_by != "id":
-            query_params.append(f"sort_by={sort_by}")
-        if sort_order != "asc":
-            query_params.append(f"sort_order={sort_order}")
-
-        query_string = "&".join(query_params)
-        base_with_params = f"{base}?{query_string}&" if query_params else f"{base}?"
-
-        links = PaginationLinks(
-            self=f"{base_with_params}page={page}&per_page={per_page}",
-            first=f"{base_with_params}page=1&per_page={per_page}",
-            last=f"{base_with_params}page={total_pages}&per_page={per_page}",
-            prev=(
-                f"{base_with_params}page={page - 1}&per_page={per_page}"
-                if page > 1
-                else None
-            ),
-            next=(
-                f"{base_with_params}page={page + 1}&per_page={per_page}"
-                if page < total_pages
-                else None
-            ),
+        base_with_params = listing_base_url(
+            search=search,
+            category_id=category_id,
+            min_price=min_price,
+            max_price=max_price,
+            min_rating=min_rating,
+            availability=availability,
+            sort_by=sort_by,
+            sort_order=sort_order,
+            count_mode=count_mode,
         )
 
-        return PaginatedResponse(
-            data=items,
-            meta=meta,
-            links=links,
+        if pagination == "cursor" or cursor:
+            if sort_by == "rating":
+                # Unreviewed products have no rating; keyset needs a value
+                sort_field = func.coalesce(Product.average_rating, 0)
+            items, next_cursor = await paginate_keyset(
+                self.read_db,
+                stmt,
+                sort_field,
+                Product.id,
+                sort_key=f"{sort_by}:{sort_order}",
+                descending=sort_order == "desc",
+                limit=per_page,
+                cursor=cursor,
+            )
+            cursor_base = f"{base_with_params}pagination=cursor&per_page={per_page}"
+            return PaginatedResponse(
+                data=items,
+                meta=PaginationMeta(
+                    per_page=per_page,
+                    count_mode=CountMode.HAS_MORE,
+                    has_more=next_cursor is not None,
+                    next_cursor=next_cursor,
+                ),
+                links=PaginationLinks(
+                    self=f"{cursor_base}&cursor={cursor}" if cursor else cursor_base,
+                    first=cursor_base,
+                    next=f"{cursor_base}&cursor={next_cursor}" if next_cursor else None,
+                ),
+            )
+
+        # Id breaks ties so rows with equal sort values keep a stable order
+        if sort_order == "desc":
+            stmt = stmt.order_by(sort_field.desc(), Product.id.desc())
+        else:
+            stmt = stmt.order_by(sort_field.asc(), Product.id.asc())
+
+        # Total items matching filters, by the requested count strategy
+        items, count = await paginate_offset(
+            self.read_db,
+            stmt,
+            page,
+            per_page,
+            CountMode(count_mode or settings.PAGINATION_COUNT_MODE),
+            cache_namespace="products",
+            filters={
+                "search": search,
+                "category_id": category_id,
+                "min_price": min_price,
+                "max_price": max_price,
+                "min_rating": min_rating,
+                "availability": availability,
+            },
         )
+        return offset_listing_page(items, page, per_page, count, base_with_params)
 
-    def get_products_by_category_id(self, category_id: int) -> list[Product]:
+    async def get_products_by_category_id(self, category_id: int) -> list[Product]:
         stmt = (
             select(Product)
             .where(Product.category_id == category_id)
             .order_by(Product.id)
         )
-        return self.db.scalars(stmt).all()
+        return (await self.read_db.scalars(stmt)).all()
 
-    def get_products_by_category_slug(self, slug: str) -> list[Product]:
+    async def get_products_by_category_slug(self, slug: str) -> list[Product]:
         stmt = (
             select(Product)
             .join(Category, Product.category_id == Category.id)
             .where(Category.slug == slug)
             .order_by(Product.id)
         )
-        return self.db.scalars(stmt).all()
+        return (await self.read_db.scalars(stmt)).all()
 
-    def update_product(self, id: int, update_dto: ProductUpdate) -> Product | None:
+    async def update_product(
+        self, id: int, update_dto: ProductUpdate
+    ) -> Product | None:
         """Partially update product; auto-generate slug when name changes."""
         try:
             update_data = update_dto.model_dump(exclude_unset=True)
 
             if not update_data:
-                return self.get_product_by_id(id)
+                return await self.get_product_by_id(id)
 
             if isinstance(update_data.get("image_url"), HttpUrl):
                 update_data["image_url"] = str(update_data["image_url"])
 
             if "name" in update_data and "slug" not in update_data:
-                update_data["slug"] = generate_slug(self.db, update_data["name"])
+                update_data["slug"] = await generate_slug(
+                    self.db, update_data["name"], context="product"
+                )
+
+            old_category_id = None
+            if "category_id" in update_data:
+                old_category_id = await self.db.scalar(
+                    select(Product.category_id).where(Product.id == id)
+                )
 
             stmt = (
                 update(Product)
                 .where(Product.id == id)
                 .values(**update_data)
-                .returning(Product)
+                .returning(Product.id, Product.category_id)
             )
 
-            updated = self.db.execute(stmt).scalar_one_or_none()
-            self.db.commit()
-            return updated
+            updated = (await self.db.execute(stmt)).one_or_none()
+            if updated is None:
+                await self.db.commit()
+                return None
+            fields = search_fields(update_data)
+            if fields:
+                enqueue_search_sync(self.db, [updated.id], fields=fields)
+            await self.db.commit()
+
+            affected_categories = ()
+            if LISTING_FIELDS & update_data.keys():
+                affected_categories = {old_category_id, updated.category_id}
+            await invalidate_product_listings(
+                product_ids=[updated.id], category_ids=affected_categories
+            )
+            product = await self.get_product_by_id(updated.id)
+            if AUTOCOMPLETE_FIELDS & update_data.keys():
+                await invalidate_autocomplete()
+                await autocomplete_index.product_saved(product)
+            return product
         except IntegrityError as e:
-            self.db.rollback()
+            await self.db.rollback()
             raise ProductException(str(e)) from e
 
-    def delete_product(self, id: int) -> bool:
+    async def delete_product(self, id: int) -> bool:
         """Delete product by id. Returns True if deleted else False."""
-        stmt = delete(Product).where(Product.id == id)
-        result = self.db.execute(stmt)
-        if result.rowcount == 0:
+        stmt = delete(Product).where(Product.id == id).returning(Product.category_id)
+        deleted = (await self.db.execute(stmt)).one_or_none()
+        if deleted is None:
             return False
-        self.db.commit()
+        enqueue_search_sync(self.db, [id], operation=DELETE)
+        await self.db.commit()
+        await invalidate_product_listings(
+            product_ids=[id], category_ids=[deleted.category_id]
+        )
+        await invalidate_autocomplete()
+        await autocomplete_index.product_changed(id, None)
         return True
 
-    def get_product_suggestions(self, query: str, limit: int = 10) -> list[str]:
+    async def get_product_suggestions(self, query: str, limit: int = 10) -> list[str]:
         """
         Get product name suggestions for autocomplete.
 
@@ -298,7 +491,7 @@ class ProductCrud:
             .limit(limit)
         )
 
-        prefix_matches = self.db.scalars(stmt_prefix).all()
+        prefix_matches = (await self.read_db.scalars(stmt_prefix)).all()
 
         # If we have enough prefix matches, return them
         if len(prefix_matches) >= limit:
@@ -315,87 +508,248 @@ class ProductCrud:
             .limit(remaining)
         )
 
-        contains_matches = self.db.scalars(stmt_contains).all()
+        contains_matches = (await self.read_db.scalars(stmt_contains)).all()
 
         # Combine results: prefix matches first, then contains matches
         return list(prefix_matches) + list(contains_matches)
 
-    def deduct_stock(self, product_id: int, item_quantity: int):
+    async def get_facet_counts(self, query: ProductSearchQuery) -> ProductFacets:
+        """
+        Search facets with GROUP BY, for when Elasticsearch is unavailable.
+
+        Same filters and buckets as the search aggregations, with ILIKE
+        standing in for the full-text match: one grouped query for the
+        categories, one pass of conditional sums for prices and stock.
+        """
+        conditions = [Product.is_active == True]
+        if query.text:
+            pattern = f"%{query.text}%"
+            conditions.append(
+                Product.name.ilike(pattern) | Product.description.ilike(pattern)
+            )
+        if query.category is not None:
+            conditions.append(Category.name == query.category)
+        if query.min_price is not None:
+            conditions.append(Product.price >= query.min_price)
+        if query.max_price is not None:
+            conditions.append(Product.price <= query.max_price)
+        if query.in_stock is not None:
+            conditions.append(Product.in_stock == query.in_stock)
+
+        count = func.count(Product.id)
+        categories = await self.read_db.execute(
+            select(Category.name, count)
+            .select_from(Product)
+            .join(Product.category)
+            .where(*conditions)
+            .group_by(Category.name)
+            .order_by(count.desc(), Category.name)
+            .limit(CATEGORY_FACET_SIZE)
+        )
+
+        def matching(condition) -> Any:
+            return func.coalesce(func.sum(case((condition, 1), else_=0)), 0)
+
+        ranges = []
+        for low, high in PRICE_RANGES:
+            bounds = []
+            if low is not None:
+                bounds.append(Product.price >= low)
+            if high is not None:
+                bounds.append(Product.price < high)
+            ranges.append(matching(and_(*bounds)))
+        counts = (
+            await self.read_db.execute(
+                select(*ranges, matching(Product.in_stock))
+                .select_from(Product)
+                .outerjoin(Product.category)
+                .where(*conditions)
+            )
+        ).one()
+
+        return ProductFacets(
+            categories=[
+                FacetBucket(key=name, count=total) for name, total in categories
+            ],
+            price_ranges=[
+                PriceRangeBucket(
+                    key=price_range_key(low, high), min=low, max=high, count=total
+                )
+                for (low, high), total in zip(PRICE_RANGES, counts)
+            ],
+            in_stock=counts[-1],
+        )
+
+    async def deduct_stock(self, product_id: int, item_quantity: int):
         stmt = (
             update(Product)
             .where(Product.id == product_id)
             .values(stock_quantity=Product.stock_quantity - item_quantity)
             .returning(Product.id)
         )
-        self.db.execute(stmt).scalar_one_or_none()
+        (await self.db.execute(stmt)).scalar_one_or_none()
+
+    async def recompute_rating_aggregates(self) -> int:
+        """
+        Rebuild rating_sum/rating_count/average_rating for every product from
+        the reviews table. Used by the backfill command; regular review writes
+        keep the columns current incrementally.
+        """
+        from app.models.review import Review
+
+        def per_product(expr):
+            return (
+                select(expr)
+                .where(Review.product_id == Product.id)
+                .correlate(Product)
+                .scalar_subquery()
+            )
+
+        result = await self.db.execute(
+            update(Product)
+            .values(
+                rating_sum=per_product(func.coalesce(func.sum(Review.rating), 0)),
+                rating_count=per_product(func.count(Review.id)),
+                # not a product edit, keep updated_at as it was
+                updated_at=Product.updated_at,
+                average_rating=per_product(
+                    func.round(func.avg(Review.rating * 1.0), 2)
+                ),
+            )
+            .execution_options(synchronize_session=False)
+        )
+        await self.db.commit()
+        return result.rowcount
+
+    async def recompute_sales_stats(self, half_life_days: float) -> int:
+        """
+        Rebuild sales_count and the forward-decayed popularity from order items.
+
+        Sales are grouped per product and day, so the weights are applied in
+        Python and the same statement works on every backend.
+        """
+        from app.models.order import Order
+        from app.models.order_item import OrderItem
+
+        order_day = func.date(Order.order_date)
+        rows = await self.db.execute(
+            select(OrderItem.product_id, order_day, func.sum(OrderItem.quantity))
+            .join(Order, OrderItem.order_id == Order.id)
+            .group_by(OrderItem.product_id, order_day)
+        )
+
+        stats: dict[int, dict] = {}
+        for product_id, day, quantity in rows.all():
+            if isinstance(day, str):
+                day = datetime.date.fromisoformat(day)
+            entry = stats.setdefault(
+                product_id,
+                {"b_id": product_id, "b_sales_count": 0, "b_popularity": 0.0},
+            )
+            entry["b_sales_count"] += quantity
+            entry["b_popularity"] += quantity * sale_weight(
+                datetime.datetime.combine(day, datetime.time()), half_life_days
+            )
+
+        # Core statements so updated_at is left alone (these are not edits)
+        products = Product.__table__
+        await self.db.execute(
+            update(products).values(
+                sales_count=0, popularity=0.0, updated_at=products.c.updated_at
+            )
+        )
+        if stats:
+            await self.db.execute(
+                update(products)
+                .where(products.c.id == bindparam("b_id"))
+                .values(
+                    sales_count=bindparam("b_sales_count"),
+                    popularity=bindparam("b_popularity"),
+                    updated_at=products.c.updated_at,
+                ),
+                list(stats.values()),
+            )
+        await self.db.commit()
+        return len(stats)
 
-    def get_total_products(self):
-        total_products = self.db.query(func.count(Product.id)).scalar() or 0
+    async def get_total_products(self):
+        total_products = await self.read_db.scalar(select(func.count(Product.id))) or 0
         return total_products
 
-    def total_active_products(self):
+    async def total_active_products(self):
         active_products = (
-            self.db.query(func.count(Product.id))
-            .filter(Product.is_active == True)
-            .scalar()
+            await self.read_db.scalar(
+                select(func.count(Product.id)).where(Product.is_active == True)
+            )
             or 0
         )
         return active_products
 
-    def total_inactive_products(self):
+    async def total_inactive_products(self):
         inactive_products = (
-            self.db.query(func.count(Product.id))
-            .filter(Product.is_active == False)
-            .scalar()
+            await self.read_db.scalar(
+                select(func.count(Product.id)).where(Product.is_active == False)
+            )
             or 0
         )
         return inactive_products
 
-    def out_of_stock_count(self):
+    async def out_of_stock_count(self):
         out_stock_count = (
-            self.db.query(func.count(Product.id))
-            .filter(Product.stock_quantity == 0)
-            .scalar()
+            await self.read_db.scalar(
+                select(func.count(Product.id)).where(Product.stock_quantity == 0)
+            )
             or 0
         )
         return out_stock_count
 
-    def low_stock_count(self):
+    async def low_stock_count(self):
         low_stock_count = (
-            self.db.query(func.count(Product.id))
-            .filter(and_(Product.stock_quantity > 0, Product.stock_quantity < 10))
-            .scalar()
+            await self.read_db.scalar(
+                select(func.count(Product.id)).where(
+                    and_(Product.stock_quantity > 0, Product.stock_quantity < 10)
+                )
+            )
             or 0
         )
         return low_stock_count
 
-    def get_slow_stock_products(self, threshold: int):
-        products = (
-            self.db.query(Product)
-            .filter(
-                and_(Product.stock_quantity > 0, Product.stock_quantity < threshold)
-            )
+    async def get_slow_stock_products(self, threshold: int):
+        stmt = (
+            select(Product)
+            .where(and_(Product.stock_quantity > 0, Product.stock_quantity < threshold))
             .order_by(Product.stock_quantity.asc())
-            .all()
         )
+        products = (await self.read_db.scalars(stmt)).all()
         return products
 
-    def bulk_update_inventory(self, updates: List[BulkInventoryUpdateItem]):
+    async def bulk_update_inventory(self, updates: List[BulkInventoryUpdateItem]):
         """Bulk update product inventory"""
         updated_count = 0
         failed_products = []
+        updated_ids = []
+        # Products and categories where a product went in or out of stock
+        restocked_ids = []
+        restocked_categories = set()
 
         for update in updates:
-            product = (
-                self.db.query(Product).filter(Product.id == update.product_id).first()
-            )
+            product = await self.db.get(Product, update.product_id)
             if not product:
                 failed_products.append(update.product_id)
                 continue
 
+            if (product.stock_quantity > 0) != (update.stock_quantity > 0):
+                restocked_ids.append(product.id)
+                restocked_categories.add(product.category_id)
             product.stock_quantity = update.stock_quantity
+            updated_ids.append(product.id)
             updated_count += 1
 
-        self.db.commit()
+        # Only in_stock is indexed, so other stock changes need no sync
+        enqueue_search_sync(self.db, restocked_ids, fields=["in_stock"])
+        await self.db.commit()
+        await invalidate_product_listings(
+            product_ids=updated_ids, category_ids=restocked_categories
+        )
 
         return updated_count, failed_products
@@ -1,19 +1,64 @@
 from fastapi import HTTPException, status
-from sqlalchemy.orm import Session
-from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+from sqlalchemy import case, func, select, update
 from typing import List, Optional
 
 from app.models.product import Product
 from app.models.review import Review
 from app.models.user import User
 from app.schema.review_schema import ReviewCreate, ReviewUpdate
+from app.core.cached import invalidate_cached
+from app.core.config import settings
+from app.core.product_cache import invalidate_product_listings
+from app.db.counting import Count
+from app.schema.common_schema import CountMode
+from app.utils.pagination import paginate_keyset, paginate_offset
+
+
+def review_tag(product_id: int) -> str:
+    """Tag of the cached review lists of a product (see ReviewService)."""
+    return f"reviews:product:{product_id}"
+
+
+async def invalidate_reviews(product_id: int) -> None:
+    # Review writes also change the product's rating aggregates
+    await invalidate_cached([review_tag(product_id)])
+    await invalidate_product_listings(product_ids=[product_id])
 
 
 class ReviewCrud:
-    def __init__(self, db: Session):
+    def __init__(self, db: AsyncSession, read_db: Optional[AsyncSession] = None):
         self.db = db
+        # Session for read-only queries; may be bound to a replica
+        self.read_db = read_db or db
+
+    async def _apply_rating_change(
+        self, product_id: int, rating_delta: int, count_delta: int
+    ) -> None:
+        """
+        Adjust the product's rating aggregates in the current transaction.
+
+        A single UPDATE computed from the stored values, so concurrent review
+        writes for the same product cannot lose each other's changes.
+        """
+        new_sum = Product.rating_sum + rating_delta
+        new_count = Product.rating_count + count_delta
+        await self.db.execute(
+            update(Product)
+            .where(Product.id == product_id)
+            .values(
+                rating_sum=new_sum,
+                rating_count=new_count,
+                average_rating=case(
+                    (new_count > 0, func.round(new_sum * 1.0 / new_count, 2)),
+                    else_=None,
+                ),
+            )
+            .execution_options(synchronize_session=False)
+        )
 
-    def create_review(self, review: ReviewCreate, user_id: int) -> Review:
+    async def create_review(self, review: ReviewCreate, user_id: int) -> Review:
         db_review = Review(
             user_id=user_id,
             product_id=review.product_id,
@@ -21,11 +66,13 @@ class ReviewCrud:
             comment=review.comment,
         )
         self.db.add(db_review)
-        self.db.commit()
-        self.db.refresh(db_review)
+        await self._apply_rating_change(review.product_id, review.rating, 1)
+        await self.db.commit()
+        await self.db.refresh(db_review)
+        await invalidate_reviews(db_review.product_id)
         return db_review
 
-    def get_reviews_by_product(
+    async def get_reviews_by_product(
         self, product_id: int, skip: int = 0, limit: int = 100
     ) -> List[Review]:
         stmt = (
@@ -34,110 +81,167 @@ class ReviewCrud:
             .offset(skip)
             .limit(limit)
         )
-        return list(self.db.execute(stmt).scalars().all())
+        return list((await self.read_db.execute(stmt)).scalars().all())
 
-    def get_review(self, review_id: int) -> Optional[Review]:
-        return self.db.get(Review, review_id)
+    async def get_review(self, review_id: int) -> Optional[Review]:
+        return await self.db.get(Review, review_id)
 
-    def update_review(self, db_review: Review, review_update: ReviewUpdate) -> Review:
+    async def update_review(
+        self, db_review: Review, review_update: ReviewUpdate
+    ) -> Review:
         if review_update.rating is not None:
+            await self._apply_rating_change(
+                db_review.product_id, review_update.rating - db_review.rating, 0
+            )
             db_review.rating = review_update.rating
         if review_update.comment is not None:
             db_review.comment = review_update.comment
 
-        self.db.commit()
-        self.db.refresh(db_review)
+        await self.db.commit()
+        await self.db.refresh(db_review)
+        await invalidate_reviews(db_review.product_id)
         return db_review
 
-    def delete_review(self, db_review: Review) -> None:
-        self.db.delete(db_review)
-        self.db.commit()
+    async def delete_review(self, db_review: Review) -> None:
+        await self.db.delete(db_review)
+        await self._apply_rating_change(db_review.product_id, -db_review.rating, -1)
+        await self.db.commit()
+        await invalidate_reviews(db_review.product_id)
 
-    def total_reviews(self):
-        total_reviews = self.db.query(func.count(Review.id)).scalar() or 0
+    async def total_reviews(self):
+        total_reviews = await self.read_db.scalar(select(func.count(Review.id))) or 0
         return total_reviews
 
-    def pending_reviews(self):
+    async def pending_reviews(self):
         pending_reviews = (
-            self.db.query(func.count(Review.id))
-            .filter(Review.is_approved == False)
-            .scalar()
+            await self.read_db.scalar(
+                select(func.count(Review.id)).where(Review.is_approved == False)
+            )
             or 0
         )
         return pending_reviews
 
-    def approved_reviews(self):
+    async def approved_reviews(self):
         approved_reviews = (
-            self.db.query(func.count(Review.id))
-            .filter(Review.is_approved == True)
-            .scalar()
+            await self.read_db.scalar(
+                select(func.count(Review.id)).where(Review.is_approved == True)
+            )
             or 0
         )
         return approved_reviews
 
-    def average_rating(self):
-        average_rating = self.db.query(func.avg(Review.rating)).scalar()
+    async def average_rating(self):
+        average_rating = await self.read_db.scalar(select(func.avg(Review.rating)))
         return average_rating
 
-    def get_pending_reviews(self, page: int = 1, page_size: int = 20):
-        """Get paginated list of pending reviews"""
+    async def _get_reviews_page(
+        self,
+        query,
+        cache_namespace: str,
+        page: int,
+        page_size: int,
+        pagination: str,
+        cursor: Optional[str],
+        count_mode: Optional[str],
+    ) -> tuple[Count, list[Review], Optional[str]]:
+        """Page of ``query``, newest first, as ``(count, reviews, next_cursor)``."""
+        query = query.options(selectinload(Review.user), selectinload(Review.product))
+        if pagination != "cursor" and not cursor:
+            reviews, count = await paginate_offset(
+                self.read_db,
+                query.order_by(Review.created_at.desc(), Review.id.desc()),
+                page,
+                page_size,
+                CountMode(count_mode or settings.PAGINATION_COUNT_MODE),
+                cache_namespace=cache_namespace,
+                filters={},
+            )
+            return count, reviews, None
+
+        reviews, next_cursor = await paginate_keyset(
+            self.read_db,
+            query,
+            Review.created_at,
+            Review.id,
+            sort_key="created_at:desc",
+            descending=True,
+            limit=page_size,
+            cursor=cursor,
+        )
+        count = Count(None, CountMode.HAS_MORE, next_cursor is not None)
+        return count, reviews, next_cursor
+
+    async def get_pending_reviews(
+        self,
+        page: int = 1,
+        page_size: int = 20,
+        pagination: str = "offset",
+        cursor: Optional[str] = None,
+        count_mode: Optional[str] = None,
+    ):
+        """
+        Get paginated list of pending reviews.
+
+        Returns ``(count, reviews, next_cursor)``; nothing is counted in cursor mode.
+        """
         query = (
-            self.db.query(Review)
+            select(Review)
             .join(User, Review.user_id == User.id)
             .join(Product, Review.product_id == Product.id)
-            .filter(Review.is_approved == False)
+            .where(Review.is_approved == False)
         )
-
-        total = query.count()
-
-        offset = (page - 1) * page_size
-        reviews = (
-            query.order_by(Review.created_at.desc())
-            .offset(offset)
-            .limit(page_size)
-            .all()
+        return await self._get_reviews_page(
+            query, "reviews:pending", page, page_size, pagination, cursor, count_mode
         )
-        return total, reviews
 
-    def get_all_reviews(self, page: int = 1, page_size: int = 20):
-        """Get paginated list of all reviews"""
+    async def get_all_reviews(
+        self,
+        page: int = 1,
+        page_size: int = 20,
+        pagination: str = "offset",
+        cursor: Optional[str] = None,
+        count_mode: Optional[str] = None,
+    ):
+        """
+        Get paginated list of all reviews.
+
+        Returns ``(count, reviews, next_cursor)``; nothing is counted in cursor mode.
+        """
         query = (
-            self.db.query(Review)
+            select(Review)
             .join(User, Review.user_id == User.id)
             .join(Product, Review.product_id == Product.id)
         )
-
-        total = query.count()
-
-        offset = (page - 1) * page_size
-        reviews = (
-            query.order_by(Review.created_at.desc())
-            .offset(offset)
-            .limit(page_size)
-            .all()
+        return await self._get_reviews_page(
+            query, "reviews", page, page_size, pagination, cursor, count_mode
         )
-        return total, reviews
 
-    def approve_review(self, review_id: int) -> Review:
-        """Approve a review"""
-        review = self.db.query(Review).filter(Review.id == review_id).first()
+    async def approve_review(self, review_id: int) -> Review:
+        """
+        Approve a review. Rating aggregates already include pending reviews,
+        so they are unchanged.
+        """
+        review = await self.db.get(Review, review_id)
         if not review:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND, detail="Review not found"
             )
 
         review.is_approved = True
-        self.db.commit()
-        self.db.refresh(review)
+        await self.db.commit()
+        await self.db.refresh(review)
+        await invalidate_reviews(review.product_id)
         return review
 
-    def reject_review(self, review_id: int) -> None:
+    async def reject_review(self, review_id: int) -> None:
         """Reject/delete a review"""
-        review = self.db.query(Review).filter(Review.id == review_id).first()
+        review = await self.db.get(Review, review_id)
         if not review:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND, detail="Review not found"
             )
 
-        self.db.delete(review)
-        self.db.commit()
+        await self.db.delete(review)
+        await self._apply_rating_change(review.product_id, -review.rating, -1)
+        await self.db.commit()
+        await invalidate_reviews(review.product_id)
@@ -1,20 +1,27 @@
 from datetime import datetime, timedelta
-from sqlalchemy import func, or_
+from sqlalchemy import func, or_, select
 from app.models.user import User
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
 from pydantic import EmailStr
 from typing import Optional
 from app.schema.user_schema import CreateUserSchema, UpdateUserSchema
+from app.core.config import settings
+from app.db.counting import Count
+from app.schema.common_schema import CountMode
+from app.utils.pagination import paginate_keyset, paginate_offset
 from app.utils.security import hash_password
 from sqlalchemy.exc import SQLAlchemyError
 from fastapi import HTTPException, status
 
 
 class UserCrud:
-    def __init__(self, db: Session):
+    def __init__(self, db: AsyncSession, read_db: Optional[AsyncSession] = None):
         self.db = db
+        # Session for read-only queries; may be bound to a replica
+        self.read_db = read_db or db
 
-    def create_user(self, user_create_data: CreateUserSchema) -> User:
+    async def create_user(self, user_create_data: CreateUserSchema) -> User:
         """
         Create a new user
         """
@@ -25,87 +32,123 @@ class UserCrud:
                 password_hash=hashed_password,
             )
             self.db.add(db_user)
-            self.db.commit()
-            self.db.refresh(db_user)
-            return db_user
+            await self.db.commit()
+            return await self.get_user(db_user.id)
         except SQLAlchemyError as e:
-            self.db.rollback()
+            await self.db.rollback()
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail="Failed to create user",
             )
 
-    def get_user(self, user_id: int) -> Optional[User]:
+    async def get_user(self, user_id: int) -> Optional[User]:
         """
         Retrieve a single user by ID.
         """
-        return self.db.query(User).filter(User.id == user_id).first()
+        stmt = (
+            select(User)
+            .where(User.id == user_id)
+            .options(selectinload(User.addresses))
+            .execution_options(populate_existing=True)
+        )
+        return await self.db.scalar(stmt)
 
-    def get_user_by_email(self, email: EmailStr) -> Optional[User]:
+    async def get_user_by_email(self, email: EmailStr) -> Optional[User]:
         """
         Retrieve a single user by email
         """
-        return self.db.query(User).filter(User.email == email).first()
+        return await self.db.scalar(select(User).where(User.email == email))
 
-    def get_total_users(self):
-        total_users = self.db.query(func.count(User.id)).scalar() or 0
+    async def get_total_users(self):
+        total_users = await self.read_db.scalar(select(func.count(User.id))) or 0
         return total_users
 
-    def get_total_customers(self):
+    async def get_total_customers(self):
         total_customers = (
-            self.db.query(func.count(User.id)).filter(User.role == "customer").scalar()
+            await self.read_db.scalar(
+                select(func.count(User.id)).where(User.role == "customer")
+            )
             or 0
         )
         return total_customers
 
-    def get_total_admins(self):
+    async def get_total_admins(self):
         total_admins = (
-            self.db.query(func.count(User.id)).filter(User.role == "admin").scalar()
+            await self.read_db.scalar(
+                select(func.count(User.id)).where(User.role == "admin")
+            )
             or 0
         )
         return total_admins
 
-    def get_new_user_in_last_thirty_days(self):
+    async def get_new_user_in_last_thirty_days(self):
         thirty_days_ago = datetime.now() - timedelta(days=30)
         new_user_last_30_days = (
-            self.db.query(func.count(User.id))
-            .filter(User.created_at >= thirty_days_ago)
-            .scalar()
+            await self.read_db.scalar(
+                select(func.count(User.id)).where(User.created_at >= thirty_days_ago)
+            )
             or 0
         )
         return new_user_last_30_days
 
-    def get_all_users(
+    async def get_all_users(
         self,
         page: int = 1,
         page_size: int = 20,
         search: Optional[str] = None,
         role: Optional[str] = None,
+        pagination: str = "offset",
+        cursor: Optional[str] = None,
+        count_mode: Optional[str] = None,
     ):
-        query = self.db.query(User)
+        """
+        Returns ``(count, users, next_cursor)``. In cursor mode (``cursor``
+        given or ``pagination="cursor"``) nothing is counted.
+        """
+        query = select(User)
         if search:
             search_filter = or_(
                 User.email.ilike(f"%{search}%"),
                 User.first_name.ilike(f"%{search}%"),
                 User.last_name.ilike(f"%{search}%"),
             )
-            query = query.filter(search_filter)
+            query = query.where(search_filter)
         if role:
-            query = query.filter(User.role == role)
-        total = query.count()
-        offset = (page - 1) * page_size
-        users = query.offset(offset).limit(page_size).all()
-        return total, users
+            query = query.where(User.role == role)
+
+        if pagination == "cursor" or cursor:
+            users, next_cursor = await paginate_keyset(
+                self.read_db,
+                query,
+                User.id,
+                User.id,
+                sort_key="id:asc",
+                descending=False,
+                limit=page_size,
+                cursor=cursor,
+            )
+            count = Count(None, CountMode.HAS_MORE, next_cursor is not None)
+            return count, users, next_cursor
+
+        users, count = await paginate_offset(
+            self.read_db,
+            query.order_by(User.id),
+            page,
+            page_size,
+            CountMode(count_mode or settings.PAGINATION_COUNT_MODE),
+            cache_namespace="users",
+            filters={"search": search, "role": role},
+        )
+        return count, users, None
 
-    def update_user_role(self, user_id: int, new_role: str) -> User:
+    async def update_user_role(self, user_id: int, new_role: str) -> User:
         """Update a user's role"""
-        user = self.db.query(User).filter(User.id == user_id).first()
+        user = await self.get_user(user_id)
         if not user:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND, detail="User not found"
             )
 
         user.role = new_role
-        self.db.commit()
-        self.db.refresh(user)
-        return user
+        await self.db.commit()
+        return await self.get_user(user_id)
@@ -0,0 +1,116 @@
+import hashlib
+import json
+from typing import Any, Dict, NamedTuple, Optional, Tuple
+
+from sqlalchemy import Select, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.logger import logger
+from app.core.redis import redis_client
+from app.schema.common_schema import CountMode
+
+COUNT_CACHE_PREFIX = "count"
+
+
+class Count(NamedTuple):
+    """A listing's total (None when not counted) and how it was obtained."""
+
+    total: Optional[int]
+    mode: CountMode
+    has_more: bool
+
+
+def count_cache_key(namespace: str, filters: Dict[str, Any]) -> str:
+    """Key for one listing's count; filters that are None do not matter."""
+    normalized = {k: v for k, v in sorted(filters.items()) if v is not None}
+    digest = hashlib.sha1(
+        json.dumps(normalized, sort_keys=True, default=str).encode()
+    ).hexdigest()
+    return f"{COUNT_CACHE_PREFIX}:{namespace}:{digest}"
+
+
+async def exact_count(session: AsyncSession, stmt: Select) -> int:
+    count_stmt = select(func.count()).select_from(stmt.order_by(None).subquery())
+    return await session.scalar(count_stmt) or 0
+
+
+async def cached_count(
+    session: AsyncSession, stmt: Select, cache_key: str
+) -> Tuple[int, CountMode]:
+    """
+    Exact count memoized in Redis for COUNT_CACHE_TTL_SECONDS.
+
+    Fails open: if Redis is unavailable the count is computed exactly.
+    """
+    try:
+        cached = await redis_client.get_json(cache_key)
+    except Exception as e:
+        logger.warning(f"Count cache unavailable, counting exactly: {e}")
+        return await exact_count(session, stmt), CountMode.EXACT
+
+    if cached is not None:
+        return int(cached), CountMode.CACHED
+
+    total = await exact_count(session, stmt)
+    try:
+        await redis_client.set_json(
+            cache_key, total, ex=settings.COUNT_CACHE_TTL_SECONDS
+        )
+    except Exception as e:
+        logger.warning(f"Failed to cache count {cache_key}: {e}")
+    return total, CountMode.CACHED
+
+
+async def estimated_count(session: AsyncSession, stmt: Select) -> Optional[int]:
+    """
+    The PostgreSQL planner's row estimate for ``stmt``, or None when the
+    backend has no usable estimate.
+
+    Only trustworthy for queries without selective filters; the planner's
+    statistics are refreshed by (auto)ANALYZE, not on every write.
+    """
+    if session.bind.dialect.name != "postgresql":
+        return None
+    compiled = stmt.order_by(None).compile(
+        dialect=session.bind.dialect, compile_kwargs={"literal_binds": True}
+    )
+    # Driver-level SQL: the rendered literals must not be parsed as binds
+    conn = await session.connection()
+    result = await conn.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {compiled}")
+    plan = result.scalar()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+async def count_rows(
+    session: AsyncSession,
+    stmt: Select,
+    mode: CountMode,
+    cache_key: str,
+    filtered: bool,
+) -> Tuple[int, CountMode]:
+    """
+    Count the rows of ``stmt`` with the requested strategy.
+
+    Returns the total and the mode that actually produced it: an estimate is
+    only used for unfiltered listings on PostgreSQL, otherwise the cached
+    count is used instead, which itself falls back to an exact count when
+    Redis is unavailable.
+    """
+    if mode == CountMode.ESTIMATED and not filtered:
+        try:
+            estimate = await estimated_count(session, stmt)
+        except Exception as e:
+            logger.warning(f"Row estimate failed, using cached count: {e}")
+            estimate = None
+        if estimate is not None:
+            return estimate, CountMode.ESTIMATED
+        mode = CountMode.CACHED
+    elif mode == CountMode.ESTIMATED:
+        mode = CountMode.CACHED
+
+    if mode == CountMode.CACHED:
+        return await cached_count(session, stmt, cache_key)
+    return await exact_count(session, stmt), CountMode.EXACT
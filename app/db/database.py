@@ -1,11 +1,102 @@
+from contextlib import AsyncExitStack
+
 from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker, Session
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
 from sqlalchemy import text
 from sqlalchemy.orm import DeclarativeBase
 from app.core.config import settings
+from app.core.logger import logger
+from app.db.pool_metrics import (
+    InstrumentedAsyncQueuePool,
+    InstrumentedQueuePool,
+    instrument_engine,
+)
+
+
+# Async driver used for each sync URL scheme we support
+ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "postgresql": "postgresql+asyncpg",
+    "postgresql+psycopg2": "postgresql+asyncpg",
+    "postgres": "postgresql+asyncpg",
+}
+
 
+def get_async_database_url(url: str) -> str:
+    """
+    Derive the async driver URL from a sync database URL.
+
+    URLs that already name an async driver are returned unchanged.
+    """
+    scheme, sep, rest = url.partition("://")
+    if not sep:
+        return url
+    return f"{ASYNC_DRIVERS.get(scheme, scheme)}://{rest}"
 
-engine = create_engine(settings.Database_url, connect_args={"check_same_thread": False})
+
+def _connect_args(url: str) -> dict:
+    if url.startswith("sqlite"):
+        return {"check_same_thread": False}
+    return {}
+
+
+def _is_memory_sqlite(url: str) -> bool:
+    return url.startswith("sqlite") and (url.endswith(":memory:") or "///" not in url)
+
+
+def _pool_kwargs(url: str, poolclass: type, name: str) -> dict:
+    """
+    Pool options from settings. In-memory sqlite keeps its single-connection
+    pool, which does not accept size/overflow/timeout.
+    """
+    if _is_memory_sqlite(url):
+        return {}
+    return {
+        "poolclass": poolclass,
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+        "pool_logging_name": name,
+    }
+
+
+# Sync engine kept for alembic, seeding and other offline scripts
+engine = create_engine(
+    settings.Database_url,
+    connect_args=_connect_args(settings.Database_url),
+    **_pool_kwargs(settings.Database_url, InstrumentedQueuePool, "sync"),
+)
+instrument_engine(engine)
+
+async_database_url = settings.ASYNC_DATABASE_URL or get_async_database_url(
+    settings.Database_url
+)
+async_engine = create_async_engine(
+    async_database_url,
+    connect_args=_connect_args(async_database_url),
+    **_pool_kwargs(async_database_url, InstrumentedAsyncQueuePool, "primary"),
+)
+instrument_engine(async_engine.sync_engine)
+
+replica_database_url = (
+    get_async_database_url(settings.REPLICA_DATABASE_URL)
+    if settings.REPLICA_DATABASE_URL
+    else ""
+)
+replica_engine = (
+    create_async_engine(
+        replica_database_url,
+        connect_args=_connect_args(replica_database_url),
+        **_pool_kwargs(replica_database_url, InstrumentedAsyncQueuePool, "replica"),
+    )
+    if replica_database_url
+    else None
+)
+if replica_engine is not None:
+    instrument_engine(replica_engine.sync_engine)
 
 
 class Base(DeclarativeBase):
@@ -16,13 +107,50 @@ Base.metadata.create_all(engine)
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# expire_on_commit=False: attributes stay readable after commit without an
+# implicit (and in async, illegal) lazy refresh.
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine,
+    class_=AsyncSession,
+    autoflush=False,
+    expire_on_commit=False,
+)
+
+ReplicaSessionLocal = (
+    async_sessionmaker(
+        bind=replica_engine,
+        class_=AsyncSession,
+        autoflush=False,
+        expire_on_commit=False,
+    )
+    if replica_engine is not None
+    else None
+)
+
+
+async def warm_up_pool(connections: int = settings.DB_POOL_WARMUP) -> int:
+    """
+    Open up to ``connections`` pooled connections and return them to the pool,
+    so the first requests after startup do not pay the connect cost.
+    """
+    connections = min(connections, settings.DB_POOL_SIZE)
+    if connections <= 0 or _is_memory_sqlite(async_database_url):
+        return 0
+
+    async with AsyncExitStack() as stack:
+        for _ in range(connections):
+            conn = await stack.enter_async_context(async_engine.connect())
+            await conn.execute(text("SELECT 1"))
+    logger.info(f"Database pool warmed up with {connections} connections")
+    return connections
+
 
-def check_db_health(db: Session) -> bool:
+async def check_db_health(db: AsyncSession) -> bool:
     """
     Attempts to execute a minimal query to verify database connection.
     """
     try:
-        db.execute(text("SELECT 1 "))
+        await db.execute(text("SELECT 1 "))
         return True
     except Exception:
         return False
@@ -0,0 +1,95 @@
+import time
+
+from prometheus_client import Counter, Gauge, Histogram
+from sqlalchemy import event, exc
+from sqlalchemy.engine import Engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, Pool, QueuePool
+
+# Exposed on /metrics by the default registry the Instrumentator serves
+POOL_CHECKOUTS = Counter(
+    "db_pool_checkouts_total",
+    "Connections checked out of the pool",
+    ["engine"],
+)
+POOL_CHECKOUT_WAIT = Histogram(
+    "db_pool_checkout_wait_seconds",
+    "Time spent waiting for a pooled connection",
+    ["engine"],
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30),
+)
+POOL_TIMEOUTS = Counter(
+    "db_pool_timeouts_total",
+    "Checkouts that gave up after pool_timeout",
+    ["engine"],
+)
+POOL_CHECKED_OUT = Gauge(
+    "db_pool_checked_out",
+    "Connections currently checked out",
+    ["engine"],
+)
+POOL_OVERFLOW = Gauge(
+    "db_pool_overflow",
+    "Connections currently open beyond pool_size",
+    ["engine"],
+)
+POOL_CONNECTIONS_OPENED = Counter(
+    "db_pool_connections_opened_total",
+    "New DBAPI connections opened by the pool",
+    ["engine"],
+)
+
+
+def _pool_label(pool: Pool) -> str:
+    return pool.logging_name or "default"
+
+
+class _TimedCheckoutMixin:
+    """Records how long each checkout waited and whether it timed out."""
+
+    def _do_get(self):
+        label = _pool_label(self)
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        except exc.TimeoutError:
+            POOL_TIMEOUTS.labels(engine=label).inc()
+            raise
+        finally:
+            POOL_CHECKOUT_WAIT.labels(engine=label).observe(time.perf_counter() - start)
+
+
+class InstrumentedQueuePool(_TimedCheckoutMixin, QueuePool):
+    pass
+
+
+class InstrumentedAsyncQueuePool(_TimedCheckoutMixin, AsyncAdaptedQueuePool):
+    pass
+
+
+def _refresh_gauges(pool: Pool) -> None:
+    label = _pool_label(pool)
+    if isinstance(pool, QueuePool):
+        POOL_CHECKED_OUT.labels(engine=label).set(pool.checkedout())
+        POOL_OVERFLOW.labels(engine=label).set(max(pool.overflow(), 0))
+
+
+def instrument_engine(engine: Engine) -> None:
+    """
+    Attach pool listeners to a (sync) engine.
+
+    For an AsyncEngine pass ``async_engine.sync_engine``. Listeners are kept
+    when the pool is recreated after ``dispose()``.
+    """
+
+    @event.listens_for(engine, "connect")
+    def _on_connect(dbapi_connection, connection_record):
+        POOL_CONNECTIONS_OPENED.labels(engine=_pool_label(engine.pool)).inc()
+
+    @event.listens_for(engine, "checkout")
+    def _on_checkout(dbapi_connection, connection_record, connection_proxy):
+        POOL_CHECKOUTS.labels(engine=_pool_label(engine.pool)).inc()
+        _refresh_gauges(engine.pool)
+
+    @event.listens_for(engine, "checkin")
+    def _on_checkin(dbapi_connection, connection_record):
+        _refresh_gauges(engine.pool)
@@ -0,0 +1,105 @@
+import asyncio
+import time
+from typing import Optional
+
+from prometheus_client import Counter, Gauge
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from app.core.config import settings
+from app.core.logger import logger
+from app.db.database import replica_engine
+
+REPLICA_LAG = Gauge("db_replica_lag_seconds", "Last measured replication lag")
+REPLICA_AVAILABLE = Gauge(
+    "db_replica_available", "1 when reads are routed to the replica, 0 otherwise"
+)
+REPLICA_FALLBACKS = Counter(
+    "db_replica_fallbacks_total",
+    "Read sessions served by the primary because the replica was unavailable",
+)
+
+# Zero when the standby has replayed everything it received, so an idle
+# primary does not make a healthy replica look stale.
+POSTGRES_LAG_SQL = text(
+    """
+    SELECT CASE
+        WHEN NOT pg_is_in_recovery()
+            OR pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+        ELSE COALESCE(
+            EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0
+        )
+    END
+    """
+)
+
+
+class ReplicaMonitor:
+    """
+    Decides whether read-only sessions may use the replica.
+
+    The check result is cached for ``check_interval`` seconds so the lag query
+    runs at most once per interval per worker, not once per request.
+    """
+
+    def __init__(
+        self,
+        engine: Optional[AsyncEngine],
+        max_lag: float = settings.REPLICA_MAX_LAG_SECONDS,
+        check_interval: float = settings.REPLICA_CHECK_INTERVAL_SECONDS,
+        check_timeout: float = settings.REPLICA_CHECK_TIMEOUT_SECONDS,
+    ):
+        self.engine = engine
+        self.max_lag = max_lag
+        self.check_interval = check_interval
+        self.check_timeout = check_timeout
+        self._available = False
+        self._checked_at: Optional[float] = None
+        self._lock = asyncio.Lock()
+
+    def _is_fresh(self) -> bool:
+        return (
+            self._checked_at is not None
+            and time.monotonic() - self._checked_at < self.check_interval
+        )
+
+    async def get_lag(self) -> float:
+        """Replication lag in seconds; 0 for backends we cannot measure."""
+        async with self.engine.connect() as conn:
+            if conn.dialect.name == "postgresql":
+                return float(await conn.scalar(POSTGRES_LAG_SQL) or 0.0)
+            await conn.execute(text("SELECT 1"))
+            return 0.0
+
+    async def _check(self) -> bool:
+        try:
+            lag = await asyncio.wait_for(self.get_lag(), timeout=self.check_timeout)
+        except Exception as e:
+            logger.warning(f"Replica check failed, reading from primary: {e}")
+            return False
+
+        REPLICA_LAG.set(lag)
+        if lag > self.max_lag:
+            logger.warning(
+                f"Replica lag {lag:.2f}s exceeds {self.max_lag}s, reading from primary"
+            )
+            return False
+        return True
+
+    async def is_available(self) -> bool:
+        if self.engine is None:
+            return False
+
+        if not self._is_fresh():
+            async with self._lock:
+                if not self._is_fresh():
+                    self._available = await self._check()
+                    self._checked_at = time.monotonic()
+                    REPLICA_AVAILABLE.set(int(self._available))
+
+        if not self._available:
+            REPLICA_FALLBACKS.inc()
+        return self._available
+
+
+replica_monitor = ReplicaMonitor(engine=replica_engine)
@@ -1,14 +1,16 @@
-from typing import Annotated, Generator, Optional
+from typing import Annotated, AsyncGenerator, Optional
 
 from elasticsearch import AsyncElasticsearch
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPAuthorizationCredentials, HTTPBearer
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core import elastic_config
 from app.core.elastic_config import get_es_client
 from app.core.logger import *
 from app.core.redis import RedisClient, redis_client
-from app.db.database import SessionLocal
+from app.db.database import AsyncSessionLocal, ReplicaSessionLocal
+from app.db.replica import replica_monitor
 from app.models.user import User
 from app.schema.user_schema import UserPublic
 from app.services.address_service import AddressService
@@ -19,6 +21,7 @@ from app.services.order_service import OrderService
 from app.services.payment_service import PaymentService
 from app.services.product_service import ProductService
 from app.services.review_service import ReviewService
+from app.services.search_service import SearchService
 from app.services.user_service import UserService
 from app.utils.security import TokenError, decode_access_token
 
@@ -29,15 +32,30 @@ oauth_scheme = HTTPBearer(
 )
 
 
-def get_db() -> Generator[Session, None, None]:
+async def get_db() -> AsyncGenerator[AsyncSession, None]:
     """
-    Local db Session
+    Local async db Session
     """
-    db = SessionLocal()
-    try:
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+async def get_read_db(
+    db: Annotated[AsyncSession, Depends(get_db)],
+) -> AsyncGenerator[AsyncSession, None]:
+    """
+    Session for read-only service calls.
+
+    Yields a replica session when a replica is configured and within the lag
+    budget, otherwise the request's primary session from get_db. Never use it
+    for writes or for reads that must see the request's own writes.
+    """
+    if ReplicaSessionLocal is None or not await replica_monitor.is_available():
         yield db
-    finally:
-        db.close()
+        return
+
+    async with ReplicaSessionLocal() as read_db:
+        yield read_db
 
 
 async def get_redis_manager() -> RedisClient:
@@ -48,7 +66,15 @@ async def get_elastic_manager() -> AsyncElasticsearch:
     return await get_es_client()
 
 
-def get_user_service_dep(db: Session = Depends(get_db)) -> UserService:
+async def get_search_client() -> Optional[AsyncElasticsearch]:
+    """
+    The connected Elasticsearch client, or None; unlike get_elastic_manager
+    it never waits for a connection, so search reads can fall back at once.
+    """
+    return elastic_config.es
+
+
+def get_user_service_dep(db: AsyncSession = Depends(get_db)) -> UserService:
     """
     User service dependency
     """
@@ -61,37 +87,63 @@ def get_elastic_service_dep(
     return ElasticService(es=es)
 
 
-def get_address_service_dep(db: Session = Depends(get_db)) -> AddressService:
+def get_search_service_dep(
+    db: Annotated[AsyncSession, Depends(get_db)],
+    read_db: Annotated[AsyncSession, Depends(get_read_db)],
+    redis_client: Annotated[RedisClient, Depends(get_redis_manager)],
+    es: Annotated[Optional[AsyncElasticsearch], Depends(get_search_client)],
+) -> SearchService:
+    return SearchService(db=db, redis=redis_client, es=es, read_db=read_db)
+
+
+def get_address_service_dep(
+    db: AsyncSession = Depends(get_db),
+) -> AddressService:
     """
     Address service dependency
     """
     return AddressService(db=db)
 
 
-def get_category_service_dep(db: Session = Depends(get_db)) -> CategoryService:
+def get_category_service_dep(
+    db: AsyncSession = Depends(get_db),
+) -> CategoryService:
     return CategoryService(db=db)
 
 
 def get_product_service_dep(
-    db: Annotated[Session, Depends(get_db)],
+    db: Annotated[AsyncSession, Depends(get_db)],
+    read_db: Annotated[AsyncSession, Depends(get_read_db)],
     redis_client: Annotated[RedisClient, Depends(get_redis_manager)],
+    search_service: Annotated[SearchService, Depends(get_search_service_dep)],
 ) -> ProductService:
-    return ProductService(db=db, redis=redis_client)
+    return ProductService(
+        db=db, redis=redis_client, read_db=read_db, search=search_service
+    )
 
 
-def get_cart_service_dep(db: Annotated[Session, Depends(get_db)]) -> CartService:
+def get_cart_service_dep(
+    db: Annotated[AsyncSession, Depends(get_db)],
+) -> CartService:
     return CartService(db=db)
 
 
-def get_order_service_dep(db: Annotated[Session, Depends(get_db)]) -> OrderService:
+def get_order_service_dep(
+    db: Annotated[AsyncSession, Depends(get_db)],
+) -> OrderService:
     return OrderService(db=db)
 
 
-def get_review_service_dep(db: Annotated[Session, Depends(get_db)]) -> ReviewService:
-    return ReviewService(db=db)
+def get_review_service_dep(
+    db: Annotated[AsyncSession, Depends(get_db)],
+    read_db: Annotated[AsyncSession, Depends(get_read_db)],
+) -> ReviewService:
+    return ReviewService(db=db, read_db=read_db)
 
 
-def get_payment_service_dep(db: Annotated[Session, Depends(get_db)]) -> PaymentService:
+def get_payment_service_dep(
+    db: Annotated[AsyncSession, Depends(get_db)],
+) -> PaymentService:
     return PaymentService(db=db)
 
 
@@ -122,7 +174,7 @@ async def get_current_user(
                 headers={"WWW-Authenticate": "Bearer"},
             )
 
-        user = user_service.get_user_by_id(id=int(user_id))
+        user = await user_service.get_user_by_id(id=int(user_id))
         return UserPublic.model_validate(user)
 
     except TokenError as e:
@@ -157,7 +209,7 @@ async def get_optional_user(
         if not user_id:
             return None
 
-        user = user_service.get_user_by_id(id=int(user_id))
+        user = await user_service.get_user_by_id(id=int(user_id))
         return UserPublic.model_validate(user)
 
     except Exception:
@@ -0,0 +1,110 @@
+"""
+Latency benchmark of the autocomplete paths, against the configured
+database and cluster:
+
+- sql: ILIKE prefix then contains matching (ProductCrud, the fallback);
+- completion: the completion suggester (ElasticService.suggest);
+- ngram: the search-as-you-type name subfield (ElasticService.autocomplete,
+  the fallback while the trie loads);
+- trie: the in-process prefix trie (app.core.autocomplete_index, what
+  GET /product/autocomplete uses), built from all active products.
+
+Queries are 2-4 character prefixes of the most popular product names, like
+the cache warm-up uses. The result cache is bypassed, so every call reaches
+its backend. Run with `python -m app.cli bench-autocomplete`.
+"""
+
+import statistics
+import time
+from typing import Awaitable, Callable, Dict, List, NamedTuple
+
+from elasticsearch import AsyncElasticsearch
+
+from app.core.autocomplete_index import ProductNames, read_products
+from app.core.logger import logger
+from app.crud.product import ProductCrud
+from app.db.database import AsyncSessionLocal
+from app.jobs.cache_warmup import autocomplete_prefixes
+from app.services.elasticsearch_service import ElasticService
+
+BENCHMARK_TOP_PRODUCTS = 500
+BENCHMARK_PREFIXES = 100
+BENCHMARK_ROUNDS = 5
+SUGGESTIONS = 10
+
+Lookup = Callable[[str], Awaitable[List[str]]]
+
+
+class LatencyStats(NamedTuple):
+    calls: int
+    mean_ms: float
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+
+
+def latency_stats(samples: List[float]) -> LatencyStats:
+    """Summary of call durations given in seconds."""
+    ms = [sample * 1000 for sample in samples]
+    if len(ms) == 1:
+        return LatencyStats(1, ms[0], ms[0], ms[0], ms[0])
+    cuts = statistics.quantiles(ms, n=100, method="inclusive")
+    return LatencyStats(len(ms), statistics.fmean(ms), cuts[49], cuts[94], cuts[98])
+
+
+async def time_lookups(lookup: Lookup, prefixes: List[str], rounds: int) -> List[float]:
+    """Durations of ``rounds`` sequential passes over ``prefixes``."""
+    # One untimed pass, so connection setup is not measured
+    for prefix in prefixes:
+        await lookup(prefix)
+    samples = []
+    for _ in range(rounds):
+        for prefix in prefixes:
+            started = time.perf_counter()
+            await lookup(prefix)
+            samples.append(time.perf_counter() - started)
+    return samples
+
+
+async def benchmark_autocomplete(
+    es: AsyncElasticsearch,
+    top_n: int = BENCHMARK_TOP_PRODUCTS,
+    prefixes: int = BENCHMARK_PREFIXES,
+    rounds: int = BENCHMARK_ROUNDS,
+) -> Dict[str, LatencyStats]:
+    """Time each path over the same prefixes and log a comparison table."""
+    elastic = ElasticService(es)
+    async with AsyncSessionLocal() as db:
+        crud = ProductCrud(db=db)
+        names = [product.name for product in await crud.get_popular_products(top_n)]
+        queries = autocomplete_prefixes(names, prefixes)
+        if not queries:
+            logger.warning("No products to build autocomplete queries from")
+            return {}
+
+        names_index = ProductNames(await read_products())
+
+        async def trie(q: str) -> List[str]:
+            return names_index.trie.complete(q, SUGGESTIONS)
+
+        paths: Dict[str, Lookup] = {
+            "sql": lambda q: crud.get_product_suggestions(q, limit=SUGGESTIONS),
+            "completion": lambda q: elastic.suggest(q, size=SUGGESTIONS),
+            "ngram": lambda q: elastic.autocomplete(q, size=SUGGESTIONS),
+            "trie": trie,
+        }
+        results = {
+            name: latency_stats(await time_lookups(lookup, queries, rounds))
+            for name, lookup in paths.items()
+        }
+
+    logger.info(
+        f"Autocomplete latency over {len(queries)} prefixes x {rounds} rounds (ms)"
+    )
+    logger.info(f"{'path':<12}{'mean':>9}{'p50':>9}{'p95':>9}{'p99':>9}")
+    for name, stats in results.items():
+        logger.info(
+            f"{name:<12}{stats.mean_ms:>9.3f}{stats.p50_ms:>9.3f}"
+            f"{stats.p95_ms:>9.3f}{stats.p99_ms:>9.3f}"
+        )
+    return results
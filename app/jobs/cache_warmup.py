@@ -0,0 +1,185 @@
+"""
+Cache warm-up after a deploy or a Redis failover.
+
+Fills the caches the busiest endpoints read, so the first minutes of traffic
+do not all fall through to the database:
+
+- the top CACHE_WARMUP_TOP_PRODUCTS products by popularity (product:{id});
+- the category list;
+- the first page of the default and popularity-sorted product listings,
+  and of the first CACHE_WARMUP_CATEGORY_LISTINGS category listings;
+- autocomplete for prefixes of the most popular product names, unless the
+  in-process autocomplete trie is enabled.
+
+Each item is loaded through the same service method the API uses, so keys
+and serialization match exactly. Items run concurrently, at most
+CACHE_WARMUP_CONCURRENCY at a time, each on its own session; whatever is
+still running after CACHE_WARMUP_TIMEOUT_SECONDS is cancelled. A Redis lock
+lets one worker warm the shared cache while the others skip it.
+"""
+
+import asyncio
+import time
+from typing import Awaitable, Callable, List, NamedTuple
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core import elastic_config
+from app.core.config import settings
+from app.core.logger import logger
+from app.core.redis import redis_client
+from app.crud.product import ProductCrud
+from app.db.database import AsyncSessionLocal
+from app.services.category_service import CategoryService
+from app.services.product_service import ProductService
+from app.services.search_service import SearchService
+
+LOCK_KEY = "jobs:cache-warmup:lock"
+
+# Product ids per batch lookup (one IN query each)
+PRODUCT_BATCH_SIZE = 100
+
+Task = Callable[[AsyncSession], Awaitable[object]]
+
+
+class WarmupReport(NamedTuple):
+    warmed: int
+    failed: int
+    timed_out: int
+
+
+def _listing(**overrides) -> Task:
+    # Same defaults as GET /product, so the cache keys match
+    params = dict(
+        page=1,
+        per_page=10,
+        search=None,
+        category_id=None,
+        min_price=None,
+        max_price=None,
+        min_rating=None,
+        availability="all",
+        sort_by="id",
+        sort_order="asc",
+        pagination="offset",
+        cursor=None,
+        count_mode=None,
+    )
+    params.update(overrides)
+
+    def task(db: AsyncSession):
+        return ProductService(db, redis_client).get_all_products(**params)
+
+    return task
+
+
+def _products(ids: List[int]) -> Task:
+    def task(db: AsyncSession):
+        return ProductService(db, redis_client).get_products_by_ids(ids)
+
+    return task
+
+
+def _autocomplete(prefix: str) -> Task:
+    def task(db: AsyncSession):
+        # Through search like the API, so the cached ranking matches
+        search = SearchService(db, redis_client, es=elastic_config.es)
+        service = ProductService(db, redis_client, search=search)
+        return service.get_autocomplete_suggestions(prefix)
+
+    return task
+
+
+def autocomplete_prefixes(names: List[str], limit: int) -> List[str]:
+    """Distinct 2-4 character prefixes of ``names``, most popular first."""
+    prefixes = {}
+    for length in (2, 3, 4):
+        for name in names:
+            prefix = name[:length].strip().lower()
+            if len(prefix) == length:
+                prefixes.setdefault(prefix, None)
+    return list(prefixes)[:limit]
+
+
+async def plan_warmup(top_n: int, prefixes: int) -> List[Task]:
+    """The warm-up items; reading the category list here also caches it."""
+    async with AsyncSessionLocal() as db:
+        popular = await ProductCrud(db=db).get_popular_products(top_n)
+        categories = await CategoryService(db).get_all_categories()
+
+    tasks = [_listing(), _listing(sort_by="popularity", sort_order="desc")]
+    tasks.extend(
+        _listing(category_id=category.id)
+        for category in categories[: settings.CACHE_WARMUP_CATEGORY_LISTINGS]
+    )
+    ids = [product.id for product in popular]
+    tasks.extend(
+        _products(ids[start : start + PRODUCT_BATCH_SIZE])
+        for start in range(0, len(ids), PRODUCT_BATCH_SIZE)
+    )
+    # The autocomplete trie answers from memory; only its fallback is cached
+    if not settings.AUTOCOMPLETE_TRIE_ENABLED:
+        names = [product.name for product in popular]
+        tasks.extend(_autocomplete(p) for p in autocomplete_prefixes(names, prefixes))
+    return tasks
+
+
+async def warm_cache(
+    top_n: int = settings.CACHE_WARMUP_TOP_PRODUCTS,
+    prefixes: int = settings.CACHE_WARMUP_AUTOCOMPLETE_PREFIXES,
+    concurrency: int = settings.CACHE_WARMUP_CONCURRENCY,
+    timeout: float = settings.CACHE_WARMUP_TIMEOUT_SECONDS,
+) -> WarmupReport:
+    """Run the warm-up once; see the module docstring."""
+    started = time.monotonic()
+    tasks = await asyncio.wait_for(plan_warmup(top_n, prefixes), timeout)
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def run(task: Task) -> None:
+        async with semaphore:
+            async with AsyncSessionLocal() as db:
+                await task(db)
+
+    pending = [asyncio.create_task(run(task)) for task in tasks]
+    done, not_done = set(), set()
+    if pending:
+        remaining = max(timeout - (time.monotonic() - started), 0)
+        done, not_done = await asyncio.wait(pending, timeout=remaining)
+    for task in not_done:
+        task.cancel()
+    await asyncio.gather(*not_done, return_exceptions=True)
+
+    failed = [t for t in done if t.exception() is not None]
+    for task in failed[:3]:
+        logger.warning(f"Cache warm-up item failed: {task.exception()}")
+    report = WarmupReport(len(done) - len(failed), len(failed), len(not_done))
+    logger.info(
+        f"Cache warm-up: {report.warmed} warmed, {report.failed} failed, "
+        f"{report.timed_out} timed out in {time.monotonic() - started:.1f}s"
+    )
+    return report
+
+
+async def warm_cache_once() -> bool:
+    """
+    Background task started in lifespan: warm the cache unless another
+    worker is already doing it. Returns True when this worker warmed it.
+    """
+    timeout = settings.CACHE_WARMUP_TIMEOUT_SECONDS
+    try:
+        acquired = await redis_client.client.set(
+            LOCK_KEY, "1", nx=True, ex=max(int(timeout), 1)
+        )
+    except Exception as e:
+        logger.warning(f"Skipping cache warm-up, Redis unavailable: {e}")
+        return False
+    if not acquired:
+        return False
+
+    try:
+        await warm_cache(timeout=timeout)
+    except asyncio.CancelledError:
+        raise
+    except Exception as e:
+        logger.warning(f"Cache warm-up failed: {e}")
+    return True
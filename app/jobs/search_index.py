@@ -0,0 +1,117 @@
+"""
+Build the products search index without search downtime.
+
+Searches read the ``products`` alias. A rebuild fills a new versioned index
+while the alias keeps serving the old one, then swaps the alias atomically
+(see app.utils.es_utils). The rebuild is skipped when the aliased index was
+built from the current mapping and holds as many documents as there are
+products, so restarts and deploys without mapping changes cost two cheap
+requests. A Redis lock lets one process rebuild while the others keep
+serving the current index.
+"""
+
+import asyncio
+import uuid
+
+from elasticsearch import AsyncElasticsearch
+from sqlalchemy import func, select
+
+from app.core.config import settings
+from app.core.logger import logger
+from app.core.redis import redis_client
+from app.db.database import AsyncSessionLocal
+from app.models.product import Product
+from app.utils import es_utils
+
+LOCK_KEY = "jobs:search-index:lock"
+
+
+async def product_count() -> int:
+    async with AsyncSessionLocal() as db:
+        return await db.scalar(select(func.count()).select_from(Product))
+
+
+async def index_is_current(es: AsyncElasticsearch) -> bool:
+    """Whether the aliased index has the current mapping and every product."""
+    index = await es_utils.aliased_index(es)
+    if index is None:
+        return False
+    if await es_utils.index_checksum(es, index) != es_utils.mapping_checksum():
+        logger.info(f"Search index {index} was built from an older mapping")
+        return False
+    indexed = (await es.count(index=index))["count"]
+    expected = await product_count()
+    if indexed != expected:
+        logger.info(f"Search index {index} has {indexed} of {expected} products")
+        return False
+    return True
+
+
+async def rebuild_index(es: AsyncElasticsearch) -> str:
+    """Build a new index, point the alias at it and drop old indices."""
+    index = es_utils.new_index_name()
+    await es_utils.create_product_index(es, index)
+    try:
+        report = await es_utils.bulk_index_products(es, index)
+        if report.failed:
+            # Keep serving the complete previous index
+            raise RuntimeError(f"{report.failed} products failed to index")
+        await es_utils.finish_index(es, index)
+        await es_utils.swap_alias(es, index)
+    except BaseException:
+        # Never leave a half-built index behind; the alias still serves the
+        # previous one
+        await es.indices.delete(index=index, ignore_unavailable=True)
+        raise
+    logger.info(f"Rebuilt search index {index} with {report.indexed} products")
+    await es_utils.delete_old_indices(es, keep=settings.ES_INDEX_KEEP_PREVIOUS)
+    return index
+
+
+async def ensure_product_index(es: AsyncElasticsearch, force: bool = False) -> bool:
+    """
+    Rebuild the products index if it is missing or out of date (always with
+    ``force``), unless another process holds the lock. Returns True when
+    this call rebuilt it.
+    """
+    token = uuid.uuid4().hex
+    try:
+        acquired = await redis_client.client.set(
+            LOCK_KEY, token, nx=True, ex=settings.ES_REINDEX_LOCK_TTL_SECONDS
+        )
+    except Exception as e:
+        # The alias swap is atomic, so concurrent builds are wasteful but
+        # safe; better than no index at all
+        logger.warning(f"Search index lock unavailable, building without it: {e}")
+        acquired, token = True, None
+    if not acquired:
+        logger.info("Search index is being built by another process")
+        return False
+
+    try:
+        if not force and await index_is_current(es):
+            logger.info("Search index is up to date")
+            return False
+        await rebuild_index(es)
+        return True
+    finally:
+        if token is not None:
+            await _release(token)
+
+
+async def _release(token: str) -> None:
+    try:
+        if await redis_client.client.get(LOCK_KEY) == token.encode():
+            await redis_client.client.delete(LOCK_KEY)
+    except Exception as e:
+        logger.warning(f"Failed to release search index lock: {e}")
+
+
+async def reindex_on_startup(es: AsyncElasticsearch) -> None:
+    """Background task started in lifespan; never raises."""
+    try:
+        await ensure_product_index(es)
+    except asyncio.CancelledError:
+        raise
+    except Exception as e:
+        logger.warning(f"Search index build failed: {e}")
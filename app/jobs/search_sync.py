@@ -0,0 +1,215 @@
+"""
+Apply search outbox rows (app.core.search_outbox) to Elasticsearch.
+
+Every ES_OUTBOX_POLL_SECONDS the worker claims up to ES_OUTBOX_BATCH_SIZE
+due rows and coalesces them by product: however many changes a product had
+in the window, it gets one bulk action built from its current row, a
+partial update of the changed fields (the whole document if any change
+needs it), or a delete if the row is gone. Actions go to every index live
+changes must reach (es_utils.write_indices).
+
+Applied rows are deleted. Rows of products whose documents were rejected
+are retried with exponential backoff; after ES_OUTBOX_MAX_ATTEMPTS they are
+dead-lettered (``dead_at`` set) and logged, until
+`python -m app.cli requeue-search-outbox` puts them back. A batch that fails
+as a whole (the cluster is unreachable) uses up no attempts: its rows stay
+as they were and the worker backs off until the cluster is back, so an
+outage does not dead-letter the outbox. Rows are claimed with SKIP LOCKED,
+so several workers can drain the outbox together.
+"""
+
+import asyncio
+import datetime
+from collections import defaultdict
+from typing import Dict, List, Optional
+
+from elasticsearch import AsyncElasticsearch, helpers
+from prometheus_client import Counter
+from sqlalchemy import delete, or_, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.elastic_config import get_es_client
+from app.core.logger import logger
+from app.db.database import AsyncSessionLocal
+from app.models.product import Product
+from app.models.search_outbox import SearchOutbox
+from app.utils import es_utils
+
+SEARCH_OUTBOX_ROWS = Counter(
+    "search_outbox_rows_total",
+    "Search outbox rows by outcome (applied, coalesced, retried, dead_lettered)",
+    ["result"],
+)
+
+MAX_BACKOFF_SECONDS = 300
+
+
+def _utcnow() -> datetime.datetime:
+    return datetime.datetime.now(datetime.timezone.utc).replace(tzinfo=None)
+
+
+def _changed_fields(rows: List[SearchOutbox]) -> Optional[List[str]]:
+    """Union of the rows' changed fields; None if any needs the whole doc."""
+    fields = set()
+    for row in rows:
+        if row.fields is None:
+            return None
+        fields.update(row.fields)
+    return sorted(fields)
+
+
+def _action(index: str, product_id: int, fields, current) -> dict:
+    if current is None:
+        return {"_op_type": "delete", "_index": index, "_id": product_id}
+    source = es_utils.product_source(current)
+    doc = source if fields is None else {f: source[f] for f in fields}
+    # The upsert covers documents missing from the index (e.g. a new build)
+    return {
+        "_op_type": "update",
+        "_index": index,
+        "_id": product_id,
+        "doc": doc,
+        "upsert": source,
+    }
+
+
+async def apply_changes(
+    es: AsyncElasticsearch, db: AsyncSession, rows: List[SearchOutbox]
+) -> Dict[int, str]:
+    """Index the coalesced ``rows``; returns errors by product id."""
+    by_product: Dict[int, List[SearchOutbox]] = defaultdict(list)
+    for row in rows:
+        by_product[row.product_id].append(row)
+    SEARCH_OUTBOX_ROWS.labels(result="coalesced").inc(len(rows) - len(by_product))
+
+    current = {
+        row.id: row
+        for row in await db.execute(
+            es_utils.product_rows().where(Product.id.in_(by_product))
+        )
+    }
+    indices = await es_utils.write_indices(es)
+    actions = [
+        _action(
+            index, product_id, _changed_fields(product_rows), current.get(product_id)
+        )
+        for index in indices
+        for product_id, product_rows in by_product.items()
+    ]
+
+    errors: Dict[int, str] = {}
+    async for ok, item in helpers.async_streaming_bulk(
+        es,
+        actions,
+        chunk_size=settings.ES_BULK_CHUNK_SIZE,
+        raise_on_error=False,
+        max_retries=3,
+        initial_backoff=1,
+    ):
+        op_type, info = item.popitem()
+        # Deleting a document that was never indexed is fine
+        if not ok and not (op_type == "delete" and info.get("status") == 404):
+            errors[int(info["_id"])] = str(info.get("error", info))
+    return errors
+
+
+async def drain_once(
+    es: AsyncElasticsearch, batch_size: int = settings.ES_OUTBOX_BATCH_SIZE
+) -> int:
+    """
+    Apply one batch of due outbox rows; returns how many were claimed.
+    Raises if the batch fails as a whole, leaving the rows untouched.
+    """
+    async with AsyncSessionLocal() as db:
+        now = _utcnow()
+        rows = (
+            await db.scalars(
+                select(SearchOutbox)
+                .where(
+                    SearchOutbox.dead_at.is_(None),
+                    or_(
+                        SearchOutbox.available_at.is_(None),
+                        SearchOutbox.available_at <= now,
+                    ),
+                )
+                .order_by(SearchOutbox.id)
+                .limit(batch_size)
+                .with_for_update(skip_locked=True)
+            )
+        ).all()
+        if not rows:
+            return 0
+
+        try:
+            errors = await apply_changes(es, db, rows)
+        except Exception:
+            # Not the documents' fault: release the rows without using up
+            # their attempts
+            await db.rollback()
+            raise
+
+        applied = [row.id for row in rows if row.product_id not in errors]
+        if applied:
+            await db.execute(delete(SearchOutbox).where(SearchOutbox.id.in_(applied)))
+            SEARCH_OUTBOX_ROWS.labels(result="applied").inc(len(applied))
+        for row in rows:
+            if row.product_id in errors:
+                _fail(row, errors[row.product_id], now)
+        await db.commit()
+        return len(rows)
+
+
+def _fail(row: SearchOutbox, error: str, now: datetime.datetime) -> None:
+    row.attempts += 1
+    row.last_error = error[:2000]
+    if row.attempts >= settings.ES_OUTBOX_MAX_ATTEMPTS:
+        row.dead_at = now
+        SEARCH_OUTBOX_ROWS.labels(result="dead_lettered").inc()
+        logger.error(
+            f"Search sync of product {row.product_id} dead-lettered after "
+            f"{row.attempts} attempts: {error}"
+        )
+        return
+    backoff = min(2**row.attempts, MAX_BACKOFF_SECONDS)
+    row.available_at = now + datetime.timedelta(seconds=backoff)
+    SEARCH_OUTBOX_ROWS.labels(result="retried").inc()
+    logger.warning(
+        f"Search sync of product {row.product_id} failed, retrying in "
+        f"{backoff}s: {error}"
+    )
+
+
+async def requeue_dead_letters() -> int:
+    """Give dead-lettered rows a fresh set of attempts."""
+    async with AsyncSessionLocal() as db:
+        result = await db.execute(
+            update(SearchOutbox)
+            .where(SearchOutbox.dead_at.is_not(None))
+            .values(dead_at=None, attempts=0, available_at=None)
+        )
+        await db.commit()
+        return result.rowcount
+
+
+async def search_sync_loop(
+    interval: float = settings.ES_OUTBOX_POLL_SECONDS,
+    batch_size: int = settings.ES_OUTBOX_BATCH_SIZE,
+) -> None:
+    """Background task started in lifespan; runs until cancelled."""
+    delay = interval
+    while True:
+        try:
+            es = await get_es_client()
+            # A full batch means there is a backlog: keep going without
+            # waiting for the next window
+            while await drain_once(es, batch_size) >= batch_size:
+                pass
+            delay = interval
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            # Usually the cluster is unreachable: back off until it is back
+            delay = min(delay * 2, MAX_BACKOFF_SECONDS)
+            logger.warning(f"Search sync failed, retrying in {delay:.0f}s: {e}")
+        await asyncio.sleep(delay)
@@ -1,4 +1,5 @@
-from contextlib import asynccontextmanager
+import asyncio
+from contextlib import asynccontextmanager, suppress
 from typing import AsyncGenerator
 
 from fastapi import FastAPI, Request, status
@@ -9,8 +10,14 @@ from sqlalchemy.exc import SQLAlchemyError
 
 from app.api.v1.init_routes import init_routes
 from app.api.v1.routes import cart, category, healthcheck, product, user
+from app.core.autocomplete_index import autocomplete_index
+from app.core.config import settings
 from app.core.elastic_config import close_es_client, get_es_client
 from app.core.logger import logger
+from app.db.database import async_engine, warm_up_pool
+from app.jobs.cache_warmup import warm_cache_once
+from app.jobs.search_index import reindex_on_startup
+from app.jobs.search_sync import search_sync_loop
 
 from prometheus_fastapi_instrumentator import Instrumentator
 from opentelemetry import trace
@@ -22,8 +29,8 @@ from opentelemetry.instrumentation.fastapi import FastAPIInstrumentor
 
 # from app.core.otel_config import setup_otel
 from app.core.redis import redis_client
+from app.middleware.query_stats import QueryStatsMiddleware
 from app.middleware.request_logger import LoggingMiddleware
-from app.utils.es_utils import bulk_index_products, create_product_index
 from app.utils.seed import seed_product
 
 
@@ -31,18 +38,51 @@ from app.utils.seed import seed_product
 async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     # setup_otel()
     await redis_client.connect()
+    try:
+        await warm_up_pool()
+    except Exception as e:
+        logger.warning(f"Database pool warm-up failed: {e}")
+    reindex_task = None
     try:
         client = await get_es_client()
         logger.info("Elasticsearch client initialized successfully")
+        # Runs in the background: the alias keeps serving the current index
+        if settings.ES_REINDEX_ON_STARTUP:
+            reindex_task = asyncio.create_task(reindex_on_startup(client))
     except Exception as e:
         logger.warning(
             f"Failed to initialize Elasticsearch client: {e}. App will continue without ES."
         )
-    await create_product_index(client)
-    await bulk_index_products(client)
+    # Runs in the background: readiness does not wait for a warm cache
+    warmup_task = (
+        asyncio.create_task(warm_cache_once())
+        if settings.CACHE_WARMUP_ON_STARTUP
+        else None
+    )
+    search_sync_task = (
+        asyncio.create_task(search_sync_loop())
+        if settings.ES_OUTBOX_WORKER_ENABLED
+        else None
+    )
+    autocomplete_task = (
+        asyncio.create_task(autocomplete_index.run())
+        if settings.AUTOCOMPLETE_TRIE_ENABLED
+        else None
+    )
     yield
+    for task in (
+        warmup_task,
+        reindex_task,
+        search_sync_task,
+        autocomplete_task,
+    ):
+        if task is not None:
+            task.cancel()
+            with suppress(asyncio.CancelledError):
+                await task
     await redis_client.close()
     await close_es_client()
+    await async_engine.dispose()
 
 
 class RootResponse(BaseModel):
@@ -96,7 +136,9 @@ app = FastAPI(
 )
 
 app.add_middleware(LoggingMiddleware)
+app.add_middleware(QueryStatsMiddleware)
 
+# Also serves the db_pool_* metrics from app.db.pool_metrics (default registry)
 Instrumentator().instrument(app).expose(app)
 
 # Configure OpenTelemetry
@@ -0,0 +1,86 @@
+from prometheus_client import Counter, Histogram
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.config import settings
+from app.core.exceptions import NPlusOneError
+from app.core.logger import logger
+from app.db.query_stats import QueryStats, track_queries
+
+EXCLUDED_PATHS = {"/api/v1/openapi.json", "/docs", "/redoc", "/metrics"}
+
+DB_QUERIES_PER_REQUEST = Histogram(
+    "db_queries_per_request",
+    "SQL statements executed per request",
+    ["method", "route"],
+    buckets=(0, 1, 2, 3, 5, 8, 13, 21, 34, 55, 89, 144),
+)
+DB_TIME_PER_REQUEST = Histogram(
+    "db_time_per_request_seconds",
+    "Time spent executing SQL per request",
+    ["method", "route"],
+)
+DB_N_PLUS_ONE = Counter(
+    "db_n_plus_one_total",
+    "Requests that repeated a statement shape at least SQL_N_PLUS_ONE_THRESHOLD times",
+    ["method", "route"],
+)
+
+
+def _route_template(scope: Scope) -> str:
+    route = scope.get("route")
+    return getattr(route, "path", None) or "unmatched"
+
+
+class QueryStatsMiddleware:
+    """
+    ASGI middleware that counts SQL statements and DB time per request.
+
+    Results go to a ``Server-Timing`` header, Prometheus and, for suspected
+    N+1 patterns, a warning log. With SQL_N_PLUS_ONE_STRICT enabled (tests)
+    a suspected N+1 raises NPlusOneError instead of only being logged.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope.get("path", "") in EXCLUDED_PATHS:
+            await self.app(scope, receive, send)
+            return
+
+        with track_queries() as stats:
+
+            async def send_wrapper(message: Message) -> None:
+                if message["type"] == "http.response.start":
+                    headers = MutableHeaders(scope=message)
+                    headers.append("Server-Timing", stats.server_timing())
+                await send(message)
+
+            await self.app(scope, receive, send_wrapper)
+
+        self._report(scope, stats)
+
+    def _report(self, scope: Scope, stats: QueryStats) -> None:
+        method = scope.get("method", "")
+        route = _route_template(scope)
+
+        DB_QUERIES_PER_REQUEST.labels(method=method, route=route).observe(stats.count)
+        DB_TIME_PER_REQUEST.labels(method=method, route=route).observe(stats.total_time)
+
+        repeated = stats.repeated(settings.SQL_N_PLUS_ONE_THRESHOLD)
+        if not repeated:
+            return
+
+        DB_N_PLUS_ONE.labels(method=method, route=route).inc()
+        for shape, count in repeated:
+            logger.warning(
+                f"Possible N+1 on {method} {route}: {count}x {shape[:300]} "
+                f"({stats.count} queries, {stats.total_time * 1000:.1f}ms total)"
+            )
+
+        if settings.SQL_N_PLUS_ONE_STRICT:
+            shape, count = repeated[0]
+            raise NPlusOneError(
+                f"{method} {route} ran the same statement {count} times: {shape}"
+            )
@@ -1,12 +1,13 @@
 from sqlalchemy.orm import relationship, Mapped, mapped_column
 from app.db.database import Base
 from sqlalchemy import (
+    Float,
+    Index,
     String,
     Numeric,
     ForeignKey,
     Text,
     func,
-    select,
 )
 from sqlalchemy.ext.hybrid import hybrid_property
 from typing import List, Optional
@@ -17,6 +18,10 @@ class Product(Base):
     """Product entity representing items in the catalog."""
 
     __tablename__ = "products"
+    # Category pages sort by popularity within one category
+    __table_args__ = (
+        Index("ix_products_category_popularity", "category_id", "popularity"),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
     name: Mapped[str] = mapped_column(String(255), nullable=False)
@@ -28,6 +33,19 @@ class Product(Base):
     image_url: Mapped[Optional[str]] = mapped_column(String(500))
     category_id: Mapped[Optional[int]] = mapped_column(ForeignKey("categories.id"))
     is_active: Mapped[bool] = mapped_column(default=True)
+    # Rating aggregates, kept in sync by ReviewCrud on every review change
+    rating_sum: Mapped[int] = mapped_column(default=0, server_default="0")
+    rating_count: Mapped[int] = mapped_column(default=0, server_default="0")
+    average_rating: Mapped[Optional[float]] = mapped_column(
+        Numeric(3, 2, asdecimal=False), index=True
+    )
+    # Units sold, and the same with exponential time decay for sort_by=popularity,
+    # stored forward-decayed (app.utils.popularity). Both incremented by
+    # OrderCrud.create_order.
+    sales_count: Mapped[int] = mapped_column(default=0, server_default="0")
+    popularity: Mapped[float] = mapped_column(
+        Float, default=0.0, server_default="0", index=True
+    )
     created_at: Mapped[datetime.datetime] = mapped_column(
         default=func.current_timestamp()
     )
@@ -50,42 +68,15 @@ class Product(Base):
         "Wishlist", back_populates="product", cascade="all, delete-orphan"
     )
 
-    @hybrid_property
-    def average_rating(self) -> Optional[float]:
-        """Calculate average rating from reviews (instance level)."""
-        if not self.reviews:
-            return None
-        total = sum(review.rating for review in self.reviews)
-        return round(total / len(self.reviews), 2)
-
-    @average_rating.expression
-    def average_rating(cls):
-        """Calculate average rating for SQL queries (class level)."""
-        from app.models.review import Review
-
-        return (
-            select(func.avg(Review.rating))
-            .where(Review.product_id == cls.id)
-            .correlate_except(Review)
-            .scalar_subquery()
-        )
-
     @hybrid_property
     def review_count(self) -> int:
         """Get total number of reviews (instance level)."""
-        return len(self.reviews) if self.reviews else 0
+        return self.rating_count or 0
 
     @review_count.expression
     def review_count(cls):
         """Get review count for SQL queries (class level)."""
-        from app.models.review import Review
-
-        return (
-            select(func.count(Review.id))
-            .where(Review.product_id == cls.id)
-            .correlate_except(Review)
-            .scalar_subquery()
-        )
+        return cls.rating_count
 
     @hybrid_property
     def in_stock(self) -> bool:
@@ -0,0 +1,37 @@
+from sqlalchemy import Integer, String, Text, DateTime, JSON, Index, func
+from sqlalchemy.orm import Mapped, mapped_column
+from typing import List, Optional
+from datetime import datetime
+from app.db.database import Base
+
+
+class SearchOutbox(Base):
+    """
+    Pending change to a product's search document, written in the same
+    transaction as the change itself and applied by app.jobs.search_sync.
+
+    ``fields`` lists the changed document fields (None: the whole document).
+    Rows that keep failing are dead-lettered: ``dead_at`` is set and they
+    stay here for inspection until requeued.
+    """
+
+    __tablename__ = "search_outbox"
+
+    id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+    # No foreign key: deletions must outlive the product row
+    product_id: Mapped[int] = mapped_column(Integer, nullable=False, index=True)
+    operation: Mapped[str] = mapped_column(String(10), nullable=False)
+    fields: Mapped[Optional[List[str]]] = mapped_column(JSON)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime, default=func.current_timestamp(), nullable=False
+    )
+    # Set (UTC) when a failed row is retried later; NULL means due now
+    available_at: Mapped[Optional[datetime]] = mapped_column(DateTime)
+    attempts: Mapped[int] = mapped_column(default=0, server_default="0")
+    last_error: Mapped[Optional[str]] = mapped_column(Text)
+    dead_at: Mapped[Optional[datetime]] = mapped_column(DateTime)
+
+    __table_args__ = (
+        # The worker's claim query: live rows that are due, oldest first
+        Index("ix_search_outbox_pending", "dead_at", "available_at", "id"),
+    )
@@ -2,6 +2,8 @@ from pydantic import BaseModel, Field
 from typing import Optional, List
 from datetime import datetime
 
+from app.schema.common_schema import CountMode
+
 
 # Analytics Schemas
 class SalesAnalytics(BaseModel):
@@ -78,9 +80,18 @@ class UserManagementResponse(BaseModel):
     """Paginated user list response"""
 
     users: List[UserListItem]
-    total: int
-    page: int
+    total: Optional[int] = Field(None, description="Null when not counted")
+    page: Optional[int] = Field(None, description="Null in cursor mode")
     page_size: int
+    count_mode: Optional[CountMode] = Field(
+        None, description="Strategy that produced total"
+    )
+    has_more: Optional[bool] = Field(
+        None, description="Whether another page follows this one"
+    )
+    next_cursor: Optional[str] = Field(
+        None, description="Cursor for the next page (cursor mode only)"
+    )
 
 
 class UpdateUserRoleRequest(BaseModel):
@@ -111,9 +122,18 @@ class OrderManagementResponse(BaseModel):
     """Paginated order list response"""
 
     orders: List[OrderListItem]
-    total: int
-    page: int
+    total: Optional[int] = Field(None, description="Null when not counted")
+    page: Optional[int] = Field(None, description="Null in cursor mode")
     page_size: int
+    count_mode: Optional[CountMode] = Field(
+        None, description="Strategy that produced total"
+    )
+    has_more: Optional[bool] = Field(
+        None, description="Whether another page follows this one"
+    )
+    next_cursor: Optional[str] = Field(
+        None, description="Cursor for the next page (cursor mode only)"
+    )
 
 
 class UpdateOrderStatusRequest(BaseModel):
@@ -155,9 +175,18 @@ class ReviewModerationResponse(BaseModel):
     """Paginated review list response"""
 
     reviews: List[ReviewModerationItem]
-    total: int
-    page: int
+    total: Optional[int] = Field(None, description="Null when not counted")
+    page: Optional[int] = Field(None, description="Null in cursor mode")
     page_size: int
+    count_mode: Optional[CountMode] = Field(
+        None, description="Strategy that produced total"
+    )
+    has_more: Optional[bool] = Field(
+        None, description="Whether another page follows this one"
+    )
+    next_cursor: Optional[str] = Field(
+        None, description="Cursor for the next page (cursor mode only)"
+    )
 
 
 # Inventory Management Schemas
@@ -1,16 +1,48 @@
+from enum import Enum
 from typing import Generic, List, Optional, TypeVar
 from pydantic import BaseModel, Field
 
 T = TypeVar("T")
 
 
+class PaginationMode(str, Enum):
+    """How a listing is paged."""
+
+    OFFSET = "offset"
+    CURSOR = "cursor"
+
+
+class CountMode(str, Enum):
+    """How a listing's total is obtained."""
+
+    EXACT = "exact"
+    CACHED = "cached"  # exact count memoized in Redis for a short TTL
+    ESTIMATED = "estimated"  # planner estimate, unfiltered listings only
+    HAS_MORE = "has_more"  # no total; only whether another page exists
+
+
 class PaginationMeta(BaseModel):
-    current_page: int = Field(..., description="Current page number (1-based)")
+    current_page: Optional[int] = Field(
+        None, description="Current page number (1-based); null in cursor mode"
+    )
     per_page: int = Field(..., description="Number of items per page")
-    total_pages: int = Field(..., description="Total number of pages")
-    total_items: int = Field(..., description="Total number of items across all pages")
+    total_pages: Optional[int] = Field(
+        None, description="Total number of pages; null without a total"
+    )
+    total_items: Optional[int] = Field(
+        None, description="Total number of items across all pages; null without a total"
+    )
+    count_mode: Optional[CountMode] = Field(
+        None, description="Strategy that produced total_items"
+    )
+    has_more: Optional[bool] = Field(
+        None, description="Whether another page follows the current one"
+    )
     from_item: Optional[int] = Field(None, description="Starting item index (1-based)")
     to_item: Optional[int] = Field(None, description="Ending item index (1-based)")
+    next_cursor: Optional[str] = Field(
+        None, description="Opaque cursor for the next page (cursor mode only)"
+    )
 
 
 class PaginationLinks(BaseModel):
@@ -20,6 +20,7 @@ class SortByField(str, Enum):
     RATING = "rating"
     POPULARITY = "popularity"
     CREATED_AT = "created_at"
+    RELEVANCE = "relevance"
 
 
 class SortOrder(str, Enum):
@@ -113,3 +114,90 @@ class ProductAutocompleteResponse(BaseModel):
             ]
         }
     }
+
+
+class SearchSort(str, Enum):
+    """Orderings offered by the Elasticsearch product search."""
+
+    RELEVANCE = "relevance"
+    PRICE_ASC = "price_asc"
+    PRICE_DESC = "price_desc"
+    NAME = "name"
+
+
+class ProductSearchQuery(BaseModel):
+    """Typed parameters of GET /elastic/search; compiled to a query template."""
+
+    text: Optional[str] = Field(
+        default=None, min_length=1, max_length=100, description="Full-text query"
+    )
+    category: Optional[str] = Field(
+        default=None, max_length=100, description="Exact category name"
+    )
+    min_price: Optional[float] = Field(default=None, ge=0)
+    max_price: Optional[float] = Field(default=None, ge=0)
+    in_stock: Optional[bool] = Field(
+        default=None, description="Only products in (or out of) stock"
+    )
+    sort: SearchSort = SearchSort.RELEVANCE
+    size: int = Field(default=20, ge=1, le=50)
+    cursor: Optional[str] = Field(
+        default=None, max_length=4096, description="next_cursor of the previous page"
+    )
+    snapshot: bool = Field(
+        default=False,
+        description=(
+            "Page through a point-in-time snapshot, so results never shift "
+            "between pages; set on the first page"
+        ),
+    )
+    highlight: bool = Field(
+        default=False, description="Return highlighted name/description fragments"
+    )
+    facets: bool = Field(
+        default=False, description="Return facet counts for the whole result set"
+    )
+
+
+class ProductSearchDocument(BaseModel):
+    id: int
+    name: str
+    description: Optional[str] = None
+    category: Optional[str] = None
+    price: float
+    in_stock: bool
+
+
+class ProductSearchHit(BaseModel):
+    id: int
+    score: Optional[float] = None
+    data: ProductSearchDocument
+    highlight: dict[str, list[str]] = Field(default_factory=dict)
+
+
+class FacetBucket(BaseModel):
+    key: str
+    count: int
+
+
+class PriceRangeBucket(FacetBucket):
+    min: Optional[float] = Field(default=None, description="Inclusive lower bound")
+    max: Optional[float] = Field(default=None, description="Exclusive upper bound")
+
+
+class ProductFacets(BaseModel):
+    """Counts over every product matching a search, not just one page."""
+
+    categories: list[FacetBucket]
+    price_ranges: list[PriceRangeBucket]
+    in_stock: int = Field(description="Matching products in stock")
+
+
+class ProductSearchResponse(BaseModel):
+    total: int = Field(description="Matching products (capped at 10,000)")
+    took_ms: int
+    results: list[ProductSearchHit]
+    next_cursor: Optional[str] = Field(
+        default=None, description="Cursor for the next page; null on the last page"
+    )
+    facets: Optional[ProductFacets] = None
@@ -1,9 +1,10 @@
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, func, and_, or_
 from datetime import datetime, timedelta
 from typing import Optional, List
 from fastapi import HTTPException, status
 
+from app.core.cached import cached
 from app.models.user import User
 from app.models.order import Order
 from app.models.product import Product
@@ -33,26 +34,33 @@ from app.schema.admin_schema import (
 class AdminService:
     """Service layer for admin dashboard and management operations"""
 
-    def __init__(self, db: Session):
+    def __init__(self, db: AsyncSession, read_db: Optional[AsyncSession] = None):
+        """
+        Analytics and listings run on ``read_db`` (a replica when available);
+        moderation and inventory writes stay on ``db``.
+        """
         self.db = db
-        self.order_crud = OrderCrud(db=db)
-        self.user_crud = UserCrud(db=db)
-        self.product_crud = ProductCrud(db=db)
-        self.review_crud = ReviewCrud(db=db)
-
-    # Analytics Methods
-    def get_sales_analytics(self) -> SalesAnalytics:
+        self.order_crud = OrderCrud(db=db, read_db=read_db)
+        self.user_crud = UserCrud(db=db, read_db=read_db)
+        self.product_crud = ProductCrud(db=db, read_db=read_db)
+        self.review_crud = ReviewCrud(db=db, read_db=read_db)
+
+    # Analytics Methods: cached for ADMIN_ANALYTICS_CACHE_TTL_SECONDS, so the
+    # dashboard can lag writes by that long
+    @cached("admin-analytics-sales", ttl="ADMIN_ANALYTICS_CACHE_TTL_SECONDS")
+    async def get_sales_analytics(self) -> SalesAnalytics:
         """Calculate sales analytics including revenue and order statistics"""
         # Total orders and revenue
-        total_orders = self.order_crud.get_total_orders()
-        total_revenue = self.order_crud.get_total_revenue()
+        total_orders = await self.order_crud.get_total_orders()
+        total_revenue = await self.order_crud.get_total_revenue()
 
-        # Orders by status
-        pending_orders = self.order_crud.get_pending_orders()
-        paid_orders = self.order_crud.get_paid_orders()
-        shipped_orders = self.order_crud.get_shipped_orders_count()
-        delivered_orders = self.order_crud.get_delivered_orders_count()
-        cancelled_orders = self.order_crud.get_cancelled_orders_count()
+        # Orders by status, in one GROUP BY instead of a count per status
+        status_counts = await self.order_crud.get_order_counts_by_status()
+        pending_orders = status_counts.get("pending", 0)
+        paid_orders = status_counts.get("paid", 0)
+        shipped_orders = status_counts.get("shipped", 0)
+        delivered_orders = status_counts.get("delivered", 0)
+        cancelled_orders = status_counts.get("cancelled", 0)
 
         # Average order value
         average_order_value = (
@@ -60,7 +68,7 @@ class AdminService:
         )
 
         # Revenue last 30 days
-        revenue_last_30_days = self.order_crud.revenue_last_thirty_days()
+        revenue_last_30_days = await self.order_crud.revenue_last_thirty_days()
 
         return SalesAnalytics(
             total_revenue=float(total_revenue),
@@ -74,13 +82,14 @@ class AdminService:
             revenue_last_30_days=float(revenue_last_30_days),
         )
 
-    def get_user_analytics(self) -> UserAnalytics:
+    @cached("admin-analytics-users", ttl="ADMIN_ANALYTICS_CACHE_TTL_SECONDS")
+    async def get_user_analytics(self) -> UserAnalytics:
         """Calculate user analytics including total users and growth"""
-        total_users = self.user_crud.get_total_users()
-        total_customers = self.user_crud.get_total_customers()
-        total_admins = self.user_crud.get_total_admins()
+        total_users = await self.user_crud.get_total_users()
+        total_customers = await self.user_crud.get_total_customers()
+        total_admins = await self.user_crud.get_total_admins()
         # New users in last 30 days
-        new_users_last_30_days = self.user_crud.get_new_user_in_last_thirty_days()
+        new_users_last_30_days = await self.user_crud.get_new_user_in_last_thirty_days()
 
         return UserAnalytics(
             total_users=total_users,
@@ -89,13 +98,14 @@ class AdminService:
             new_users_last_30_days=new_users_last_30_days,
         )
 
-    def get_product_analytics(self) -> ProductAnalytics:
+    @cached("admin-analytics-products", ttl="ADMIN_ANALYTICS_CACHE_TTL_SECONDS")
+    async def get_product_analytics(self) -> ProductAnalytics:
         """Calculate product analytics including inventory status"""
-        total_products = self.product_crud.get_total_products()
-        active_products = self.product_crud.total_active_products()
-        inactive_products = self.product_crud.total_inactive_products()
-        out_of_stock_count = self.product_crud.out_of_stock_count()
-        low_stock_count = self.product_crud.low_stock_count()
+        total_products = await self.product_crud.get_total_products()
+        active_products = await self.product_crud.total_active_products()
+        inactive_products = await self.product_crud.total_inactive_products()
+        out_of_stock_count = await self.product_crud.out_of_stock_count()
+        low_stock_count = await self.product_crud.low_stock_count()
 
         return ProductAnalytics(
             total_products=total_products,
@@ -105,12 +115,13 @@ class AdminService:
             low_stock_count=low_stock_count,
         )
 
-    def get_review_analytics(self) -> ReviewAnalytics:
+    @cached("admin-analytics-reviews", ttl="ADMIN_ANALYTICS_CACHE_TTL_SECONDS")
+    async def get_review_analytics(self) -> ReviewAnalytics:
         """Calculate review analytics including approval status"""
-        total_reviews = self.review_crud.total_reviews()
-        pending_reviews = self.review_crud.pending_reviews()
-        approved_reviews = self.review_crud.approved_reviews()
-        average_rating = self.review_crud.average_rating()
+        total_reviews = await self.review_crud.total_reviews()
+        pending_reviews = await self.review_crud.pending_reviews()
+        approved_reviews = await self.review_crud.approved_reviews()
+        average_rating = await self.review_crud.average_rating()
 
         return ReviewAnalytics(
             total_reviews=total_reviews,
@@ -119,22 +130,25 @@ class AdminService:
             average_rating=round(float(average_rating), 2) if average_rating else None,
         )
 
-    def get_dashboard_overview(self) -> DashboardOverview:
+    async def get_dashboard_overview(self) -> DashboardOverview:
         """Get complete dashboard overview with all analytics"""
         return DashboardOverview(
-            sales=self.get_sales_analytics(),
-            users=self.get_user_analytics(),
-            products=self.get_product_analytics(),
-            reviews=self.get_review_analytics(),
+            sales=await self.get_sales_analytics(),
+            users=await self.get_user_analytics(),
+            products=await self.get_product_analytics(),
+            reviews=await self.get_review_analytics(),
         )
 
     # User Management Methods
-    def get_all_users(
+    async def get_all_users(
         self,
         page: int = 1,
         page_size: int = 20,
         search: Optional[str] = None,
         role: Optional[str] = None,
+        pagination: str = "offset",
+        cursor: Optional[str] = None,
+        count_mode: Optional[str] = None,
     ) -> UserManagementResponse:
         """Get paginated list of all users with optional filters"""
         # query = self.db.query(User)
@@ -157,14 +171,19 @@ class AdminService:
         # # Apply pagination
         # offset = (page - 1) * page_size
         # users = query.offset(offset).limit(page_size).all()
-        total, users = self.user_crud.get_all_users(page, page_size, search, role)
+        count, users, next_cursor = await self.user_crud.get_all_users(
+            page, page_size, search, role, pagination, cursor, count_mode
+        )
+
+        # Order stats for the whole page in one query, not two per user
+        order_totals = await self.order_crud.get_order_totals_by_users(
+            [user.id for user in users]
+        )
 
         # Build user list with additional stats
         user_items = []
         for user in users:
-            # Calculate total orders and spent
-            total_orders = self.order_crud.total_order_by_user(user.id)
-            total_spent = self.order_crud.total_spent_by_user(user.id)
+            total_orders, total_spent = order_totals.get(user.id, (0, 0.0))
 
             user_items.append(
                 UserListItem(
@@ -180,10 +199,16 @@ class AdminService:
             )
 
         return UserManagementResponse(
-            users=user_items, total=total, page=page, page_size=page_size
+            users=user_items,
+            total=count.total,
+            page=None if pagination == "cursor" or cursor else page,
+            page_size=page_size,
+            count_mode=count.mode,
+            has_more=count.has_more,
+            next_cursor=next_cursor,
         )
 
-    def update_user_role(self, user_id: int, new_role: str) -> User:
+    async def update_user_role(self, user_id: int, new_role: str) -> User:
         """Update a user's role"""
         if new_role not in ["customer", "admin"]:
             raise HTTPException(
@@ -191,19 +216,24 @@ class AdminService:
                 detail="Invalid role. Must be 'customer' or 'admin'",
             )
 
-        user = self.user_crud.update_user_role(user_id, new_role)
+        user = await self.user_crud.update_user_role(user_id, new_role)
         return user
 
     # Order Management Methods
-    def get_all_orders(
+    async def get_all_orders(
         self,
         page: int = 1,
         page_size: int = 20,
         status: Optional[str] = None,
         user_id: Optional[int] = None,
+        pagination: str = "offset",
+        cursor: Optional[str] = None,
+        count_mode: Optional[str] = None,
     ) -> OrderManagementResponse:
         """Get paginated list of all orders with optional filters"""
-        total, orders = self.order_crud.get_all_orders(page, page_size, status)
+        count, orders, next_cursor = await self.order_crud.get_all_orders(
+            page, page_size, status, user_id, pagination, cursor, count_mode
+        )
         order_items = []
         for order in orders:
             order_items.append(
@@ -221,10 +251,16 @@ class AdminService:
             )
 
         return OrderManagementResponse(
-            orders=order_items, total=total, page=page, page_size=page_size
+            orders=order_items,
+            total=count.total,
+            page=None if pagination == "cursor" or cursor else page,
+            page_size=page_size,
+            count_mode=count.mode,
+            has_more=count.has_more,
+            next_cursor=next_cursor,
         )
 
-    def update_order_status(self, order_id: int, new_status: str) -> Order:
+    async def update_order_status(self, order_id: int, new_status: str) -> Order:
         """Update an order's status"""
         valid_statuses = ["pending", "paid", "shipped", "delivered", "cancelled"]
         if new_status not in valid_statuses:
@@ -233,20 +269,27 @@ class AdminService:
                 detail=f"Invalid status. Must be one of: {', '.join(valid_statuses)}",
             )
 
-        return self.order_crud.update_order_status(order_id, new_status)
+        return await self.order_crud.update_order_status(order_id, new_status)
 
-    def mark_order_shipped(
+    async def mark_order_shipped(
         self, order_id: int, shipped_at: Optional[datetime] = None
     ) -> Order:
         """Mark an order as shipped"""
-        return self.order_crud.mark_order_shipped(order_id, shipped_at)
+        return await self.order_crud.mark_order_shipped(order_id, shipped_at)
 
     # Review Moderation Methods
-    def get_pending_reviews(
-        self, page: int = 1, page_size: int = 20
+    async def get_pending_reviews(
+        self,
+        page: int = 1,
+        page_size: int = 20,
+        pagination: str = "offset",
+        cursor: Optional[str] = None,
+        count_mode: Optional[str] = None,
     ) -> ReviewModerationResponse:
         """Get paginated list of pending reviews"""
-        total, reviews = self.review_crud.get_pending_reviews(page, page_size)
+        count, reviews, next_cursor = await self.review_crud.get_pending_reviews(
+            page, page_size, pagination, cursor, count_mode
+        )
 
         review_items = []
         for review in reviews:
@@ -265,14 +308,27 @@ class AdminService:
             )
 
         return ReviewModerationResponse(
-            reviews=review_items, total=total, page=page, page_size=page_size
+            reviews=review_items,
+            total=count.total,
+            page=None if pagination == "cursor" or cursor else page,
+            page_size=page_size,
+            count_mode=count.mode,
+            has_more=count.has_more,
+            next_cursor=next_cursor,
         )
 
-    def get_all_reviews(
-        self, page: int = 1, page_size: int = 20
+    async def get_all_reviews(
+        self,
+        page: int = 1,
+        page_size: int = 20,
+        pagination: str = "offset",
+        cursor: Optional[str] = None,
+        count_mode: Optional[str] = None,
     ) -> ReviewModerationResponse:
         """Get paginated list of all reviews"""
-        total, reviews = self.review_crud.get_all_reviews(page, page_size)
+        count, reviews, next_cursor = await self.review_crud.get_all_reviews(
+            page, page_size, pagination, cursor, count_mode
+        )
 
         review_items = []
         for review in reviews:
@@ -291,21 +347,27 @@ class AdminService:
             )
 
         return ReviewModerationResponse(
-            reviews=review_items, total=total, page=page, page_size=page_size
+            reviews=review_items,
+            total=count.total,
+            page=None if pagination == "cursor" or cursor else page,
+            page_size=page_size,
+            count_mode=count.mode,
+            has_more=count.has_more,
+            next_cursor=next_cursor,
         )
 
-    def approve_review(self, review_id: int) -> Review:
+    async def approve_review(self, review_id: int) -> Review:
         """Approve a review"""
-        return self.review_crud.approve_review(review_id)
+        return await self.review_crud.approve_review(review_id)
 
-    def reject_review(self, review_id: int) -> None:
+    async def reject_review(self, review_id: int) -> None:
         """Reject/delete a review"""
-        return self.review_crud.reject_review(review_id)
+        return await self.review_crud.reject_review(review_id)
 
     # Inventory Management Methods
-    def get_low_stock_products(self, threshold: int = 10) -> List[InventoryAlert]:
+    async def get_low_stock_products(self, threshold: int = 10) -> List[InventoryAlert]:
         """Get products with low stock"""
-        products = self.product_crud.get_slow_stock_products(threshold)
+        products = await self.product_crud.get_slow_stock_products(threshold)
 
         return [
             InventoryAlert(
@@ -318,11 +380,11 @@ class AdminService:
             for p in products
         ]
 
-    def bulk_update_inventory(
+    async def bulk_update_inventory(
         self, updates: List[BulkInventoryUpdateItem]
     ) -> BulkInventoryUpdateResponse:
         """Bulk update product inventory"""
-        updated_count, failed_products = self.product_crud.bulk_update_inventory(
+        updated_count, failed_products = await self.product_crud.bulk_update_inventory(
             updates
         )
 
@@ -1,5 +1,6 @@
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.exc import IntegrityError  # Import for specific handling
+from app.core.cached import cached
 from app.core.exceptions import CategoryCreationError, CategoryUpdateError
 from app.crud.category import CategoryCrud
 from app.schema.category_schema import CreateCategory, UpdateCategory, CategoryPublic
@@ -10,14 +11,14 @@ from app.core.logger import logger
 class CategoryService:
     """Business logic for categories including validation and error mapping."""
 
-    def __init__(self, db: Session):
+    def __init__(self, db: AsyncSession):
         self.db = db
         self.crud = CategoryCrud(db=db)
 
-    def create_category(self, create_dto: CreateCategory) -> CategoryPublic:
+    async def create_category(self, create_dto: CreateCategory) -> CategoryPublic:
         """Create a category and return a validated response model."""
         try:
-            result = self.crud.create_category(create_dto)
+            result = await self.crud.create_category(create_dto)
             return CategoryPublic.model_validate(result)
         except CategoryCreationError as e:
             logger.warning(f"error: {e}")
@@ -29,19 +30,26 @@ class CategoryService:
             logger.error(f"Unexpected error: {e}")
             raise HTTPException(status_code=500, detail="Internal server error.")
 
-    def get_category_by_id(self, id: int) -> CategoryPublic:
+    @cached(
+        "category",
+        ttl="CATEGORY_CACHE_TTL_SECONDS",
+        tags=["categories"],
+        negative_ttl="CACHE_NEGATIVE_TTL_SECONDS",
+    )
+    async def get_category_by_id(self, id: int) -> CategoryPublic:
         """Retrieve a category by id; 404 if missing."""
-        category = self.crud.get_category_by_id(id)
+        category = await self.crud.get_category_by_id(id)
         if not category:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND, detail="Category not found"
             )
         return CategoryPublic.model_validate(category)
 
-    def get_all_categories(self) -> list[CategoryPublic]:
+    @cached("categories", ttl="CATEGORY_CACHE_TTL_SECONDS", tags=["categories"])
+    async def get_all_categories(self) -> list[CategoryPublic]:
         """List all categories as response models."""
         try:
-            categories = self.crud.get_all_categories()
+            categories = await self.crud.get_all_categories()
             return [CategoryPublic.model_validate(cat) for cat in categories]
         except Exception as e:
             logger.error(f"Error fetching categories: {e}")
@@ -50,19 +58,27 @@ class CategoryService:
                 detail="Failed to fetch categories.",
             )
 
-    def get_category_by_slug(self, slug: str) -> CategoryPublic:
+    @cached(
+        "category-slug",
+        ttl="CATEGORY_CACHE_TTL_SECONDS",
+        tags=["categories"],
+        negative_ttl="CACHE_NEGATIVE_TTL_SECONDS",
+    )
+    async def get_category_by_slug(self, slug: str) -> CategoryPublic:
         """Retrieve a category by slug; 404 if missing."""
-        category = self.crud.get_category_by_slug(slug)
+        category = await self.crud.get_category_by_slug(slug)
         if not category:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND, detail="Category not found"
             )
         return CategoryPublic.model_validate(category)
 
-    def update_category(self, id: int, update_dto: UpdateCategory) -> CategoryPublic:
+    async def update_category(
+        self, id: int, update_dto: UpdateCategory
+    ) -> CategoryPublic:
         """Partially update a category and return a validated response model."""
         try:
-            updated_category = self.crud.update_category(id, update_dto)
+            updated_category = await self.crud.update_category(id, update_dto)
             if not updated_category:
                 raise HTTPException(
                     status_code=status.HTTP_404_NOT_FOUND, detail="Category not found"
@@ -83,9 +99,9 @@ class CategoryService:
                 detail="please try again.",
             )
 
-    def delete_category(self, id: int) -> None:
+    async def delete_category(self, id: int) -> None:
         """Delete a category by id; 404 if missing."""
-        is_deleted = self.crud.delete_category(id)
+        is_deleted = await self.crud.delete_category(id)
         if not is_deleted:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND, detail="Category not found"
@@ -1,15 +1,55 @@
-from typing import Any, Dict
+import base64
+import json
+from typing import Optional
 
 from elasticsearch import (
     AsyncElasticsearch,
     AuthenticationException,
     ConnectionError,
+    ConnectionTimeout,
     NotFoundError,
     RequestError,
 )
 from fastapi import HTTPException, status
 
+from app.core.config import settings
 from app.core.logger import logger
+from app.schema.search_schema import (
+    ProductFacets,
+    ProductSearchHit,
+    ProductSearchQuery,
+    ProductSearchResponse,
+    SearchSort,
+)
+from app.utils import es_query
+
+# How long a search's point-in-time stays open between two pages
+PIT_KEEP_ALIVE = "1m"
+
+
+def _encode_cursor(pit_id: Optional[str], search_after: list, sort: SearchSort) -> str:
+    payload = json.dumps({"pit": pit_id, "after": search_after, "s": sort.value})
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def _decode_cursor(cursor: str, sort: SearchSort) -> dict:
+    """Page parameters stored in ``cursor``; 400 if invalid."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        if payload["s"] != sort.value:
+            raise ValueError("cursor was issued for a different sort order")
+        if payload["pit"] is not None and not isinstance(payload["pit"], str):
+            raise TypeError("cursor point-in-time is not a string")
+        page = {"search_after": list(payload["after"])}
+        if payload["pit"] is not None:
+            page.update(pit_id=payload["pit"], keep_alive=PIT_KEEP_ALIVE)
+        return page
+    except (ValueError, KeyError, TypeError) as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Invalid search cursor: {e}",
+        )
 
 
 class ElasticService:
@@ -40,66 +80,159 @@ class ElasticService:
             logger.exception("Unexpected error during Elasticsearch ping")
             raise HTTPException(status_code=500, detail="Internal Elasticsearch error")
 
-    async def search(
-        self,
-        query: Dict[str, Any],
-        index: str = INDEX,
-        size: int = 20,
-        from_: int = 0,
-        highlight: bool = True,
-    ):
-        if size > 100:
+    async def search_products(
+        self, query: ProductSearchQuery, index: str = INDEX, facets: bool = False
+    ) -> ProductSearchResponse:
+        """
+        Typed product search (see app.utils.es_query).
+
+        When more hits follow, the last hit's sort values go into
+        ``next_cursor`` and later pages continue with ``search_after``, so
+        deep pages cost the same as the first. By default every page
+        searches ``index`` as it is now. With ``query.snapshot`` a
+        point-in-time is opened before the first page and all pages read
+        that snapshot, so results never shift as the index changes; it is
+        held open only for clients that ask, as each one is a search
+        context kept for PIT_KEEP_ALIVE between pages.
+
+        With ``facets`` the facet aggregations run in the same request.
+        """
+        page = _decode_cursor(query.cursor, query.sort) if query.cursor else {}
+        body = None
+        try:
+            if query.cursor is None and query.snapshot:
+                pit = await self.es.open_point_in_time(
+                    index=index, keep_alive=PIT_KEEP_ALIVE
+                )
+                page = {"pit_id": pit["id"], "keep_alive": PIT_KEEP_ALIVE}
+            pit_id = page.get("pit_id")
+            body = es_query.build_search_body(query, page, facets)
+            if pit_id is None:
+                result = await self.es.search(index=index, body=body)
+            else:
+                # The point-in-time fixes the index: none may be named
+                result = await self.es.search(body=body)
+                pit_id = result.get("pit_id", pit_id)
+            hits = result["hits"]["hits"]
+            total = result["hits"]["total"]["value"]
+
+            next_cursor = None
+            # A full page may be followed by more; on the first one the
+            # total tells for sure
+            if len(hits) == query.size and (query.cursor or total > len(hits)):
+                next_cursor = _encode_cursor(pit_id, hits[-1]["sort"], query.sort)
+            elif pit_id is not None:
+                await self.es.close_point_in_time(id=pit_id)
+        except NotFoundError:
+            if page.get("pit_id") is not None and query.cursor:
+                raise HTTPException(
+                    status_code=400, detail="Search cursor expired, start over"
+                )
+            raise HTTPException(status_code=404, detail=f"Index '{index}' not found")
+        except RequestError as e:
+            logger.warning(f"Bad search query: {body} → {e}")
+            raise HTTPException(status_code=400, detail="Invalid search query")
+        except (ConnectionError, ConnectionTimeout) as e:
+            logger.error(f"Elasticsearch connection failed during search: {e}")
             raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST, detail="Maximum size is 100"
+                status_code=503, detail="Search temporarily unavailable"
             )
-        if highlight and "highlight" not in query:
-            query["highlight"] = {
-                "fields": {
-                    "name": {"pre_tags": ["<em>"], "post_tags": ["</em>"]},
-                    "description": {"pre_tags": ["<em>"], "post_tags": ["</em>"]},
-                }
-            }
+        except Exception:
+            logger.exception("Unexpected error in search")
+            raise HTTPException(status_code=500, detail="Search failed")
+
+        return ProductSearchResponse(
+            total=total,
+            took_ms=result["took"],
+            results=[
+                ProductSearchHit(
+                    id=hit["_id"],
+                    score=hit["_score"],
+                    data=hit["_source"],
+                    highlight=hit.get("highlight", {}),
+                )
+                for hit in hits
+            ],
+            next_cursor=next_cursor,
+            facets=es_query.parse_facets(result["aggregations"]) if facets else None,
+        )
+
+    async def get_facets(
+        self, query: ProductSearchQuery, index: str = INDEX
+    ) -> ProductFacets:
+        """Facet counts for ``query`` without fetching any hits."""
         try:
             result = await self.es.search(
                 index=index,
-                body=query,
-                size=size,
-                from_=from_,
-                rest_total_hits_as_int=True,
+                body=es_query.build_facets_body(query),
+                request_cache=True,
             )
+        except NotFoundError:
+            raise HTTPException(status_code=404, detail=f"Index '{index}' not found")
+        except (ConnectionError, ConnectionTimeout) as e:
+            logger.error(f"Elasticsearch connection failed during facets: {e}")
+            raise HTTPException(
+                status_code=503, detail="Search temporarily unavailable"
+            )
+        except Exception:
+            logger.exception("Unexpected error in facets")
+            raise HTTPException(status_code=500, detail="Search failed")
+        return es_query.parse_facets(result["aggregations"])
 
-            hits = result["hits"]["hits"]
-            return {
-                "total": result["hits"]["total"],
-                "took_ms": result["took"],
-                "results": [
-                    {
-                        "id": hit["_id"],
-                        "score": hit["_score"],
-                        "data": hit["_source"],
-                        "highlight": hit.get("highlight", {}),
-                    }
-                    for hit in hits
-                ],
-            }
+    async def search_product_ids(
+        self, body: dict, index: str = INDEX
+    ) -> tuple[list[int], int | None]:
+        """
+        Ids of the hits of a listing body (es_query.build_listing_body), in
+        order, and the total when the body tracks it.
 
+        Fails fast, without the client's retries: callers fall back to SQL.
+        """
+        es = self.es.options(
+            request_timeout=settings.ES_LISTING_TIMEOUT_SECONDS, max_retries=0
+        )
+        try:
+            result = await es.search(index=index, body=body)
         except NotFoundError:
             raise HTTPException(status_code=404, detail=f"Index '{index}' not found")
-        except RequestError as e:
-
-            logger.warning(f"Bad search query: {query} → {e}")
-            error_msg = e.info.get("error", {}).get("reason", str(e))
+        except (ConnectionError, ConnectionTimeout) as e:
+            logger.error(f"Elasticsearch connection failed during listing: {e}")
             raise HTTPException(
-                status_code=400, detail=f"Invalid search query: {error_msg}"
+                status_code=503, detail="Search temporarily unavailable"
             )
-        except ConnectionError as e:
-            logger.error(f"Elasticsearch connection failed during search: {e}")
+        except Exception:
+            logger.exception("Unexpected error in listing search")
+            raise HTTPException(status_code=500, detail="Search failed")
+        hits = result["hits"]
+        total = hits["total"]["value"] if body.get("track_total_hits") else None
+        return [int(hit["_id"]) for hit in hits["hits"]], total
+
+    async def autocomplete(
+        self, text: str, size: int = 10, index: str = INDEX
+    ) -> list[str]:
+        """
+        Product names completing ``text`` (es_query.build_autocomplete_body).
+
+        Fails fast, like search_product_ids: callers fall back to SQL.
+        """
+        es = self.es.options(
+            request_timeout=settings.ES_AUTOCOMPLETE_TIMEOUT_SECONDS, max_retries=0
+        )
+        try:
+            result = await es.search(
+                index=index, body=es_query.build_autocomplete_body(text, size)
+            )
+        except NotFoundError:
+            raise HTTPException(status_code=404, detail=f"Index '{index}' not found")
+        except (ConnectionError, ConnectionTimeout) as e:
+            logger.error(f"Elasticsearch connection failed during autocomplete: {e}")
             raise HTTPException(
                 status_code=503, detail="Search temporarily unavailable"
             )
-        except Exception as e:
-            logger.exception("Unexpected error in search")
-            raise HTTPException(status_code=500, detail="Search failed")
+        except Exception:
+            logger.exception("Unexpected error in autocomplete")
+            raise HTTPException(status_code=500, detail="Autocomplete failed")
+        return [hit["_source"]["name"] for hit in result["hits"]["hits"]]
 
     async def suggest(
         self, text: str, size: int = 10, category: str | None = None
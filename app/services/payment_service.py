@@ -14,9 +14,9 @@ class PaymentService:
         self.payment_crud = PaymentCrud(db)
         self.order_crud = OrderCrud(db)
 
-    def create_payment_intent(self, user_id: int, order_id: int):
+    async def create_payment_intent(self, user_id: int, order_id: int):
         # get order
-        order = self.order_crud.get_order_by_id(user_id, order_id)
+        order = await self.order_crud.get_order_by_id(user_id, order_id)
         if not order:
             raise HTTPException(status_code=404, detail="Order not found")
 
@@ -35,7 +35,7 @@ class PaymentService:
             raise HTTPException(status_code=400, detail=str(e))
 
         # Create local Payment record
-        self.payment_crud.create_payment(
+        await self.payment_crud.create_payment(
             order_id=order.id,
             amount=order.total_amount,
             transaction_id=intent.id,
@@ -49,7 +49,7 @@ class PaymentService:
             "currency": "usd",
         }
 
-    def handle_webhook(self, payload, sig_header):
+    async def handle_webhook(self, payload, sig_header):
         event = None
         try:
             event = stripe.Webhook.construct_event(
@@ -62,34 +62,34 @@ class PaymentService:
 
         if event["type"] == "payment_intent.succeeded":
             payment_intent = event["data"]["object"]
-            self._handle_successful_payment(payment_intent)
+            await self._handle_successful_payment(payment_intent)
         elif event["type"] == "payment_intent.payment_failed":
             payment_intent = event["data"]["object"]
-            self._handle_failed_payment(payment_intent)
+            await self._handle_failed_payment(payment_intent)
 
         return {"status": "success"}
 
-    def _handle_successful_payment(self, payment_intent):
+    async def _handle_successful_payment(self, payment_intent):
         transaction_id = payment_intent["id"]
-        payment = self.payment_crud.get_payment_by_transaction_id(transaction_id)
+        payment = await self.payment_crud.get_payment_by_transaction_id(transaction_id)
         if payment:
-            self.payment_crud.update_payment_status(payment, "completed")
+            await self.payment_crud.update_payment_status(payment, "completed")
 
             # Update Order Status
-            order = self.db.get(Order, payment.order_id)
+            order = await self.db.get(Order, payment.order_id)
             if order:
                 order.payment_status = "success"
                 order.status = "paid"
-                self.db.commit()
+                await self.db.commit()
 
-    def _handle_failed_payment(self, payment_intent):
+    async def _handle_failed_payment(self, payment_intent):
         transaction_id = payment_intent["id"]
-        payment = self.payment_crud.get_payment_by_transaction_id(transaction_id)
+        payment = await self.payment_crud.get_payment_by_transaction_id(transaction_id)
         if payment:
-            self.payment_crud.update_payment_status(payment, "failed")
+            await self.payment_crud.update_payment_status(payment, "failed")
 
             # Update Order Status
-            order = self.db.get(Order, payment.order_id)
+            order = await self.db.get(Order, payment.order_id)
             if order:
                 order.payment_status = "failed"
-                self.db.commit()
+                await self.db.commit()
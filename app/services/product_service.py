@@ -1,27 +1,46 @@
-from typing import List, Optional
+from typing import Dict, List, Optional
 
 from fastapi import HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.autocomplete_index import autocomplete_index
+from app.core.cached import cached
+from app.core.config import settings
 from app.core.exceptions import ProductException
 from app.core.logger import logger
+from app.core.product_cache import (
+    AUTOCOMPLETE_NAMESPACE,
+    cache_listing,
+    get_cached_listing,
+    listing_cache_key,
+    product_cache_key,
+)
 from app.core.redis import RedisClient
 from app.crud.category import CategoryCrud
-from app.crud.product import ProductCrud
+from app.crud.product import ProductCrud, listing_base_url, offset_listing_page
 from app.schema.product_schema import ProductCreate, ProductResponse, ProductUpdate
 from app.schema.common_schema import PaginatedResponse
+from app.services.search_service import SearchService
 
 
 class ProductService:
-    def __init__(self, db: Session, redis: RedisClient):
+    def __init__(
+        self,
+        db: AsyncSession,
+        redis: RedisClient,
+        read_db: Optional[AsyncSession] = None,
+        search: Optional[SearchService] = None,
+    ):
         self.db = db
+        self.read_db = read_db or db
         self.redis_client = redis
-        self.crud = ProductCrud(db=db)
+        self.crud = ProductCrud(db=db, read_db=read_db)
+        self.search = search
 
-    def create_product(self, create_dto: ProductCreate) -> ProductResponse:
+    async def create_product(self, create_dto: ProductCreate) -> ProductResponse:
         """Create a product and return a validated response model."""
         try:
-            result = self.crud.create_product(create_dto)
+            result = await self.crud.create_product(create_dto)
             return ProductResponse.model_validate(result)
         except ProductException as e:
             if "UNIQUE constraint" in str(e):
@@ -36,47 +55,61 @@ class ProductService:
                 detail="please try again",
             )
 
-    def get_product_by_slug(self, slug: str) -> ProductResponse:
+    async def get_product_by_slug(self, slug: str) -> ProductResponse:
         """Retrieve a product by slug; 404 if not found."""
-        product = self.crud.get_product_detail(slug)
+        product = await self.crud.get_product_detail(slug)
         if not product:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND, detail="Product not found"
             )
         return ProductResponse.model_validate(product)
 
+    # Shares product:{id} entries with get_products_by_ids, so no negative
+    # caching: batch readers expect every entry to be a product
+    @cached("product", ttl="PRODUCT_CACHE_TTL_SECONDS", key="product:{id}")
     async def get_product_by_id(self, id: int) -> ProductResponse:
         """Retrieve a product by id with caching."""
-        cache_key = f"product:{id}"
-
-        # Try cache first (store as JSON string for speed)
-        cached_json = await self.redis_client.get_json(cache_key)
-        if cached_json:
-            logger.info(
-                f"Cache hit for product: {id}",
-            )
-            return ProductResponse.model_validate_json(cached_json)
-
-        logger.info("Cache miss for product:%s", id)
-
-        # ← FIX: Must be await + async CRUD!
-        product_model = self.crud.get_product_by_id(id)
-
+        logger.info(f"Cache miss for product: {id}")
+        product_model = await self.crud.get_product_by_id(id)
         if not product_model:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND, detail="Product not found"
             )
+        return ProductResponse.model_validate(product_model)
 
-        response_data = ProductResponse.model_validate(product_model)
+    async def get_products_by_ids(self, ids: List[int]) -> List[ProductResponse]:
+        """
+        Active products for ``ids`` in request order, skipping unknown and
+        inactive ids.
 
-        # Cache for 10 minutes (adjust as needed)
-        await self.redis_client.set_json(
-            cache_key, response_data.model_dump_json(), ex=600
-        )
+        Cached products are read with one MGET and the misses filled with a
+        single IN query, sharing cache entries with get_product_by_id. Those
+        entries hold inactive products too (the admin lookup needs them), so
+        the filter applies to cached and loaded products alike.
+        """
+        ids = list(dict.fromkeys(ids))
+        keys = {product_cache_key(id): id for id in ids}
+
+        async def load(missing: List[str]) -> Dict[str, dict]:
+            logger.info(f"Cache miss for {len(missing)} products")
+            products = await self.crud.get_products_by_ids([keys[k] for k in missing])
+            return {
+                product_cache_key(p.id): ProductResponse.model_validate(p).model_dump(
+                    mode="json"
+                )
+                for p in products
+            }
 
-        return response_data
+        found = await self.redis_client.get_or_set_many(
+            list(keys), load, ex=settings.PRODUCT_CACHE_TTL_SECONDS
+        )
+        return [
+            ProductResponse.model_validate(value)
+            for value in found.values()
+            if value["is_active"]
+        ]
 
-    def get_all_products(
+    async def get_all_products(
         self,
         page: Optional[int],
         per_page: Optional[int],
@@ -88,6 +121,9 @@ class ProductService:
         availability: str | None = "all",
         sort_by: str | None = "id",
         sort_order: str | None = "asc",
+        pagination: str = "offset",
+        cursor: str | None = None,
+        count_mode: str | None = None,
     ) -> PaginatedResponse[ProductResponse]:
         """
         List all products with advanced filtering and sorting.
@@ -103,21 +139,69 @@ class ProductService:
             availability: Stock filter ('all', 'in_stock', 'out_of_stock')
             sort_by: Sort field
             sort_order: Sort direction ('asc' or 'desc')
+            pagination: 'offset' or 'cursor'
+            cursor: Opaque cursor from a previous cursor-mode page
+            count_mode: Total count strategy; None uses the configured default
+
+        Pages are cached in Redis and invalidated by the product writes that
+        can change them (see app.core.product_cache).
+
+        Text searches are resolved by Elasticsearch when it can serve them
+        (see SearchService.search_listing_ids): it returns the page's ids and
+        the products come from the product cache. Those pages are not
+        cached, since the index trails product writes by the outbox delay.
         """
+        params = dict(
+            page=page,
+            per_page=per_page,
+            search=search,
+            category_id=category_id,
+            min_price=min_price,
+            max_price=max_price,
+            min_rating=min_rating,
+            availability=availability,
+            sort_by=sort_by,
+            sort_order=sort_order,
+            pagination=pagination,
+            cursor=cursor,
+            count_mode=count_mode,
+        )
+        if search and self.search is not None:
+            found = await self.search.search_listing_ids(**params)
+            if found is not None:
+                ids, count = found
+                return offset_listing_page(
+                    await self.get_products_by_ids(ids),
+                    page,
+                    per_page,
+                    count,
+                    listing_base_url(
+                        search=search,
+                        category_id=category_id,
+                        min_price=min_price,
+                        max_price=max_price,
+                        min_rating=min_rating,
+                        availability=availability,
+                        sort_by=sort_by,
+                        sort_order=sort_order,
+                        count_mode=count_mode,
+                    ),
+                )
+
+        cache_key = listing_cache_key(**params)
+        cached = await get_cached_listing(cache_key)
+        if cached is not None:
+            return PaginatedResponse[ProductResponse].model_validate(cached)
+
         try:
-            products = self.crud.get_all_products(
-                page,
-                per_page,
-                search,
-                category_id,
-                min_price,
-                max_price,
-                min_rating,
-                availability,
-                sort_by,
-                sort_order,
+            result = await self.crud.get_all_products(**params)
+            products = PaginatedResponse[ProductResponse](
+                data=[ProductResponse.model_validate(p) for p in result.data],
+                meta=result.meta,
+                links=result.links,
             )
-            return products
+        except HTTPException:
+            raise
         except Exception as e:
             logger.info(f"exception: {e}")
             raise HTTPException(
@@ -125,10 +209,20 @@ class ProductService:
                 detail="failed to fetch products",
             )
 
-    def update_product(self, id: int, update_dto: ProductUpdate) -> ProductResponse:
+        await cache_listing(
+            cache_key,
+            products.model_dump(mode="json"),
+            category_id,
+            [product.id for product in products.data],
+        )
+        return products
+
+    async def update_product(
+        self, id: int, update_dto: ProductUpdate
+    ) -> ProductResponse:
         """Partially update a product; maps conflicts and not-found to HTTP codes."""
         try:
-            updated = self.crud.update_product(id, update_dto)
+            updated = await self.crud.update_product(id, update_dto)
             if not updated:
                 raise HTTPException(
                     status_code=status.HTTP_404_NOT_FOUND, detail="Product not found"
@@ -148,32 +242,39 @@ class ProductService:
                 detail="please try again",
             )
 
-    def delete_product(self, id: int) -> None:
+    async def delete_product(self, id: int) -> None:
         """Delete a product by id; 404 if missing."""
-        deleted = self.crud.delete_product(id)
+        deleted = await self.crud.delete_product(id)
         if not deleted:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND, detail="Product not found"
             )
         return None
 
-    def get_products_by_category_id(self, category_id: int) -> List[ProductResponse]:
-        products = self.crud.get_products_by_category_id(category_id)
+    async def get_products_by_category_id(
+        self, category_id: int
+    ) -> List[ProductResponse]:
+        products = await self.crud.get_products_by_category_id(category_id)
         return [ProductResponse.model_validate(p) for p in products]
 
-    def get_products_by_category_slug(self, slug: str) -> List[ProductResponse]:
-        category = CategoryCrud(self.db).get_category_by_slug(slug)
+    async def get_products_by_category_slug(self, slug: str) -> List[ProductResponse]:
+        category = await CategoryCrud(self.read_db).get_category_by_slug(slug)
         if category is None:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND, detail="Category not found"
             )
-        products = self.crud.get_products_by_category_id(category.id)
+        products = await self.crud.get_products_by_category_id(category.id)
         return [ProductResponse.model_validate(p) for p in products]
 
     async def get_autocomplete_suggestions(self, query: str) -> List[str]:
         """
         Get product name suggestions for autocomplete with Redis caching.
 
+        Served from the in-process trie (app.core.autocomplete_index); until
+        it is loaded, or when it is disabled, by the search-as-you-type
+        index, best sellers first, or by SQL prefix matching while search is
+        unavailable.
+
         Args:
             query: Search query (minimum 2 characters)
 
@@ -186,28 +287,27 @@ class ProductService:
                 detail="Query must be at least 2 characters",
             )
 
-        # Normalize query for cache key
-        cache_key = f"autocomplete:{query.lower()}"
-
-        # Try cache first
-        cached_suggestions = await self.redis_client.get_json(cache_key)
-        if cached_suggestions:
-            logger.info(f"Cache hit for autocomplete: {query}")
-            import json
+        # Answered from this worker's trie once it is loaded
+        if autocomplete_index.ready:
+            return autocomplete_index.complete(query)
 
-            return json.loads(cached_suggestions)
-
-        logger.info(f"Cache miss for autocomplete: {query}")
-
-        # Get suggestions from database
-        suggestions = self.crud.get_product_suggestions(query, limit=10)
-
-        # Cache for 1 hour (3600 seconds)
-        if suggestions:
-            import json
+        # Normalize query for cache key
+        cache_key = await self.redis_client.namespaced_key(
+            AUTOCOMPLETE_NAMESPACE, query.lower()
+        )
 
-            await self.redis_client.set_json(
-                cache_key, json.dumps(suggestions), ex=3600
-            )
+        async def load() -> List[str]:
+            logger.info(f"Cache miss for autocomplete: {query}")
+            if self.search is not None:
+                names = await self.search.autocomplete(query, size=10)
+                if names is not None:
+                    return names
+            return await self.crud.get_product_suggestions(query, limit=10)
 
-        return suggestions
+        # Empty results are not cached
+        return await self.redis_client.get_or_set(
+            cache_key,
+            load,
+            ex=settings.AUTOCOMPLETE_CACHE_TTL_SECONDS,
+            should_cache=bool,
+        )
@@ -1,8 +1,9 @@
 from typing import List, Optional
 
 from fastapi import HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.cached import cached
 from app.crud.review import ReviewCrud
 from app.models.review import Review
 from app.schema.review_schema import ReviewCreate, ReviewResponse, ReviewUpdate
@@ -10,38 +11,43 @@ from app.schema.user_schema import UserPublic
 
 
 class ReviewService:
-    def __init__(self, db: Session):
+    def __init__(self, db: AsyncSession, read_db: Optional[AsyncSession] = None):
         self.db = db
-        self.crud = ReviewCrud(db=db)
+        self.crud = ReviewCrud(db=db, read_db=read_db)
 
-    def create_review(self, review: ReviewCreate, user_id: int) -> ReviewResponse:
+    async def create_review(self, review: ReviewCreate, user_id: int) -> ReviewResponse:
         """Create a new review."""
-        db_review = self.crud.create_review(review=review, user_id=user_id)
+        db_review = await self.crud.create_review(review=review, user_id=user_id)
         return db_review
 
-    def get_reviews_by_product(
+    @cached(
+        "reviews-by-product",
+        ttl="REVIEW_CACHE_TTL_SECONDS",
+        tags=["reviews:product:{product_id}"],
+    )
+    async def get_reviews_by_product(
         self, product_id: int, skip: int = 0, limit: int = 100
     ) -> List[ReviewResponse]:
         """Get all reviews for a specific product."""
-        reviews = self.crud.get_reviews_by_product(
+        reviews = await self.crud.get_reviews_by_product(
             product_id=product_id, skip=skip, limit=limit
         )
         return reviews
 
-    def get_review(self, review_id: int) -> ReviewResponse:
+    async def get_review(self, review_id: int) -> ReviewResponse:
         """Get a specific review by ID."""
-        review = self.crud.get_review(review_id=review_id)
+        review = await self.crud.get_review(review_id=review_id)
         if not review:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND, detail="Review not found"
             )
         return review
 
-    def update_review(
+    async def update_review(
         self, review_id: int, review_update: ReviewUpdate, current_user: UserPublic
     ) -> ReviewResponse:
         """Update a review."""
-        db_review = self.crud.get_review(review_id=review_id)
+        db_review = await self.crud.get_review(review_id=review_id)
         if not db_review:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND, detail="Review not found"
@@ -53,14 +59,14 @@ class ReviewService:
                 detail="Not authorized to update this review",
             )
 
-        updated_review = self.crud.update_review(
+        updated_review = await self.crud.update_review(
             db_review=db_review, review_update=review_update
         )
         return updated_review
 
-    def delete_review(self, review_id: int, current_user: UserPublic) -> None:
+    async def delete_review(self, review_id: int, current_user: UserPublic) -> None:
         """Delete a review."""
-        db_review = self.crud.get_review(review_id=review_id)
+        db_review = await self.crud.get_review(review_id=review_id)
         if not db_review:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND, detail="Review not found"
@@ -72,4 +78,4 @@ class ReviewService:
                 detail="Not authorized to delete this review",
             )
 
-        self.crud.delete_review(db_review=db_review)
+        await self.crud.delete_review(db_review=db_review)
@@ -0,0 +1,215 @@
+"""
+Product search reads that must keep working when Elasticsearch does not.
+
+Elasticsearch calls go through a circuit breaker: after a few connection
+failures in a row, reads fall back to SQL straight away instead of each
+waiting for the cluster, until a probe finds it back. Facet counts are
+cached in Redis per filter set, so the filter sidebar of a results page
+costs one cached read however many pages or sort orders are browsed.
+
+Text searches of GET /product only ask Elasticsearch for a page of ids;
+ProductService hydrates them from the product cache. It also caches the
+autocomplete names returned here and falls back to SQL prefix matching.
+"""
+
+from typing import Awaitable, Callable, List, Optional, Tuple, TypeVar
+
+from elasticsearch import AsyncElasticsearch
+from fastapi import HTTPException, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.circuit_breaker import CircuitBreaker, CircuitOpenError
+from app.core.config import settings
+from app.core.logger import logger
+from app.core.product_cache import facets_cache_key
+from app.core.redis import RedisClient
+from app.crud.product import ProductCrud
+from app.db.counting import Count
+from app.schema.common_schema import CountMode
+from app.schema.search_schema import (
+    ProductFacets,
+    ProductSearchQuery,
+    ProductSearchResponse,
+)
+from app.services.elasticsearch_service import ElasticService
+from app.utils import es_query
+
+T = TypeVar("T")
+
+
+class _SearchUnavailable(Exception):
+    """Elasticsearch answered 503: unreachable, timed out or overloaded."""
+
+
+search_breaker = CircuitBreaker(
+    "elasticsearch",
+    failure_threshold=settings.ES_BREAKER_FAILURE_THRESHOLD,
+    reset_timeout=settings.ES_BREAKER_RESET_SECONDS,
+    failure_types=(_SearchUnavailable,),
+)
+
+
+def _facet_filters(query: ProductSearchQuery) -> dict:
+    return query.model_dump(
+        include={"text", "category", "min_price", "max_price", "in_stock"}
+    )
+
+
+class SearchService:
+    def __init__(
+        self,
+        db: AsyncSession,
+        redis: RedisClient,
+        es: Optional[AsyncElasticsearch],
+        read_db: Optional[AsyncSession] = None,
+    ):
+        self.redis_client = redis
+        self.elastic = ElasticService(es) if es is not None else None
+        self.crud = ProductCrud(db=db, read_db=read_db)
+
+    async def _from_elastic(
+        self, call: Callable[[ElasticService], Awaitable[T]]
+    ) -> Optional[T]:
+        """``call``'s result, or None if Elasticsearch is unavailable."""
+        if self.elastic is None:
+            return None
+
+        async def attempt() -> T:
+            try:
+                return await call(self.elastic)
+            except HTTPException as e:
+                if e.status_code == status.HTTP_503_SERVICE_UNAVAILABLE:
+                    raise _SearchUnavailable(e.detail) from e
+                raise
+
+        try:
+            return await search_breaker.call(attempt)
+        except (CircuitOpenError, _SearchUnavailable):
+            return None
+
+    async def search_listing_ids(
+        self,
+        search: str,
+        page: int,
+        per_page: int,
+        category_id: int | None = None,
+        min_price: float | None = None,
+        max_price: float | None = None,
+        min_rating: float | None = None,
+        availability: str | None = "all",
+        sort_by: str | None = "id",
+        sort_order: str | None = "asc",
+        pagination: str = "offset",
+        cursor: str | None = None,
+        count_mode: str | None = None,
+    ) -> Optional[Tuple[List[int], Count]]:
+        """
+        Ids of one GET /product?search= page, in order, and its count; None
+        when the listing must come from SQL instead: search disabled or
+        unhealthy, or a parameter the index cannot serve (rating filter or
+        sort, cursor paging, pages past the result window).
+        """
+        if (
+            not settings.PRODUCT_SEARCH_ELASTICSEARCH
+            or min_rating is not None
+            or sort_by not in (*es_query.LISTING_SORT_FIELDS, "relevance")
+            or pagination != "offset"
+            or cursor is not None
+            or page * per_page > es_query.MAX_RESULT_WINDOW
+        ):
+            return None
+
+        has_more_only = count_mode == CountMode.HAS_MORE.value
+        offset = (page - 1) * per_page
+        body = es_query.build_listing_body(
+            search,
+            category_id,
+            min_price,
+            max_price,
+            availability,
+            sort_by,
+            sort_order,
+            offset,
+            # One extra id tells whether another page exists
+            per_page + 1 if has_more_only else per_page,
+            track_total_hits=not has_more_only,
+        )
+        try:
+            found = await self._from_elastic(lambda es: es.search_product_ids(body))
+        except HTTPException as e:
+            logger.warning(f"Listing search failed, using SQL: {e.detail}")
+            return None
+        if found is None:
+            return None
+
+        ids, total = found
+        if has_more_only:
+            return ids[:per_page], Count(None, CountMode.HAS_MORE, len(ids) > per_page)
+        return ids, Count(total, CountMode.EXACT, offset + len(ids) < total)
+
+    async def autocomplete(self, text: str, size: int = 10) -> Optional[List[str]]:
+        """Names completing ``text``; None when SQL must answer instead."""
+        if not settings.AUTOCOMPLETE_ELASTICSEARCH:
+            return None
+        try:
+            return await self._from_elastic(lambda es: es.autocomplete(text, size))
+        except HTTPException as e:
+            logger.warning(f"Autocomplete search failed, using SQL: {e.detail}")
+            return None
+
+    async def get_facets(self, query: ProductSearchQuery) -> ProductFacets:
+        """Facet counts for ``query``: cache, then Elasticsearch, then SQL."""
+        key = facets_cache_key(**_facet_filters(query))
+        facets = await self._cached_facets(key)
+        if facets is not None:
+            return facets
+        facets = await self._from_elastic(lambda es: es.get_facets(query))
+        if facets is None:
+            logger.warning("Search unavailable, computing facets in SQL")
+            facets = await self.crud.get_facet_counts(query)
+        await self._cache_facets(key, facets)
+        return facets
+
+    async def search_products(self, query: ProductSearchQuery) -> ProductSearchResponse:
+        """
+        GET /elastic/search. With ``query.facets``, facets come from the
+        cache or else are aggregated in the same request as the hits and
+        cached for the next pages.
+        """
+        key = facets_cache_key(**_facet_filters(query))
+        cached = await self._cached_facets(key) if query.facets else None
+        aggregate = query.facets and cached is None
+
+        response = await self._from_elastic(
+            lambda es: es.search_products(query, facets=aggregate)
+        )
+        if response is None:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Search temporarily unavailable",
+            )
+        if cached is not None:
+            response.facets = cached
+        elif aggregate:
+            await self._cache_facets(key, response.facets)
+        return response
+
+    async def _cached_facets(self, key: str) -> Optional[ProductFacets]:
+        if not self.redis_client.available:
+            return None
+        try:
+            value = await self.redis_client.get_json(key)
+        except Exception as e:
+            logger.warning(f"Facet cache read failed for {key}: {e}")
+            return None
+        return ProductFacets.model_validate(value) if value else None
+
+    async def _cache_facets(self, key: str, facets: ProductFacets) -> None:
+        if not self.redis_client.available:
+            return
+        try:
+            await self.redis_client.set_json(
+                key, facets.model_dump(), ex=settings.SEARCH_FACET_CACHE_TTL_SECONDS
+            )
+        except Exception as e:
+            logger.warning(f"Facet cache write failed for {key}: {e}")
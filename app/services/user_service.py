@@ -6,14 +6,14 @@ from app.schema.user_schema import (
     UpdateUserSchema,
 )
 from app.models.user import User
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi import HTTPException, status
 from app.crud.user import UserCrud
 from app.utils.security import verify_password, create_token
 
 
 class UserService:
-    def __init__(self, db: Session):
+    def __init__(self, db: AsyncSession):
         """
         Initialize the UserService with a database session.
 
@@ -21,12 +21,12 @@ class UserService:
         login, updates, and deletion. It interacts with the UserCrud for database operations.
 
         Parameters:
-        - db (Session): The SQLAlchemy database session for performing queries and commits.
+        - db (AsyncSession): The SQLAlchemy database session for performing queries and commits.
         """
         self.db = db
         self.crud = UserCrud(db=db)
 
-    def create_user(self, user_create_data: CreateUserSchema) -> UserPublic:
+    async def create_user(self, user_create_data: CreateUserSchema) -> UserPublic:
         """
         Create a new user based on the provided data.
 
@@ -42,15 +42,15 @@ class UserService:
         Raises:
         - HTTPException: 400 Bad Request if a user with the same email already exists.
         """
-        if self.crud.get_user_by_email(user_create_data.email):
+        if await self.crud.get_user_by_email(user_create_data.email):
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail="User with this email already exists",
             )
-        user = self.crud.create_user(user_create_data=user_create_data)
+        user = await self.crud.create_user(user_create_data=user_create_data)
         return UserPublic.model_validate(user)
 
-    def authenticate_user(self, user_login_data: LoginSchema) -> User:
+    async def authenticate_user(self, user_login_data: LoginSchema) -> User:
         """
         Authenticate a user based on login credentials.
 
@@ -63,14 +63,14 @@ class UserService:
         Returns:
         - User: The authenticated user object if credentials are valid, otherwise None.
         """
-        user = self.crud.get_user_by_email(email=user_login_data.email)
+        user = await self.crud.get_user_by_email(email=user_login_data.email)
         if not user:
             return None
         if not verify_password(user_login_data.password, user.password_hash):
             return None
         return user
 
-    def login(self, user_login_data: LoginSchema) -> TokenSchema:
+    async def login(self, user_login_data: LoginSchema) -> TokenSchema:
         """
         Handle user login and generate an access token.
 
@@ -85,7 +85,7 @@ class UserService:
         Raises:
         - HTTPException: 401 Unauthorized if authentication fails.
         """
-        user = self.authenticate_user(user_login_data=user_login_data)
+        user = await self.authenticate_user(user_login_data=user_login_data)
         if not user:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
@@ -95,7 +95,7 @@ class UserService:
         access_token = create_token(data=access_token_payload)
         return TokenSchema(token=access_token, token_type="Bearer")
 
-    def get_user_by_id(self, id: int) -> User:
+    async def get_user_by_id(self, id: int) -> User:
         """
         Retrieve a user by their ID.
 
@@ -110,7 +110,7 @@ class UserService:
         Raises:
         - HTTPException: 404 Not Found if no user exists with the given ID.
         """
-        user = self.crud.get_user(user_id=id)
+        user = await self.crud.get_user(user_id=id)
         if not user:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
@@ -118,7 +118,9 @@ class UserService:
             )
         return user
 
-    def update_user(self, id: int, update_user_data: UpdateUserSchema) -> UserPublic:
+    async def update_user(
+        self, id: int, update_user_data: UpdateUserSchema
+    ) -> UserPublic:
         """
         Update an existing user's information.
 
@@ -135,20 +137,20 @@ class UserService:
         Raises:
         - HTTPException: 404 Not Found if no user exists with the given ID.
         """
-        user = self.crud.get_user(user_id=id)
+        user = await self.crud.get_user(user_id=id)
         if not user:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND, detail="User not found"
             )
         for field, value in update_user_data.model_dump(exclude_unset=True).items():
             setattr(user, field, value)
-        self.db.commit()
-        self.db.refresh(user)
+        await self.db.commit()
+        user = await self.crud.get_user(user_id=id)
         return UserPublic.model_validate(
             user
         )  # Note: Added model_validate for consistency with return type
 
-    def delete_user(self, id: int):
+    async def delete_user(self, id: int):
         """
         Delete a user by their ID.
 
@@ -160,11 +162,11 @@ class UserService:
         Raises:
         - HTTPException: 404 Not Found if no user exists with the given ID.
         """
-        user = self.crud.get_user(user_id=id)
+        user = await self.crud.get_user(user_id=id)
         if not user:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND, detail="User not found"
             )
-        self.db.delete(user)
-        self.db.commit()
+        await self.db.delete(user)
+        await self.db.commit()
         return
@@ -1,4 +1,4 @@
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from fastapi import HTTPException, status
 from typing import List
 
@@ -16,25 +16,25 @@ from app.schema.wishlist_schema import (
 class WishlistService:
     """Service layer for wishlist operations"""
 
-    def __init__(self, db: Session):
+    def __init__(self, db: AsyncSession):
         self.db = db
         self.wishlist_crud = WishlistCrud(db=db)
         self.product_crud = ProductCrud(db=db)
         self.cart_crud = CartCrud(db=db)
 
-    def add_product_to_wishlist(
+    async def add_product_to_wishlist(
         self, user_id: int, product_id: int
     ) -> WishlistActionResponse:
         """Add a product to user's wishlist"""
         # Check if product exists
-        product = self.product_crud.get_product_by_id(product_id=product_id)
+        product = await self.product_crud.get_product_by_id(id=product_id)
         if not product:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND, detail="Product not found"
             )
 
         # Add to wishlist
-        wishlist_item = self.wishlist_crud.add_to_wishlist(
+        wishlist_item = await self.wishlist_crud.add_to_wishlist(
             user_id=user_id, product_id=product_id
         )
 
@@ -48,11 +48,11 @@ class WishlistService:
             message="Product added to wishlist successfully", product_id=product_id
         )
 
-    def remove_product_from_wishlist(
+    async def remove_product_from_wishlist(
         self, user_id: int, product_id: int
     ) -> WishlistActionResponse:
         """Remove a product from user's wishlist"""
-        removed = self.wishlist_crud.remove_from_wishlist(
+        removed = await self.wishlist_crud.remove_from_wishlist(
             user_id=user_id, product_id=product_id
         )
 
@@ -66,9 +66,9 @@ class WishlistService:
             message="Product removed from wishlist successfully", product_id=product_id
         )
 
-    def get_wishlist(self, user_id: int) -> WishlistResponse:
+    async def get_wishlist(self, user_id: int) -> WishlistResponse:
         """Get user's wishlist with product details"""
-        wishlist_items = self.wishlist_crud.get_user_wishlist(user_id=user_id)
+        wishlist_items = await self.wishlist_crud.get_user_wishlist(user_id=user_id)
 
         items_response = []
         for item in wishlist_items:
@@ -88,22 +88,24 @@ class WishlistService:
 
         return WishlistResponse(items=items_response, total_count=len(items_response))
 
-    def get_wishlist_count(self, user_id: int) -> WishlistStatsResponse:
+    async def get_wishlist_count(self, user_id: int) -> WishlistStatsResponse:
         """Get count of items in user's wishlist"""
-        count = self.wishlist_crud.get_wishlist_count(user_id=user_id)
+        count = await self.wishlist_crud.get_wishlist_count(user_id=user_id)
         return WishlistStatsResponse(count=count)
 
-    def clear_wishlist(self, user_id: int) -> WishlistActionResponse:
+    async def clear_wishlist(self, user_id: int) -> WishlistActionResponse:
         """Clear all items from user's wishlist"""
-        count = self.wishlist_crud.clear_wishlist(user_id=user_id)
+        count = await self.wishlist_crud.clear_wishlist(user_id=user_id)
         return WishlistActionResponse(
             message=f"Wishlist cleared successfully. {count} item(s) removed."
         )
 
-    def move_to_cart(self, user_id: int, product_id: int) -> WishlistActionResponse:
+    async def move_to_cart(
+        self, user_id: int, product_id: int
+    ) -> WishlistActionResponse:
         """Move a wishlist item to shopping cart"""
         # Check if product is in wishlist
-        wishlist_item = self.wishlist_crud.get_wishlist_item(
+        wishlist_item = await self.wishlist_crud.get_wishlist_item(
             user_id=user_id, product_id=product_id
         )
         if not wishlist_item:
@@ -113,7 +115,7 @@ class WishlistService:
             )
 
         # Check if product exists and is active
-        product = self.product_crud.get_product_by_id(product_id=product_id)
+        product = await self.product_crud.get_product_by_id(id=product_id)
         if not product:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND, detail="Product not found"
@@ -133,7 +135,7 @@ class WishlistService:
 
         # Add to cart
         try:
-            self.cart_crud.add_item_to_cart(
+            await self.cart_crud.add_item_to_cart(
                 user_id=user_id, product_id=product_id, quantity=1
             )
         except Exception as e:
@@ -143,12 +145,16 @@ class WishlistService:
             )
 
         # Remove from wishlist
-        self.wishlist_crud.remove_from_wishlist(user_id=user_id, product_id=product_id)
+        await self.wishlist_crud.remove_from_wishlist(
+            user_id=user_id, product_id=product_id
+        )
 
         return WishlistActionResponse(
             message="Product moved to cart successfully", product_id=product_id
         )
 
-    def is_in_wishlist(self, user_id: int, product_id: int) -> bool:
+    async def is_in_wishlist(self, user_id: int, product_id: int) -> bool:
         """Check if a product is in user's wishlist"""
-        return self.wishlist_crud.is_in_wishlist(user_id=user_id, product_id=product_id)
+        return await self.wishlist_crud.is_in_wishlist(
+            user_id=user_id, product_id=product_id
+        )
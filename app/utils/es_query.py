@@ -0,0 +1,334 @@
+"""
+Query templates for the typed product search (GET /elastic/search).
+
+A search's shape, i.e. which filters are set, the sort, highlighting and
+paging, selects a template that is compiled once and cached; each request
+only renders its values into a copy. Clients never send query DSL, so every
+query the cluster sees comes from this small, reviewed set of shapes:
+
+- full text in ``must`` (scored); active products only, category, price
+  and stock in ``filter`` (unscored and cached by Elasticsearch per
+  segment);
+- a sort with ``id`` as tiebreaker, so ``search_after`` positions are total
+  with or without a point-in-time;
+- only the fields the response needs in ``_source``; highlighting opt-in;
+- facets (category terms, price ranges, in-stock count) as aggregations of
+  the same request, so a results page needs a single round trip.
+
+build_listing_body serves GET /product?search=: the same clauses, but it
+returns only ids, which the caller hydrates from the product cache.
+build_autocomplete_body serves GET /product/autocomplete from the
+search-as-you-type name subfield.
+"""
+
+from functools import lru_cache
+from typing import Any, NamedTuple
+
+from app.schema.search_schema import (
+    FacetBucket,
+    PriceRangeBucket,
+    ProductFacets,
+    ProductSearchQuery,
+    SearchSort,
+)
+from app.utils.popularity import sale_weight
+
+SEARCH_TIMEOUT = "2s"
+SOURCE_FIELDS = ["id", "name", "description", "category", "price", "in_stock"]
+
+SORTS = {
+    SearchSort.RELEVANCE: [{"_score": "desc"}, {"id": "asc"}],
+    SearchSort.PRICE_ASC: [{"price": "asc"}, {"id": "asc"}],
+    SearchSort.PRICE_DESC: [{"price": "desc"}, {"id": "asc"}],
+    SearchSort.NAME: [{"name.keyword": "asc"}, {"id": "asc"}],
+}
+
+HIGHLIGHT = {
+    "pre_tags": ["<em>"],
+    "post_tags": ["</em>"],
+    "fields": {"name": {}, "description": {}},
+}
+
+
+# GET /product sort fields the index can sort on; relevance needs a query
+LISTING_SORT_FIELDS = {"id": "id", "price": "price", "name": "name.keyword"}
+# index.max_result_window: from + size may not go past it
+MAX_RESULT_WINDOW = 10_000
+
+# Price facet buckets as [from, to) pairs; None leaves a side open
+PRICE_RANGES = [(None, 25), (25, 50), (50, 100), (100, 250), (250, 500), (500, None)]
+CATEGORY_FACET_SIZE = 50
+
+
+def price_range_key(low: float | None, high: float | None) -> str:
+    return f"{'*' if low is None else low}-{'*' if high is None else high}"
+
+
+FACET_AGGS = {
+    "categories": {"terms": {"field": "category", "size": CATEGORY_FACET_SIZE}},
+    "price_ranges": {
+        "range": {
+            "field": "price",
+            "ranges": [
+                {
+                    "key": price_range_key(low, high),
+                    **({} if low is None else {"from": low}),
+                    **({} if high is None else {"to": high}),
+                }
+                for low, high in PRICE_RANGES
+            ],
+        }
+    },
+    "in_stock": {"filter": {"term": {"in_stock": True}}},
+}
+
+
+class Param(str):
+    """Placeholder in a compiled template, replaced by render."""
+
+
+class QueryShape(NamedTuple):
+    text: bool
+    category: bool
+    min_price: bool
+    max_price: bool
+    in_stock: bool
+    sort: SearchSort
+    highlight: bool
+    paged: bool
+    pit: bool
+    facets: bool
+
+
+def text_match(text: str) -> dict:
+    """Scored full-text clause; every term must match name or description."""
+    return {
+        "multi_match": {
+            "query": text,
+            "fields": ["name^3", "name.english^2", "description"],
+            "type": "best_fields",
+            "operator": "and",
+        }
+    }
+
+
+def query_shape(
+    query: ProductSearchQuery, paged: bool, pit: bool = False, facets: bool = False
+) -> QueryShape:
+    return QueryShape(
+        text=query.text is not None,
+        category=query.category is not None,
+        min_price=query.min_price is not None,
+        max_price=query.max_price is not None,
+        in_stock=query.in_stock is not None,
+        sort=query.sort,
+        highlight=query.highlight,
+        paged=paged,
+        pit=pit,
+        facets=facets,
+    )
+
+
+@lru_cache(maxsize=256)
+def compile_template(shape: QueryShape) -> dict:
+    """The search body for ``shape`` with Param placeholders; do not mutate."""
+    bool_query: dict = {}
+    if shape.text:
+        bool_query["must"] = [text_match(Param("text"))]
+    # The index holds inactive products too
+    filters: list = [{"term": {"is_active": True}}]
+    if shape.category:
+        filters.append({"term": {"category": Param("category")}})
+    if shape.min_price or shape.max_price:
+        price = {}
+        if shape.min_price:
+            price["gte"] = Param("min_price")
+        if shape.max_price:
+            price["lte"] = Param("max_price")
+        filters.append({"range": {"price": price}})
+    if shape.in_stock:
+        filters.append({"term": {"in_stock": Param("in_stock")}})
+    bool_query["filter"] = filters
+
+    body = {
+        "query": {"bool": bool_query},
+        "sort": SORTS[shape.sort],
+        "size": Param("size"),
+        "_source": SOURCE_FIELDS,
+        "timeout": SEARCH_TIMEOUT,
+    }
+    if shape.highlight:
+        body["highlight"] = HIGHLIGHT
+    if shape.paged:
+        body["search_after"] = Param("search_after")
+    if shape.pit:
+        body["pit"] = {"id": Param("pit_id"), "keep_alive": Param("keep_alive")}
+    if shape.facets:
+        body["aggs"] = FACET_AGGS
+    return body
+
+
+def render(node: Any, params: dict) -> Any:
+    """Copy of a compiled template with its placeholders filled in."""
+    if isinstance(node, Param):
+        return params[node]
+    if isinstance(node, dict):
+        return {key: render(value, params) for key, value in node.items()}
+    if isinstance(node, list):
+        return [render(value, params) for value in node]
+    return node
+
+
+def build_search_body(
+    query: ProductSearchQuery, page: dict | None = None, facets: bool = False
+) -> dict:
+    """
+    Search body for ``query``. ``page`` may hold ``search_after`` (continue
+    after a cursor's last hit) and ``pit_id`` and ``keep_alive`` (search a
+    point-in-time); ``facets`` adds the facet aggregations.
+    """
+    page = page or {}
+    params = dict(query.model_dump(), **page)
+    shape = query_shape(
+        query,
+        paged="search_after" in page,
+        pit=page.get("pit_id") is not None,
+        facets=facets,
+    )
+    return render(compile_template(shape), params)
+
+
+def build_facets_body(query: ProductSearchQuery) -> dict:
+    """
+    Aggregations only: no hits, so Elasticsearch serves repeats from its
+    shard request cache until the index next refreshes.
+    """
+    shape = query_shape(query, paged=False, pit=False, facets=True)._replace(
+        sort=SearchSort.RELEVANCE, highlight=False
+    )
+    params = dict(query.model_dump(), size=0)
+    return render(compile_template(shape), params)
+
+
+def parse_facets(aggregations: dict) -> ProductFacets:
+    return ProductFacets(
+        categories=[
+            FacetBucket(key=bucket["key"], count=bucket["doc_count"])
+            for bucket in aggregations["categories"]["buckets"]
+        ],
+        price_ranges=[
+            PriceRangeBucket(
+                key=bucket["key"],
+                min=bucket.get("from"),
+                max=bucket.get("to"),
+                count=bucket["doc_count"],
+            )
+            for bucket in aggregations["price_ranges"]["buckets"]
+        ],
+        in_stock=aggregations["in_stock"]["doc_count"],
+    )
+
+
+def build_listing_body(
+    text: str,
+    category_id: int | None,
+    min_price: float | None,
+    max_price: float | None,
+    availability: str,
+    sort_by: str,
+    sort_order: str,
+    offset: int,
+    size: int,
+    track_total_hits: bool,
+) -> dict:
+    """
+    One page of active product ids for a GET /product search, filtered and
+    ordered like the SQL listing (id breaks ties in the sort direction).
+    """
+    filters: list = [{"term": {"is_active": True}}]
+    if category_id is not None:
+        filters.append({"term": {"category_id": category_id}})
+    if min_price is not None or max_price is not None:
+        price = {}
+        if min_price is not None:
+            price["gte"] = min_price
+        if max_price is not None:
+            price["lte"] = max_price
+        filters.append({"range": {"price": price}})
+    if availability in ("in_stock", "out_of_stock"):
+        filters.append({"term": {"in_stock": availability == "in_stock"}})
+
+    if sort_by == "relevance":
+        sort = SORTS[SearchSort.RELEVANCE]
+    else:
+        sort = [{LISTING_SORT_FIELDS[sort_by]: sort_order}, {"id": sort_order}]
+    return {
+        "query": {
+            "bool": {
+                "must": [text_match(text)],
+                "filter": filters,
+            }
+        },
+        "sort": sort,
+        "from": offset,
+        "size": size,
+        "_source": False,
+        "track_total_hits": track_total_hits,
+        "timeout": SEARCH_TIMEOUT,
+    }
+
+
+AUTOCOMPLETE_FIELDS = [
+    "name.autocomplete",
+    "name.autocomplete._2gram",
+    "name.autocomplete._3gram",
+]
+AUTOCOMPLETE_POPULARITY_SCRIPT = (
+    "doc['popularity'].size() == 0 ? 0"
+    " : Math.log1p(doc['popularity'].value * params.scale)"
+)
+
+
+def build_autocomplete_body(text: str, size: int) -> dict:
+    """
+    Distinct names of active products whose words start with the words of
+    ``text`` (the last one as a prefix), best sellers first among similar
+    matches: popularity is added to the text score on a log scale, so it
+    reorders close matches without burying better ones. Stored popularity is
+    forward-decayed (app.utils.popularity), so it is scaled back to today's
+    decayed value first; Painless computes in doubles, where a
+    ``field_value_factor`` factor would underflow as a float.
+    """
+    return {
+        "query": {
+            "function_score": {
+                "query": {
+                    "bool": {
+                        "must": [
+                            {
+                                "multi_match": {
+                                    "query": text,
+                                    "type": "bool_prefix",
+                                    "fields": AUTOCOMPLETE_FIELDS,
+                                    "operator": "and",
+                                }
+                            }
+                        ],
+                        "filter": [{"term": {"is_active": True}}],
+                    }
+                },
+                "script_score": {
+                    "script": {
+                        "source": AUTOCOMPLETE_POPULARITY_SCRIPT,
+                        "params": {"scale": 1 / sale_weight()},
+                    }
+                },
+                "boost_mode": "sum",
+            }
+        },
+        # One suggestion per name, however many products share it
+        "collapse": {"field": "name.keyword"},
+        "size": size,
+        "_source": ["name"],
+        "timeout": SEARCH_TIMEOUT,
+    }
@@ -1,85 +1,307 @@
+import asyncio
+import hashlib
+import json
+import math
+import time
 from decimal import Decimal
+from typing import AsyncIterator, List, NamedTuple, Optional, Tuple
 
-from elasticsearch import AsyncElasticsearch, helpers
-from sqlalchemy import select
-from sqlalchemy.orm import selectinload
+from elasticsearch import AsyncElasticsearch, NotFoundError, helpers
+from sqlalchemy import Select, func, select
 
+from app.core.config import settings
 from app.core.logger import logger
-from app.db.database import SessionLocal
+from app.db.database import AsyncSessionLocal
+from app.models.category import Category
 from app.models.product import Product
 
+# Searches go through the alias; each build is a new physical index
+# "products-<mapping checksum>-<timestamp>" that the alias is swapped to
+PRODUCTS_ALIAS = "products"
 
-async def create_product_index(es: AsyncElasticsearch):
-    """create product index"""
-    mapping = {
-        "mappings": {
-            "properties": {
-                "id": {"type": "keyword"},
-                "name": {
-                    "type": "text",
-                    "fields": {
-                        "keyword": {"type": "keyword"},
-                        "english": {"type": "text", "analyzer": "english"},
-                    },
-                },
-                "description": {"type": "text"},
-                "category": {"type": "keyword"},
-                "price": {"type": "float"},
-                "in_stock": {"type": "boolean"},
-                "suggest": {
-                    "type": "completion",
-                    "contexts": [{"name": "category", "type": "category"}],
-                },
-            }
+PROGRESS_LOG_EVERY = 10_000
+
+# While an index is being built nobody searches it: skip refreshes and
+# replica writes, then restore both before it goes live (finish_index)
+BUILD_SETTINGS = {"number_of_replicas": 0, "refresh_interval": "-1"}
+
+# Autocomplete matches accent- and case-insensitively ("cafe" finds "Café")
+PRODUCT_ANALYSIS = {
+    "analyzer": {
+        "autocomplete": {
+            "type": "custom",
+            "tokenizer": "standard",
+            "filter": ["lowercase", "asciifolding"],
         }
     }
+}
 
-    if await es.indices.exists(index="products"):
-        await es.indices.delete(index="products")
-        print("Deleted old 'products' index")
-
-    await es.indices.create(index="products", body=mapping)
-    print("Created fresh 'products' index")
-
-
-def get_all_products():
-    with SessionLocal() as db:
-        stmt = select(Product).options(selectinload(Product.category))
-        return db.scalars(stmt).all()
-
-
-async def bulk_index_products(es: AsyncElasticsearch):
-    """populate elastic index from existing products"""
-    products = get_all_products()
-    print(products[0])
-
-    actions = []
-
-    for p in products:
-        actions.append(
-            {
-                "_index": "products",
-                "_id": p.id,
-                "_source": {
-                    "id": p.id,
-                    "name": p.name,
-                    "description": p.description,
-                    "category": p.category.name if p.category else None,
-                    "price": (
-                        float(p.price) if isinstance(p.price, Decimal) else p.price
-                    ),
-                    "in_stock": p.in_stock,
-                    "suggest": {
-                        "input": [p.name],
-                        "contexts": {
-                            "category": (
-                                [p.category.name] if p.category else ["General"]
-                            )
-                            + ["all"]
-                        },
-                    },
+PRODUCT_MAPPINGS = {
+    "properties": {
+        "id": {"type": "long"},
+        "name": {
+            "type": "text",
+            "fields": {
+                "keyword": {"type": "keyword"},
+                "english": {"type": "text", "analyzer": "english"},
+                # Indexes edge n-grams of each term (the _index_prefix
+                # subfield) and 2/3-word shingles, so a prefix query is a
+                # term lookup instead of a prefix scan
+                "autocomplete": {
+                    "type": "search_as_you_type",
+                    "analyzer": "autocomplete",
                 },
-            }
+            },
+        },
+        "description": {"type": "text"},
+        "category": {"type": "keyword"},
+        "category_id": {"type": "integer"},
+        "price": {"type": "float"},
+        "in_stock": {"type": "boolean"},
+        "is_active": {"type": "boolean"},
+        # Forward-decayed scores outgrow a float within a few years
+        "popularity": {"type": "double"},
+        "suggest": {
+            "type": "completion",
+            "contexts": [{"name": "category", "type": "category"}],
+        },
+    }
+}
+
+
+def mapping_checksum() -> str:
+    """Short hash of the mapping; indices built from another mapping differ."""
+    definition = {"mappings": PRODUCT_MAPPINGS, "analysis": PRODUCT_ANALYSIS}
+    encoded = json.dumps(definition, sort_keys=True).encode()
+    return hashlib.sha256(encoded).hexdigest()[:12]
+
+
+def new_index_name() -> str:
+    return f"{PRODUCTS_ALIAS}-{mapping_checksum()}-{time.strftime('%Y%m%d%H%M%S')}"
+
+
+async def create_product_index(es: AsyncElasticsearch, index: str) -> None:
+    """Create the physical index ``index``, recording the mapping checksum."""
+    mappings = dict(PRODUCT_MAPPINGS, _meta={"mapping_checksum": mapping_checksum()})
+    await es.indices.create(
+        index=index,
+        mappings=mappings,
+        settings=dict(BUILD_SETTINGS, analysis=PRODUCT_ANALYSIS),
+    )
+    logger.info(f"Created Elasticsearch index {index}")
+
+
+async def finish_index(es: AsyncElasticsearch, index: str) -> None:
+    """Restore live settings on a built index and make its documents visible."""
+    await es.indices.put_settings(
+        index=index,
+        settings={
+            # None resets the refresh interval to the cluster default
+            "refresh_interval": None,
+            "number_of_replicas": settings.ES_INDEX_REPLICAS,
+        },
+    )
+    await es.indices.refresh(index=index)
+
+
+async def aliased_index(es: AsyncElasticsearch) -> Optional[str]:
+    """The physical index behind the products alias, if there is one."""
+    try:
+        aliases = await es.indices.get_alias(name=PRODUCTS_ALIAS)
+    except NotFoundError:
+        return None
+    return next(iter(aliases), None)
+
+
+async def index_checksum(es: AsyncElasticsearch, index: str) -> Optional[str]:
+    mappings = await es.indices.get_mapping(index=index)
+    return mappings[index]["mappings"].get("_meta", {}).get("mapping_checksum")
+
+
+async def swap_alias(es: AsyncElasticsearch, index: str) -> None:
+    """
+    Point the products alias at ``index`` in one atomic update_aliases call,
+    so searches see either the old index or the new one, never neither.
+
+    A concrete index named like the alias (from before indices were
+    versioned) is deleted in the same call.
+    """
+    actions: List[dict] = [{"add": {"index": index, "alias": PRODUCTS_ALIAS}}]
+    current = await aliased_index(es)
+    if current is not None:
+        actions.insert(0, {"remove": {"index": current, "alias": PRODUCTS_ALIAS}})
+    elif await es.indices.exists(index=PRODUCTS_ALIAS):
+        actions.insert(0, {"remove_index": {"index": PRODUCTS_ALIAS}})
+    await es.indices.update_aliases(actions=actions)
+    logger.info(f"Alias {PRODUCTS_ALIAS} now points to {index}")
+
+
+async def write_indices(es: AsyncElasticsearch) -> List[str]:
+    """
+    Indices that live changes must reach: the aliased one, plus any newer
+    index still being built, which may already have read the old row.
+    """
+    indices = await es.indices.get_alias(index=f"{PRODUCTS_ALIAS}-*")
+    current = next(
+        (name for name, info in indices.items() if PRODUCTS_ALIAS in info["aliases"]),
+        None,
+    )
+    if current is None:
+        # Searches still read a concrete index from before versioning, if any
+        legacy = await es.indices.exists(index=PRODUCTS_ALIAS)
+        return list(indices) + ([PRODUCTS_ALIAS] if legacy else [])
+    built_at = {name: name.rsplit("-", 1)[-1] for name in indices}
+    return [name for name in indices if built_at[name] >= built_at[current]]
+
+
+async def delete_old_indices(es: AsyncElasticsearch, keep: int) -> List[str]:
+    """
+    Delete product indices the alias does not point to, except the ``keep``
+    newest (kept for a quick rollback by pointing the alias back).
+    """
+    current = await aliased_index(es)
+    indices = sorted(
+        (name for name in await es.indices.get(index=f"{PRODUCTS_ALIAS}-*")),
+        key=lambda name: name.rsplit("-", 1)[-1],
+        reverse=True,
+    )
+    stale = [name for name in indices if name != current][keep:]
+    for name in stale:
+        await es.indices.delete(index=name)
+        logger.info(f"Deleted old Elasticsearch index {name}")
+    return stale
+
+
+class IndexReport(NamedTuple):
+    indexed: int
+    failed: int
+
+
+def product_source(row) -> dict:
+    """Search document for a product row (see product_rows)."""
+    return {
+        "id": row.id,
+        "name": row.name,
+        "description": row.description,
+        "category": row.category,
+        "category_id": row.category_id,
+        "price": float(row.price) if isinstance(row.price, Decimal) else row.price,
+        "in_stock": row.in_stock,
+        "is_active": row.is_active,
+        "popularity": row.popularity,
+        "suggest": {
+            "input": [row.name],
+            "contexts": {"category": [row.category or "General", "all"]},
+        },
+    }
+
+
+def product_rows() -> Select:
+    """Columns of product documents; plain rows, no ORM objects to track."""
+    return select(
+        Product.id,
+        Product.name,
+        Product.description,
+        Product.price,
+        Product.in_stock.label("in_stock"),
+        Product.is_active,
+        Product.category_id,
+        Product.popularity,
+        Category.name.label("category"),
+    ).outerjoin(Product.category)
+
+
+def id_partitions(low: int, high: int, parts: int) -> List[Tuple[int, int]]:
+    """Split the id range [low, high] into at most ``parts`` contiguous spans."""
+    span = max(math.ceil((high - low + 1) / parts), 1)
+    return [
+        (start, min(start + span - 1, high)) for start in range(low, high + 1, span)
+    ]
+
+
+async def _read_partition(
+    index: str, low: int, high: int, batch_size: int
+) -> AsyncIterator[dict]:
+    # Keyset batches by id: each query is a short index range scan and only
+    # one batch of rows is held in memory at a time
+    after = low - 1
+    async with AsyncSessionLocal() as db:
+        while after < high:
+            stmt = (
+                product_rows()
+                .where(Product.id > after, Product.id <= high)
+                .order_by(Product.id)
+                .limit(batch_size)
+            )
+            rows = (await db.execute(stmt)).all()
+            if not rows:
+                return
+            for row in rows:
+                yield {"_index": index, "_id": row.id, "_source": product_source(row)}
+            after = rows[-1].id
+
+
+async def bulk_index_products(
+    es: AsyncElasticsearch,
+    index: str,
+    parallelism: int = settings.ES_BULK_PARALLELISM,
+    chunk_size: int = settings.ES_BULK_CHUNK_SIZE,
+) -> IndexReport:
+    """
+    Stream every product from the database into ``index``.
+
+    The id range is split into ``parallelism`` partitions, each read in
+    keyset batches and fed to its own async_streaming_bulk, so memory stays
+    bounded by the batches in flight whatever the catalog size. Progress is
+    logged every PROGRESS_LOG_EVERY documents; rejected documents are
+    counted and the first few logged rather than raised.
+    """
+    async with AsyncSessionLocal() as db:
+        low, high, total = (
+            await db.execute(
+                select(func.min(Product.id), func.max(Product.id), func.count())
+            )
+        ).one()
+    if not total:
+        return IndexReport(0, 0)
+
+    started = time.monotonic()
+    indexed = failed = 0
+    next_report = PROGRESS_LOG_EVERY
+
+    async def index_partition(partition_low: int, partition_high: int) -> None:
+        nonlocal indexed, failed, next_report
+        async for ok, item in helpers.async_streaming_bulk(
+            es,
+            _read_partition(index, partition_low, partition_high, chunk_size),
+            chunk_size=chunk_size,
+            max_chunk_bytes=settings.ES_BULK_MAX_CHUNK_BYTES,
+            raise_on_error=False,
+            max_retries=3,
+            initial_backoff=1,
+        ):
+            if ok:
+                indexed += 1
+            else:
+                failed += 1
+                if failed <= 5:
+                    logger.warning(f"Failed to index product: {item}")
+            if indexed + failed >= next_report:
+                next_report += PROGRESS_LOG_EVERY
+                elapsed = time.monotonic() - started
+                logger.info(
+                    f"Indexed {indexed + failed}/{total} products into {index} "
+                    f"({(indexed + failed) / elapsed:.0f}/s), {failed} failed"
+                )
+
+    await asyncio.gather(
+        *(
+            index_partition(partition_low, partition_high)
+            for partition_low, partition_high in id_partitions(low, high, parallelism)
         )
-    await helpers.async_bulk(es, actions=actions)
-    logger.info(f"Indexed {len(actions)} products into Elasticsearch!")
+    )
+    logger.info(
+        f"Indexed {indexed} products into {index} in "
+        f"{time.monotonic() - started:.1f}s, {failed} failed"
+    )
+    return IndexReport(indexed, failed)
@@ -1,5 +1,5 @@
 from slugify import slugify
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 from app.models.product import Product
 from app.models.category import Category
@@ -10,7 +10,7 @@ import uuid
 SlugContext = Literal["product", "category"]
 
 
-def generate_slug(db: Session, name: str, context: SlugContext) -> str:
+async def generate_slug(db: AsyncSession, name: str, context: SlugContext) -> str:
     """
     Generates a unique slug for a given name and context (model).
     """
@@ -24,7 +24,7 @@ def generate_slug(db: Session, name: str, context: SlugContext) -> str:
     base_slug = slugify(name, lowercase=True)
 
     stmt = select(Model.slug).where(Model.slug.like(f"{base_slug}%"))
-    existing_slugs: Set[str] = set(db.scalars(stmt).all())
+    existing_slugs: Set[str] = set((await db.scalars(stmt)).all())
 
     if base_slug not in existing_slugs:
         return base_slug
@@ -0,0 +1,199 @@
+"""
+Offset and keyset (cursor) pagination.
+
+OFFSET pagination makes the database walk and discard every row before the
+requested page, so deep pages get linearly slower. Keyset pagination instead
+remembers the sort value and id of the last row served and asks for rows
+strictly after it, which an index on the sort column answers directly.
+
+The position is handed to clients as an opaque, URL-safe cursor. It records
+the sort it was issued for, so a cursor cannot be replayed against a
+different ordering.
+"""
+
+import base64
+import datetime
+import decimal
+import json
+from typing import Any, Dict, Optional, Sequence, Tuple
+
+from fastapi import HTTPException, status
+from sqlalchemy import DateTime, Select, String, and_, or_, type_coerce
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.sql.elements import ColumnElement
+
+from app.db.counting import Count, count_cache_key, count_rows
+from app.schema.common_schema import CountMode
+
+
+def _encode_value(value: Any) -> Any:
+    if isinstance(value, (datetime.datetime, datetime.date)):
+        return value.isoformat()
+    if isinstance(value, decimal.Decimal):
+        return str(value)
+    return value
+
+
+def _decode_value(value: Any, column: ColumnElement, as_text: bool) -> Any:
+    """
+    Turn a cursor's JSON value back into the Python type of ``column``.
+
+    Raises ValueError or TypeError for values no row of ``column`` could
+    hold. With ``as_text``, datetimes are validated but returned as the text
+    the cursor carries (see paginate_keyset).
+    """
+    if value is None:
+        raise ValueError("cursor has no sort value")
+    try:
+        python_type = column.type.python_type
+    except NotImplementedError:
+        python_type = None
+    if python_type in (datetime.datetime, datetime.date):
+        parsed = python_type.fromisoformat(value)
+        return value if as_text else parsed
+    if isinstance(value, bool) or not isinstance(value, (str, int, float)):
+        raise TypeError(f"unexpected sort value type {type(value).__name__}")
+    if python_type is decimal.Decimal:
+        number = decimal.Decimal(value)
+        if not number.is_finite():
+            raise ValueError("sort value is not a finite number")
+        return number
+    if python_type is int and not isinstance(value, int):
+        raise TypeError("sort value is not an integer")
+    if python_type is float and not isinstance(value, (int, float)):
+        raise TypeError("sort value is not a number")
+    if python_type is str and not isinstance(value, str):
+        raise TypeError("sort value is not a string")
+    return value
+
+
+def encode_cursor(sort_key: str, value: Any, row_id: int) -> str:
+    payload = json.dumps(
+        {"s": sort_key, "v": _encode_value(value), "id": row_id},
+        separators=(",", ":"),
+    )
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(
+    cursor: str, sort_key: str, column: ColumnElement, as_text: bool = False
+) -> Tuple[Any, int]:
+    """
+    Return the ``(sort value, id)`` stored in ``cursor``, the value typed
+    like ``column``.
+
+    Raises a 400 if the cursor is malformed, was issued for another sort or
+    holds a value ``column`` cannot.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        if payload["s"] != sort_key:
+            raise ValueError("cursor was issued for a different sort order")
+        row_id = payload["id"]
+        if isinstance(row_id, bool) or not isinstance(row_id, int):
+            raise TypeError("cursor id is not an integer")
+        return _decode_value(payload["v"], column, as_text), row_id
+    except (ValueError, KeyError, TypeError, decimal.InvalidOperation) as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Invalid pagination cursor: {e}",
+        )
+
+
+async def paginate_keyset(
+    session: AsyncSession,
+    stmt: Select,
+    sort_column: ColumnElement,
+    id_column: ColumnElement,
+    sort_key: str,
+    descending: bool,
+    limit: int,
+    cursor: Optional[str] = None,
+) -> Tuple[Sequence[Any], Optional[str]]:
+    """
+    Fetch one keyset page of ``stmt``.
+
+    ``stmt`` must select a single entity and carry no ORDER BY; rows are
+    ordered by ``(sort_column, id_column)`` in the requested direction so
+    ties on the sort value are broken deterministically. ``sort_column``
+    must not be NULL (wrap nullable columns in ``coalesce``).
+
+    Returns the page and the cursor for the next one (None on the last page).
+    """
+    # SQLite keeps datetimes as text, and CURRENT_TIMESTAMP defaults lack
+    # the microseconds a bound datetime is rendered with. Comparing the
+    # stored text keeps rows that share a timestamp from being skipped.
+    as_text = session.bind.dialect.name == "sqlite" and isinstance(
+        sort_column.type, DateTime
+    )
+
+    if cursor:
+        value, last_id = decode_cursor(cursor, sort_key, sort_column, as_text)
+    if as_text:
+        sort_column = type_coerce(sort_column, String)
+
+    if cursor:
+        if descending:
+            after = or_(
+                sort_column < value, and_(sort_column == value, id_column < last_id)
+            )
+        else:
+            after = or_(
+                sort_column > value, and_(sort_column == value, id_column > last_id)
+            )
+        stmt = stmt.where(after)
+
+    if descending:
+        stmt = stmt.order_by(sort_column.desc(), id_column.desc())
+    else:
+        stmt = stmt.order_by(sort_column.asc(), id_column.asc())
+
+    # One extra row tells us whether there is a next page without a count
+    rows = (
+        await session.execute(
+            stmt.add_columns(
+                sort_column.label("keyset_value"), id_column.label("keyset_id")
+            ).limit(limit + 1)
+        )
+    ).all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        _, last_value, last_row_id = rows[-1]
+        next_cursor = encode_cursor(sort_key, last_value, last_row_id)
+
+    return [row[0] for row in rows], next_cursor
+
+
+async def paginate_offset(
+    session: AsyncSession,
+    stmt: Select,
+    page: int,
+    per_page: int,
+    count_mode: CountMode,
+    cache_namespace: str,
+    filters: Dict[str, Any],
+) -> Tuple[Sequence[Any], Count]:
+    """
+    Fetch one OFFSET page of ``stmt`` (already ordered) and its total.
+
+    ``filters`` are the user-supplied filters applied to ``stmt``; they key
+    the cached count and decide whether a planner estimate is acceptable.
+    In has_more mode the count is skipped and one extra row is fetched.
+    """
+    offset = (page - 1) * per_page
+    if count_mode == CountMode.HAS_MORE:
+        items = (await session.scalars(stmt.offset(offset).limit(per_page + 1))).all()
+        return items[:per_page], Count(None, count_mode, len(items) > per_page)
+
+    total, count_mode = await count_rows(
+        session,
+        stmt,
+        count_mode,
+        cache_key=count_cache_key(cache_namespace, filters),
+        filtered=any(value not in (None, "all") for value in filters.values()),
+    )
+    items = (await session.scalars(stmt.offset(offset).limit(per_page))).all()
+    return items, Count(total, count_mode, offset + len(items) < total)
@@ -0,0 +1,34 @@
+"""
+Forward-decayed popularity scores.
+
+A sale at time t adds ``quantity * 2 ** ((t - EPOCH) / half-life)`` to the
+product's popularity, so every stored score is its time-decayed sales total
+scaled by the same factor, ``sale_weight(now)``. Scores therefore rank as
+the decayed totals do without ever being rewritten; divide by
+``sale_weight()`` where the decayed value itself is needed.
+
+The weights double every POPULARITY_HALF_LIFE_DAYS and a float overflows
+after 1024 half-lives (about 39 years at 14 days). Stored scores are only
+meaningful for one EPOCH and half-life: after changing either, run
+``python -m app.cli recompute-popularity`` and reindex search.
+"""
+
+import datetime
+from typing import Optional
+
+from app.core.config import settings
+
+EPOCH = datetime.datetime(2026, 1, 1, tzinfo=datetime.timezone.utc)
+
+
+def sale_weight(
+    when: Optional[datetime.datetime] = None,
+    half_life_days: float = settings.POPULARITY_HALF_LIFE_DAYS,
+) -> float:
+    """Popularity added per unit sold at ``when`` (now by default, naive is UTC)."""
+    if when is None:
+        when = datetime.datetime.now(datetime.timezone.utc)
+    elif when.tzinfo is None:
+        when = when.replace(tzinfo=datetime.timezone.utc)
+    elapsed_days = (when - EPOCH).total_seconds() / 86400
+    return 2.0 ** (elapsed_days / half_life_days)
@@ -0,0 +1,189 @@
+"""
+Prefix trie answering top-k completions in time proportional to the query.
+
+Every node keeps its ``k`` best names (highest score, then name), so a
+lookup walks the query's characters and returns that node's list, however
+many names match. Names are indexed under each of their word starts,
+case- and accent-folded: "Café Lamp" is found by "caf", "café l" and "lam".
+
+Nodes are created down to ``max_depth`` characters; the node at that depth
+keeps the full keys passing through it, and longer queries filter those.
+
+Updates only touch the paths of the updated name's keys: a new or higher
+score is merged into each node's list; a removal or lower score recomputes
+the lists bottom-up from each node's own names and its children's lists.
+"""
+
+import bisect
+import heapq
+import unicodedata
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+DEFAULT_TOP_K = 10
+DEFAULT_MAX_DEPTH = 20
+# Longest query worth matching; keys are cut to this length
+MAX_KEY_LENGTH = 100
+
+
+def normalize(text: str) -> str:
+    """Case- and accent-folded ``text`` with single spaces between words."""
+    decomposed = unicodedata.normalize("NFKD", text.casefold())
+    folded = "".join(c for c in decomposed if not unicodedata.combining(c))
+    return " ".join(folded.split())
+
+
+def index_keys(name: str) -> Set[str]:
+    """The keys ``name`` is found under: its text from each word on."""
+    words = normalize(name).split(" ")
+    return {" ".join(words[i:])[:MAX_KEY_LENGTH] for i in range(len(words))} - {""}
+
+
+class _Node:
+    __slots__ = ("children", "ends", "top")
+
+    def __init__(self) -> None:
+        self.children: Dict[str, "_Node"] = {}
+        # Full keys ending here (or passing through, at max_depth) -> names
+        self.ends: Optional[Dict[str, Set[str]]] = None
+        self.top: List[str] = []
+
+
+class PrefixTrie:
+    def __init__(self, k: int = DEFAULT_TOP_K, max_depth: int = DEFAULT_MAX_DEPTH):
+        self.k = k
+        self.max_depth = max_depth
+        self.root = _Node()
+        self.scores: Dict[str, float] = {}
+
+    @classmethod
+    def build(
+        cls,
+        names: Iterable[Tuple[str, float]],
+        k: int = DEFAULT_TOP_K,
+        max_depth: int = DEFAULT_MAX_DEPTH,
+    ) -> "PrefixTrie":
+        """A trie of ``(name, score)`` pairs, ranking every node only once."""
+        trie = cls(k, max_depth)
+        for name, score in names:
+            if name not in trie.scores:
+                trie.scores[name] = score
+                for key in index_keys(name):
+                    trie._insert_key(key, name)
+            else:
+                trie.scores[name] = max(trie.scores[name], score)
+        trie._rank_subtree(trie.root)
+        return trie
+
+    def __len__(self) -> int:
+        return len(self.scores)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.scores
+
+    def complete(self, query: str, k: Optional[int] = None) -> List[str]:
+        """The best names having a word sequence starting with ``query``."""
+        k = self.k if k is None else min(k, self.k)
+        key = normalize(query)[:MAX_KEY_LENGTH]
+        node = self.root
+        for char in key[: self.max_depth]:
+            node = node.children.get(char)
+            if node is None:
+                return []
+        if len(key) <= self.max_depth:
+            return node.top[:k]
+        matches = {
+            name
+            for tail, names in (node.ends or {}).items()
+            if tail.startswith(key)
+            for name in names
+        }
+        return heapq.nsmallest(k, matches, key=self._rank)
+
+    def set(self, name: str, score: float) -> None:
+        """Add ``name`` or change its score."""
+        previous = self.scores.get(name)
+        self.scores[name] = score
+        if previous is None:
+            for key in index_keys(name):
+                for node in self._insert_key(key, name):
+                    self._offer(node, name)
+        elif score >= previous:
+            for key in index_keys(name):
+                for node in self._path(key):
+                    self._offer(node, name)
+        else:
+            self._rerank([self._path(key) for key in index_keys(name)])
+
+    def remove(self, name: str) -> None:
+        if self.scores.pop(name, None) is None:
+            return
+        paths = []
+        for key in index_keys(name):
+            path = self._path(key)
+            end = path[-1]
+            end.ends[key].discard(name)
+            if not end.ends[key]:
+                del end.ends[key]
+            # Drop the nodes left without names
+            depth = len(path) - 1
+            while depth > 0 and not path[depth].ends and not path[depth].children:
+                del path[depth - 1].children[key[depth - 1]]
+                depth -= 1
+            paths.append(path[: depth + 1])
+        self._rerank(paths)
+
+    def _rank(self, name: str) -> Tuple[float, str]:
+        return -self.scores[name], name
+
+    def _path(self, key: str) -> List[_Node]:
+        path = [self.root]
+        for char in key[: self.max_depth]:
+            path.append(path[-1].children[char])
+        return path
+
+    def _insert_key(self, key: str, name: str) -> List[_Node]:
+        path = [self.root]
+        for char in key[: self.max_depth]:
+            node = path[-1].children.get(char)
+            if node is None:
+                node = path[-1].children[char] = _Node()
+            path.append(node)
+        end = path[-1]
+        if end.ends is None:
+            end.ends = {}
+        end.ends.setdefault(key, set()).add(name)
+        return path
+
+    def _offer(self, node: _Node, name: str) -> None:
+        """Merge ``name``, new or with a higher score, into ``node.top``."""
+        if name in node.top:
+            node.top.remove(name)
+        elif len(node.top) >= self.k and self._rank(name) >= self._rank(node.top[-1]):
+            return
+        bisect.insort(node.top, name, key=self._rank)
+        del node.top[self.k :]
+
+    def _rank_node(self, node: _Node) -> None:
+        candidates = {name for names in (node.ends or {}).values() for name in names}
+        for child in node.children.values():
+            candidates.update(child.top)
+        node.top = heapq.nsmallest(self.k, candidates, key=self._rank)
+
+    def _rerank(self, paths: List[List[_Node]]) -> None:
+        """Recompute the lists on ``paths``, deepest nodes first."""
+        nodes = {
+            id(node): (depth, node) for path in paths for depth, node in enumerate(path)
+        }
+        for _, node in sorted(nodes.values(), key=lambda item: -item[0]):
+            self._rank_node(node)
+
+    def _rank_subtree(self, root: _Node) -> None:
+        # Iterative post-order: children are ranked before their parent
+        stack = [(root, False)]
+        while stack:
+            node, children_ranked = stack.pop()
+            if children_ranked:
+                self._rank_node(node)
+            else:
+                stack.append((node, True))
+                stack.extend((child, False) for child in node.children.values())
@@ -1,25 +1,51 @@
+import os
+import tempfile
+
 import pytest
 from fastapi.testclient import TestClient
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
-from sqlalchemy.pool import StaticPool
+from sqlalchemy.pool import NullPool
 from unittest.mock import AsyncMock, patch
 
+from app.core.config import settings
 from app.main import app
 from app.db.database import Base
 from app.dependencies import get_db
 
 
-# Create in-memory SQLite database for testing
-SQLALCHEMY_DATABASE_URL = "sqlite:///:memory:"
+# File-backed SQLite database shared by the sync test session and the async
+# session the app uses; an in-memory database cannot be shared across drivers.
+_db_fd, _db_path = tempfile.mkstemp(suffix=".db")
+os.close(_db_fd)
+SQLALCHEMY_DATABASE_URL = f"sqlite:///{_db_path}"
+ASYNC_SQLALCHEMY_DATABASE_URL = f"sqlite+aiosqlite:///{_db_path}"
 
 engine = create_engine(
     SQLALCHEMY_DATABASE_URL,
     connect_args={"check_same_thread": False},
-    poolclass=StaticPool,
 )
 TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# NullPool: TestClient runs each test on its own event loop, so aiosqlite
+# connections must not be reused between tests.
+async_engine = create_async_engine(ASYNC_SQLALCHEMY_DATABASE_URL, poolclass=NullPool)
+# Fail tests on suspected N+1 query patterns instead of only logging them
+settings.SQL_N_PLUS_ONE_STRICT = True
+# Startup warm-up would run against the app's own database, not the test one
+settings.CACHE_WARMUP_ON_STARTUP = False
+settings.ES_REINDEX_ON_STARTUP = False
+settings.ES_OUTBOX_WORKER_ENABLED = False
+settings.AUTOCOMPLETE_TRIE_ENABLED = False
+
+TestingAsyncSessionLocal = async_sessionmaker(
+    bind=async_engine,
+    class_=AsyncSession,
+    autoflush=False,
+    expire_on_commit=False,
+)
+
 
 @pytest.fixture(scope="function")
 def db_session():
@@ -36,11 +62,9 @@ def db_session():
 @pytest.fixture(scope="function")
 def client(db_session):
     """Create a TestClient with database dependency override and mocked Redis."""
-    def override_get_db():
-        try:
-            yield db_session
-        finally:
-            pass
+    async def override_get_db():
+        async with TestingAsyncSessionLocal() as session:
+            yield session
     
     app.dependency_overrides[get_db] = override_get_db
     
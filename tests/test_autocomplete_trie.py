@@ -0,0 +1,67 @@
+import asyncio
+from unittest.mock import AsyncMock, patch
+
+from app.core import autocomplete_index as index_module
+from app.core.autocomplete_index import AutocompleteIndex, ProductNames
+from app.utils.prefix_trie import PrefixTrie
+
+
+def test_trie_ranks_word_start_matches_by_score():
+    trie = PrefixTrie.build(
+        [("Desk Lamp", 5.0), ("Lamp Shade", 9.0), ("Café Lamp", 1.0), ("Clamp", 7.0)],
+        k=3,
+        max_depth=4,
+    )
+
+    assert trie.complete("lam") == ["Lamp Shade", "Desk Lamp", "Café Lamp"]
+    assert trie.complete("  CAFE l") == ["Café Lamp"]
+    # Past max_depth, the deepest node's keys are filtered
+    assert trie.complete("lamp sh") == ["Lamp Shade"]
+    assert trie.complete("amp") == []
+
+
+def test_trie_updates_only_touch_the_changed_name():
+    trie = PrefixTrie.build([("Lamp A", 3.0), ("Lamp B", 2.0), ("Lamp C", 1.0)], k=2)
+
+    trie.set("Lamp C", 4.0)
+    assert trie.complete("lamp") == ["Lamp C", "Lamp A"]
+    trie.set("Lamp C", 0.5)
+    assert trie.complete("lamp") == ["Lamp A", "Lamp B"]
+    trie.remove("Lamp A")
+    assert trie.complete("la") == ["Lamp B", "Lamp C"]
+    assert trie.complete("lamp a") == []
+    assert "Lamp A" not in trie and len(trie) == 2
+
+
+def test_product_names_rank_a_name_by_its_best_product():
+    names = ProductNames([(1, "Lamp", 1.0), (2, "Lamp", 8.0), (3, "Lantern", 5.0)])
+
+    assert names.trie.complete("la") == ["Lamp", "Lantern"]
+    names.set(2, None, 0.0)
+    assert names.trie.complete("la") == ["Lantern", "Lamp"]
+    # Renamed: the old name goes once no product carries it
+    names.set(1, "Lampshade", 1.0)
+    assert names.trie.complete("la") == ["Lantern", "Lampshade"]
+
+
+def test_load_replays_changes_made_while_building():
+    index = AutocompleteIndex()
+
+    async def read_products():
+        # A product write landing while the database is read
+        index.apply(2, "Lamp Renamed", 0.0)
+        return [(1, "Lamp", 1.0), (2, "Lamp Old", 0.0)]
+
+    async def main():
+        with (
+            patch.object(index_module, "read_products", read_products),
+            patch.object(index_module, "_write_snapshot", AsyncMock()) as write,
+        ):
+            await index.load(use_snapshot=False)
+        return write
+
+    write = asyncio.run(main())
+
+    write.assert_awaited_once()
+    assert index.ready
+    assert index.complete("lamp") == ["Lamp", "Lamp Renamed"]
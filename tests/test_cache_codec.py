@@ -0,0 +1,36 @@
+import pytest
+
+from app.core.cache_codec import CacheCodec, CodecError
+
+VALUE = {"id": 1, "name": "Café", "tags": ["a", "b"], "price": 9.5, "stock": None}
+
+
+@pytest.mark.parametrize("codec", ["json", "orjson", "msgpack"])
+@pytest.mark.parametrize("compression", ["none", "zlib", "zstd", "lz4"])
+def test_round_trip(codec: str, compression: str):
+    cache_codec = CacheCodec(codec, compression, compress_min_bytes=0)
+    large = {**VALUE, "description": "x" * 4096}
+
+    assert cache_codec.decode(cache_codec.encode(VALUE)) == VALUE
+    assert cache_codec.decode(cache_codec.encode(large)) == large
+
+
+def test_compression_threshold():
+    cache_codec = CacheCodec("json", "zlib", compress_min_bytes=1024)
+    small = cache_codec.encode(VALUE)
+    large = cache_codec.encode({"description": "x" * 4096})
+
+    assert small[2] == 0  # stored uncompressed
+    assert large[2] != 0
+    assert len(large) < 4096
+
+
+def test_values_from_other_settings_and_formats():
+    written = CacheCodec("json", "zlib", compress_min_bytes=0).encode(VALUE)
+    # Readers decode whatever the header says, not their own settings
+    assert CacheCodec("orjson", "none").decode(written) == VALUE
+
+    reader = CacheCodec()
+    with pytest.raises(CodecError):
+        reader.decode(b'{"id": 1}')  # pre-codec plain JSON
+    assert reader.try_decode(b"\x09\x01\x00{}", "key") is None
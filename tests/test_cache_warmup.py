@@ -0,0 +1,61 @@
+import asyncio
+from unittest.mock import patch
+
+import pytest
+
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import NullPool
+
+from app.jobs.cache_warmup import autocomplete_prefixes, warm_cache
+from app.models.category import Category
+from app.models.product import Product
+
+
+def test_autocomplete_prefixes():
+    names = ["Laptop Pro", "Lamp", "TV"]
+    assert autocomplete_prefixes(names, 10) == [
+        "la",
+        "tv",
+        "lap",
+        "lam",
+        "lapt",
+        "lamp",
+    ]
+    assert autocomplete_prefixes(names, 2) == ["la", "tv"]
+
+
+def test_warm_cache(db_session: Session):
+    category = Category(name="Warm", slug="warm")
+    db_session.add(category)
+    db_session.flush()
+    db_session.add_all(
+        Product(
+            name=f"Warm Product {i}",
+            slug=f"warm-product-{i}",
+            sku=f"SKU-WARM-{i}",
+            price=10,
+            popularity=i,
+            category_id=category.id,
+        )
+        for i in range(5)
+    )
+    db_session.commit()
+    # Async sessions on the test database, like the app's
+    engine = create_async_engine(
+        db_session.bind.url.set(drivername="sqlite+aiosqlite"), poolclass=NullPool
+    )
+    sessions = async_sessionmaker(engine, expire_on_commit=False)
+
+    with patch("app.jobs.cache_warmup.AsyncSessionLocal", sessions):
+        report = asyncio.run(warm_cache(top_n=3, prefixes=2, timeout=10))
+
+    # Two listings, one category listing, one product batch, two prefixes
+    assert report == (6, 0, 0)
+
+    # The time budget covers planning too
+    with (
+        patch("app.jobs.cache_warmup.AsyncSessionLocal", sessions),
+        pytest.raises(asyncio.TimeoutError),
+    ):
+        asyncio.run(warm_cache(top_n=3, prefixes=2, timeout=0))
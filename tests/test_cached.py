@@ -0,0 +1,81 @@
+import asyncio
+
+import fakeredis
+import pytest
+from fastapi import HTTPException
+from pydantic import BaseModel
+
+from app.core.cached import CACHED_CALLS, cached, invalidate_cached
+from app.core.redis import redis_client
+
+
+class Item(BaseModel):
+    id: int
+    name: str
+
+
+class ItemService:
+    @cached("test-items", ttl=60, negative_ttl=60)
+    async def get_item(self, id: int) -> Item:
+        if id == 0:
+            raise HTTPException(status_code=404, detail="Item not found")
+        return {"id": id, "name": f"item {id}"}
+
+
+def hits(name: str) -> float:
+    return CACHED_CALLS.labels(cache=name, result="hit")._value.get()
+
+
+def test_async_method_returns_models():
+    service = ItemService()
+
+    assert asyncio.run(service.get_item(2)) == Item(id=2, name="item 2")
+    with pytest.raises(HTTPException) as exc:
+        asyncio.run(service.get_item(0))
+    assert exc.value.detail == "Item not found"
+
+
+def test_sync_methods_are_rejected():
+    with pytest.raises(TypeError):
+
+        @cached("test-sync", ttl=60)
+        def get_item(id: int) -> Item: ...
+
+
+class TaggedService:
+    def __init__(self):
+        self.calls = 0
+
+    @cached("test-tagged", ttl=300, tags=["test-tagged"], negative_ttl=30)
+    async def get_item(self, id: int) -> Item:
+        self.calls += 1
+        if id == 0:
+            raise HTTPException(status_code=404, detail="Item not found")
+        return Item(id=id, name=f"item {id}")
+
+
+def test_async_method_is_cached_and_invalidated_in_redis(monkeypatch):
+    server = fakeredis.aioredis.FakeRedis()
+    monkeypatch.setattr(redis_client, "_client", server)
+    service = TaggedService()
+    tag_key = redis_client.tag_key("test-tagged")
+
+    before = hits("test-tagged")
+
+    async def main():
+        await service.get_item(1)
+        item_ttl = await server.ttl("cached:test-tagged:id=1")
+        # A shorter-lived 404 must not cut the tag set's expiry
+        with pytest.raises(HTTPException):
+            await service.get_item(0)
+        assert await server.ttl(tag_key) >= item_ttl
+
+        assert await service.get_item(1) == Item(id=1, name="item 1")
+        assert service.calls == 2
+        assert hits("test-tagged") == before + 1
+        await invalidate_cached(["test-tagged"])
+        assert not await server.exists("cached:test-tagged:id=1", tag_key)
+        await service.get_item(1)
+        assert service.calls == 3
+
+    asyncio.run(main())
@@ -0,0 +1,51 @@
+import pytest
+from sqlalchemy import create_engine, exc
+
+from app.db.pool_metrics import (
+    POOL_CHECKOUTS,
+    POOL_TIMEOUTS,
+    InstrumentedQueuePool,
+    instrument_engine,
+)
+
+
+def _metric(metric, label: str) -> float:
+    return metric.labels(engine=label)._value.get()
+
+
+def test_pool_checkouts_are_counted(tmp_path):
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'pool.db'}",
+        poolclass=InstrumentedQueuePool,
+        pool_logging_name="test-checkouts",
+    )
+    instrument_engine(engine)
+
+    before = _metric(POOL_CHECKOUTS, "test-checkouts")
+    with engine.connect():
+        pass
+    with engine.connect():
+        pass
+
+    assert _metric(POOL_CHECKOUTS, "test-checkouts") == before + 2
+    engine.dispose()
+
+
+def test_pool_timeout_is_counted(tmp_path):
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'pool.db'}",
+        poolclass=InstrumentedQueuePool,
+        pool_size=1,
+        max_overflow=0,
+        pool_timeout=0.01,
+        pool_logging_name="test-timeouts",
+    )
+    instrument_engine(engine)
+
+    before = _metric(POOL_TIMEOUTS, "test-timeouts")
+    with engine.connect():
+        with pytest.raises(exc.TimeoutError):
+            engine.connect()
+
+    assert _metric(POOL_TIMEOUTS, "test-timeouts") == before + 1
+    engine.dispose()
@@ -0,0 +1,38 @@
+import asyncio
+
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.db.replica import ReplicaMonitor
+
+
+def test_replica_used_when_reachable_and_within_lag(tmp_path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'replica.db'}")
+    monitor = ReplicaMonitor(engine=engine, max_lag=5, check_interval=60)
+
+    assert asyncio.run(monitor.is_available()) is True
+
+
+def test_replica_skipped_when_lagging(tmp_path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'replica.db'}")
+    monitor = ReplicaMonitor(engine=engine, max_lag=5, check_interval=60)
+
+    async def lagging() -> float:
+        return 30.0
+
+    monitor.get_lag = lagging
+    assert asyncio.run(monitor.is_available()) is False
+
+
+def test_replica_skipped_when_unreachable(tmp_path):
+    engine = create_async_engine(
+        f"sqlite+aiosqlite:///{tmp_path / 'missing' / 'replica.db'}"
+    )
+    monitor = ReplicaMonitor(engine=engine, max_lag=5, check_interval=60)
+
+    assert asyncio.run(monitor.is_available()) is False
+
+
+def test_no_replica_configured():
+    monitor = ReplicaMonitor(engine=None)
+
+    assert asyncio.run(monitor.is_available()) is False
@@ -0,0 +1,384 @@
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+from elasticsearch import ConnectionError as ESConnectionError
+from fastapi import HTTPException
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import NullPool
+
+from app.core.redis import redis_client
+from app.models.category import Category
+from app.models.product import Product
+from app.schema.search_schema import ProductSearchQuery, SearchSort
+from app.services.elasticsearch_service import ElasticService
+from app.services.product_service import ProductService
+from app.services.search_service import SearchService, search_breaker
+from app.utils.es_query import (
+    build_facets_body,
+    build_search_body,
+    compile_template,
+)
+from app.utils.es_utils import product_rows, product_source
+from app.utils.popularity import sale_weight
+
+
+def test_search_body_uses_filter_context():
+    body = build_search_body(
+        ProductSearchQuery(text="lamp", category="Home", max_price=50, in_stock=True)
+    )
+
+    assert body["query"]["bool"]["must"][0]["multi_match"]["query"] == "lamp"
+    assert body["query"]["bool"]["filter"] == [
+        {"term": {"is_active": True}},
+        {"term": {"category": "Home"}},
+        {"range": {"price": {"lte": 50}}},
+        {"term": {"in_stock": True}},
+    ]
+    assert body["sort"] == [{"_score": "desc"}, {"id": "asc"}]
+    assert "highlight" not in body and "pit" not in body
+
+
+def test_search_and_facets_skip_inactive_products(db_session: Session):
+    db_session.add_all(
+        [
+            Product(name="Shown Lamp", slug="shown-lamp", sku="SKU-SHOWN", price=5),
+            Product(
+                name="Hidden Lamp",
+                slug="hidden-lamp",
+                sku="SKU-HIDDEN",
+                price=5,
+                is_active=False,
+            ),
+        ]
+    )
+    db_session.commit()
+    docs = [
+        product_source(row)
+        for row in db_session.execute(
+            product_rows().where(Product.sku.in_(["SKU-SHOWN", "SKU-HIDDEN"]))
+        )
+    ]
+
+    def matching(body: dict) -> list:
+        # The bodies' filters are term clauses here
+        filters = body["query"]["bool"]["filter"]
+        return [
+            doc["name"]
+            for doc in docs
+            if all(
+                doc[field] == value
+                for clause in filters
+                for field, value in clause["term"].items()
+            )
+        ]
+
+    query = ProductSearchQuery(text="lamp")
+    assert matching(build_search_body(query)) == ["Shown Lamp"]
+    assert matching(build_facets_body(query)) == ["Shown Lamp"]
+
+
+def test_search_templates_are_compiled_once_per_shape():
+    compile_template.cache_clear()
+    build_search_body(ProductSearchQuery(text="lamp", sort=SearchSort.PRICE_ASC))
+    body = build_search_body(ProductSearchQuery(text="desk", sort=SearchSort.PRICE_ASC))
+
+    assert compile_template.cache_info().misses == 1
+    # Rendering copies: the cached template keeps its placeholders
+    assert body["query"]["bool"]["must"][0]["multi_match"]["query"] == "desk"
+
+
+def _result(ids, total, pit_id=None):
+    hits = [
+        {
+            "_id": str(i),
+            "_score": 1.0,
+            "_source": {"id": i, "name": f"P{i}", "price": 1.0, "in_stock": True},
+            "sort": [1.0, str(i)],
+        }
+        for i in ids
+    ]
+    result = {"took": 1, "hits": {"total": {"value": total}, "hits": hits}}
+    if pit_id:
+        result["pit_id"] = pit_id
+    return result
+
+
+def test_search_pages_with_search_after():
+    es = MagicMock()
+    es.search = AsyncMock(side_effect=[_result([1, 2], 3), _result([3], 3)])
+    es.open_point_in_time = AsyncMock()
+    service = ElasticService(es)
+
+    async def main():
+        first = await service.search_products(ProductSearchQuery(text="p", size=2))
+        second = await service.search_products(
+            ProductSearchQuery(text="p", size=2, cursor=first.next_cursor)
+        )
+        return first, second
+
+    first, second = asyncio.run(main())
+
+    # No point-in-time unless the client asks for a snapshot
+    es.open_point_in_time.assert_not_awaited()
+    page_body = es.search.await_args_list[1].kwargs
+    assert page_body["index"] == "products"
+    assert "pit" not in page_body["body"]
+    assert page_body["body"]["search_after"] == [1.0, "2"]
+    assert [hit.id for hit in second.results] == [3]
+    assert second.next_cursor is None
+
+
+def test_snapshot_search_pages_through_point_in_time():
+    es = MagicMock()
+    es.search = AsyncMock(
+        side_effect=[_result([1, 2], 3, pit_id="pit-2"), _result([3], 3, "pit-3")]
+    )
+    es.open_point_in_time = AsyncMock(return_value={"id": "pit-1"})
+    es.close_point_in_time = AsyncMock()
+    service = ElasticService(es)
+
+    async def main():
+        first = await service.search_products(
+            ProductSearchQuery(text="p", size=2, snapshot=True)
+        )
+        second = await service.search_products(
+            ProductSearchQuery(text="p", size=2, cursor=first.next_cursor)
+        )
+        return first, second
+
+    first, second = asyncio.run(main())
+
+    # Opened before the first page, so every page reads the same snapshot
+    es.open_point_in_time.assert_awaited_once()
+    first_body, page_body = (call.kwargs for call in es.search.await_args_list)
+    assert "index" not in first_body and "search_after" not in first_body["body"]
+    assert first_body["body"]["pit"] == {"id": "pit-1", "keep_alive": "1m"}
+    assert "index" not in page_body
+    assert page_body["body"]["pit"] == {"id": "pit-2", "keep_alive": "1m"}
+    assert page_body["body"]["search_after"] == [1.0, "2"]
+    # Last page: no cursor, and the point-in-time is released
+    assert [hit.id for hit in second.results] == [3]
+    assert second.next_cursor is None
+    es.close_point_in_time.assert_awaited_once_with(id="pit-3")
+
+    with pytest.raises(HTTPException) as error:
+        asyncio.run(
+            service.search_products(
+                ProductSearchQuery(sort=SearchSort.NAME, cursor=first.next_cursor)
+            )
+        )
+    assert error.value.status_code == 400
+
+
+def _aggregations(categories, in_stock):
+    return {
+        "categories": {
+            "buckets": [{"key": k, "doc_count": n} for k, n in categories.items()]
+        },
+        "price_ranges": {
+            "buckets": [
+                {"key": "*-25", "to": 25.0, "doc_count": 1},
+                {"key": "25-50", "from": 25.0, "to": 50.0, "doc_count": 2},
+            ]
+        },
+        "in_stock": {"doc_count": in_stock},
+    }
+
+
+def test_search_returns_facets_from_the_same_request():
+    es = MagicMock()
+    result = _result([1], 1)
+    result["aggregations"] = _aggregations({"Home": 3}, in_stock=2)
+    es.search = AsyncMock(return_value=result)
+
+    response = asyncio.run(
+        ElasticService(es).search_products(ProductSearchQuery(text="lamp"), facets=True)
+    )
+
+    body = es.search.await_args.kwargs["body"]
+    assert set(body["aggs"]) == {"categories", "price_ranges", "in_stock"}
+    assert response.facets.categories[0].model_dump() == {"key": "Home", "count": 3}
+    assert response.facets.price_ranges[1].min == 25.0
+    assert response.facets.in_stock == 2
+
+
+def test_facets_fall_back_to_sql_when_search_is_down(db_session: Session):
+    home = Category(name="Facet Home", slug="facet-home")
+    db_session.add(home)
+    db_session.flush()
+    db_session.add_all(
+        [
+            Product(
+                name="Facet A",
+                slug="facet-a",
+                sku="SKU-FA",
+                price=10,
+                stock_quantity=1,
+                category_id=home.id,
+            ),
+            Product(
+                name="Facet B",
+                slug="facet-b",
+                sku="SKU-FB",
+                price=30,
+                stock_quantity=0,
+                category_id=home.id,
+            ),
+            Product(
+                name="Facet C",
+                slug="facet-c",
+                sku="SKU-FC",
+                price=600,
+                stock_quantity=4,
+            ),
+        ]
+    )
+    db_session.commit()
+    engine = create_async_engine(
+        db_session.bind.url.set(drivername="sqlite+aiosqlite"), poolclass=NullPool
+    )
+    es = MagicMock()
+    es.search = AsyncMock(side_effect=ESConnectionError("down"))
+    search_breaker.record_success()
+
+    async def facets():
+        async with async_sessionmaker(engine, expire_on_commit=False)() as db:
+            service = SearchService(db=db, redis=redis_client, es=es)
+            return await service.get_facets(ProductSearchQuery(text="Facet"))
+
+    result = asyncio.run(facets())
+    search_breaker.record_success()
+
+    es.search.assert_awaited_once()
+    assert [b.model_dump() for b in result.categories] == [
+        {"key": "Facet Home", "count": 2}
+    ]
+    counts = {bucket.key: bucket.count for bucket in result.price_ranges}
+    assert counts == {
+        "*-25": 1,
+        "25-50": 1,
+        "50-100": 0,
+        "100-250": 0,
+        "250-500": 0,
+        "500-*": 1,
+    }
+    assert result.in_stock == 2
+
+
+def test_product_search_listing_resolves_ids_in_elasticsearch(db_session: Session):
+    products = [
+        Product(name=f"Listed {i}", slug=f"listed-{i}", sku=f"SKU-LS-{i}", price=5)
+        for i in range(3)
+    ]
+    db_session.add_all(products)
+    db_session.commit()
+    ids = [products[2].id, products[0].id]
+    engine = create_async_engine(
+        db_session.bind.url.set(drivername="sqlite+aiosqlite"), poolclass=NullPool
+    )
+    es = MagicMock()
+    es.options.return_value = es
+    es.search = AsyncMock(
+        side_effect=[
+            {"hits": {"total": {"value": 3}, "hits": [{"_id": str(i)} for i in ids]}},
+            ESConnectionError("down"),
+        ]
+    )
+    search_breaker.record_success()
+
+    async def listing():
+        async with async_sessionmaker(engine, expire_on_commit=False)() as db:
+            service = ProductService(
+                db=db,
+                redis=redis_client,
+                search=SearchService(db=db, redis=redis_client, es=es),
+            )
+            return [
+                await service.get_all_products(
+                    page=1, per_page=2, search="Listed", sort_by="relevance"
+                )
+                for _ in range(2)
+            ]
+
+    from_search, from_sql = asyncio.run(listing())
+    search_breaker.record_success()
+
+    body = es.search.await_args_list[0].kwargs["body"]
+    assert body["_source"] is False and body["size"] == 2
+    assert {"term": {"is_active": True}} in body["query"]["bool"]["filter"]
+    # Hydrated in the order Elasticsearch ranked them
+    assert [product.id for product in from_search.data] == ids
+    assert from_search.meta.total_items == 3 and from_search.meta.has_more
+    assert from_search.links.next == (
+        "/products?search=Listed&sort_by=relevance&page=2&per_page=2"
+    )
+    # Search down: the same listing from SQL
+    assert [product.id for product in from_sql.data] == [p.id for p in products[:2]]
+
+
+def test_autocomplete_uses_search_as_you_type_then_falls_back(db_session: Session):
+    db_session.add(
+        Product(name="Lamp Shade", slug="lamp-shade", sku="SKU-LAMP-SQL", price=5)
+    )
+    db_session.commit()
+    engine = create_async_engine(
+        db_session.bind.url.set(drivername="sqlite+aiosqlite"), poolclass=NullPool
+    )
+    es = MagicMock()
+    es.options.return_value = es
+    es.search = AsyncMock(
+        side_effect=[
+            {"hits": {"hits": [{"_source": {"name": "Lamp Deluxe"}}]}},
+            ESConnectionError("down"),
+        ]
+    )
+    search_breaker.record_success()
+
+    async def suggestions(query):
+        async with async_sessionmaker(engine, expire_on_commit=False)() as db:
+            service = ProductService(
+                db=db,
+                redis=redis_client,
+                search=SearchService(db=db, redis=redis_client, es=es),
+            )
+            return await service.get_autocomplete_suggestions(query)
+
+    assert asyncio.run(suggestions("lam")) == ["Lamp Deluxe"]
+    assert asyncio.run(suggestions("lamp s")) == ["Lamp Shade"]
+    search_breaker.record_success()
+
+    body = es.search.await_args_list[0].kwargs["body"]
+    match = body["query"]["function_score"]["query"]["bool"]["must"][0]
+    assert match["multi_match"]["type"] == "bool_prefix"
+    script = body["query"]["function_score"]["script_score"]["script"]
+    assert "popularity" in script["source"]
+    # Forward-decayed scores are scaled back to today's value
+    assert script["params"]["scale"] == pytest.approx(1 / sale_weight(), rel=1e-3)
+    assert body["collapse"] == {"field": "name.keyword"}
+
+
+def test_cancelled_search_releases_the_half_open_trial(monkeypatch):
+    monkeypatch.setattr(search_breaker, "reset_timeout", 0)
+    search_breaker.trip()
+
+    async def hang(**kwargs):
+        await asyncio.sleep(10)
+
+    es = MagicMock()
+    es.search = AsyncMock(side_effect=hang)
+    service = SearchService(db=MagicMock(), redis=redis_client, es=es)
+
+    async def main():
+        task = asyncio.create_task(service.get_facets(ProductSearchQuery(text="lamp")))
+        await asyncio.sleep(0.01)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    asyncio.run(main())
+
+    # The next call may try Elasticsearch again
+    assert search_breaker.allow()
+    search_breaker.record_success()
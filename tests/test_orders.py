@@ -1,6 +1,8 @@
+import pytest
 from fastapi.testclient import TestClient
 from sqlalchemy.orm import Session
 from app.models.product import Product
+from app.utils.popularity import sale_weight
 
 
 def create_test_product(db_session: Session):
@@ -126,3 +128,64 @@ def test_get_orders(client: TestClient, db_session: Session):
     data = response.json()
     assert isinstance(data, list)
     assert len(data) >= 1
+
+
+def test_order_updates_product_popularity(client: TestClient, db_session: Session):
+    # 1. Register and login
+    register_payload = {
+        "email": "popularity_user@example.com",
+        "password": "password123",
+        "first_name": "Order",
+        "last_name": "User",
+        "phone": "1234567890"
+    }
+    client.post("/users/register", json=register_payload)
+    login_payload = {
+        "email": "popularity_user@example.com",
+        "password": "password123"
+    }
+    login_res = client.post("/users/login", json=login_payload)
+    headers = {"Authorization": f"Bearer {login_res.json()['token']}"}
+
+    address_payload = {
+        "type": "shipping",
+        "street": "123 Order St",
+        "city": "Order City",
+        "country": "Order Country",
+        "state": "Test State"
+    }
+    addr_res = client.post("/users/me/address", json=address_payload, headers=headers)
+    address_id = addr_res.json()["id"]
+
+    # 2. Two products, only the second one is ordered
+    slow_seller = Product(
+        name="Slow Seller",
+        slug="slow-seller",
+        sku="SKU-SLOW-001",
+        price=10.0,
+        stock_quantity=100,
+    )
+    best_seller = Product(
+        name="Best Seller",
+        slug="best-seller",
+        sku="SKU-BEST-001",
+        price=10.0,
+        stock_quantity=100,
+    )
+    db_session.add_all([slow_seller, best_seller])
+    db_session.commit()
+
+    client.post(
+        "/cart/items", json={"product_id": best_seller.id, "quantity": 3}, headers=headers
+    )
+    order_payload = {"shipping_address_id": address_id, "billing_address_id": address_id}
+    assert client.post("/order", json=order_payload, headers=headers).status_code == 200
+
+    # 3. Sales stats are maintained and drive the popularity sort
+    db_session.refresh(best_seller)
+    assert best_seller.sales_count == 3
+    # Forward-decayed: weighted by the time of sale
+    assert best_seller.popularity == pytest.approx(3 * sale_weight(), rel=1e-3)
+
+    res = client.get("/product?sort_by=popularity&sort_order=desc")
+    assert res.json()["data"][0]["id"] == best_seller.id
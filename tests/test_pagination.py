@@ -0,0 +1,130 @@
+import base64
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from app.models.product import Product
+
+
+def create_products(db_session: Session):
+    # Repeated prices so page boundaries fall inside runs of equal sort values
+    prices = [10, 20, 20, 20, 30, 30, 40, 50, 50, 50, 50]
+    db_session.add_all(
+        Product(
+            name=f"Paged Product {i}",
+            slug=f"paged-product-{i}",
+            sku=f"SKU-PAGED-{i:03d}",
+            price=price,
+            stock_quantity=10,
+        )
+        for i, price in enumerate(prices)
+    )
+    db_session.commit()
+
+
+def walk_cursor_pages(client: TestClient, params: dict) -> list[int]:
+    ids = []
+    res = client.get("/product", params={**params, "pagination": "cursor"})
+    while True:
+        assert res.status_code == 200
+        body = res.json()
+        assert body["meta"]["total_items"] is None
+        ids.extend(item["id"] for item in body["data"])
+        if body["meta"]["next_cursor"] is None:
+            assert body["links"]["next"] is None
+            return ids
+        res = client.get(
+            "/product", params={**params, "cursor": body["meta"]["next_cursor"]}
+        )
+
+
+@pytest.mark.parametrize(
+    "sort_by, sort_order",
+    [("id", "asc"), ("price", "desc"), ("created_at", "asc"), ("rating", "desc")],
+)
+def test_cursor_pages_match_offset_listing(
+    client: TestClient, db_session: Session, sort_by: str, sort_order: str
+):
+    create_products(db_session)
+    params = {"sort_by": sort_by, "sort_order": sort_order, "per_page": 3}
+
+    ids = walk_cursor_pages(client, params)
+
+    assert len(ids) == len(set(ids)) == 11
+    if sort_by in ("id", "price"):
+        offset_ids = [
+            item["id"]
+            for item in client.get(
+                "/product", params={**params, "per_page": 100}
+            ).json()["data"]
+        ]
+        assert ids == offset_ids
+
+
+def test_invalid_cursor_is_rejected(client: TestClient, db_session: Session):
+    create_products(db_session)
+    first = client.get(
+        "/product", params={"pagination": "cursor", "per_page": 3}
+    ).json()
+
+    res = client.get("/product", params={"cursor": "not-a-cursor"})
+    assert res.status_code == 400
+
+    # A cursor only makes sense for the ordering it was issued for
+    res = client.get(
+        "/product",
+        params={"cursor": first["meta"]["next_cursor"], "sort_by": "price"},
+    )
+    assert res.status_code == 400
+
+
+def forged_cursor(payload: dict) -> str:
+    encoded = base64.urlsafe_b64encode(json.dumps(payload).encode())
+    return encoded.decode().rstrip("=")
+
+
+@pytest.mark.parametrize(
+    "sort_by, value",
+    [
+        ("price", "abc"),
+        ("id", [1]),
+        ("id", {"a": 1}),
+        ("name", None),
+        ("created_at", "garbage"),
+    ],
+)
+def test_forged_cursor_values_are_rejected(
+    client: TestClient, db_session: Session, sort_by: str, value
+):
+    create_products(db_session)
+    cursor = forged_cursor({"s": f"{sort_by}:asc", "v": value, "id": 1})
+
+    res = client.get("/product", params={"cursor": cursor, "sort_by": sort_by})
+
+    assert res.status_code == 400
+
+
+def test_count_modes(client: TestClient, db_session: Session):
+    create_products(db_session)
+
+    meta = client.get("/product", params={"count_mode": "exact"}).json()["meta"]
+    assert (meta["total_items"], meta["count_mode"], meta["has_more"]) == (
+        11,
+        "exact",
+        True,
+    )
+
+    body = client.get(
+        "/product", params={"count_mode": "has_more", "per_page": 5, "page": 3}
+    ).json()
+    assert body["meta"]["total_items"] is None
+    assert body["meta"]["has_more"] is False
+    assert len(body["data"]) == 1
+    assert body["links"]["last"] is None
+
+    # Planner estimates need PostgreSQL; the reported mode says what was used
+    meta = client.get("/product", params={"count_mode": "estimated"}).json()["meta"]
+    assert meta["total_items"] == 11
+    assert meta["count_mode"] in ("cached", "exact")
@@ -0,0 +1,26 @@
+import datetime
+
+import pytest
+
+from app.utils.popularity import EPOCH, sale_weight
+
+
+def test_sale_weight_doubles_every_half_life():
+    assert sale_weight(EPOCH, half_life_days=14) == 1.0
+    later = EPOCH + datetime.timedelta(days=28)
+    assert sale_weight(later, half_life_days=14) == pytest.approx(4.0)
+    # Naive times are UTC
+    assert sale_weight(later.replace(tzinfo=None), half_life_days=14) == (
+        pytest.approx(4.0)
+    )
+
+
+def test_recent_sales_outrank_older_larger_ones():
+    now = datetime.datetime.now(datetime.timezone.utc)
+    month_ago = now - datetime.timedelta(days=28)
+    old = 3 * sale_weight(month_ago, half_life_days=14)
+    recent = 1 * sale_weight(now, half_life_days=14)
+
+    assert old < recent
+    # Scaled back by today's weight, the stored score is the decayed total
+    assert old / sale_weight(now, half_life_days=14) == pytest.approx(0.75)
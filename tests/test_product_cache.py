@@ -0,0 +1,51 @@
+import asyncio
+from unittest.mock import AsyncMock, patch
+
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from app.core.product_cache import invalidate_product_listings
+from app.core.redis import redis_client
+from app.models.product import Product
+
+
+def test_invalidation_tags():
+    with patch.object(redis_client, "invalidate_tags", new=AsyncMock()) as invalidate:
+        asyncio.run(
+            invalidate_product_listings(product_ids=[1], category_ids=[3, None])
+        )
+        asyncio.run(invalidate_product_listings(product_ids=[2]))
+
+    assert set(invalidate.await_args_list[0].args[0]) == {
+        "products:product:1",
+        "products:category:all",
+        "products:category:3",
+    }
+    # Display-only changes leave category listings alone
+    assert invalidate.await_args_list[1].args[0] == ["products:product:2"]
+
+
+def test_listing_is_served_from_cache(client: TestClient, db_session: Session):
+    product = Product(
+        name="Cached Product", slug="cached-product", sku="SKU-CACHED-001", price=5
+    )
+    db_session.add(product)
+    db_session.commit()
+
+    with (
+        patch.object(redis_client, "get_json", new=AsyncMock(return_value=None)),
+        patch.object(redis_client, "set_json_tagged", new=AsyncMock()) as store,
+    ):
+        first = client.get("/product").json()
+
+    key, cached, tags = store.await_args.args
+    assert set(tags) == {"products:category:all", f"products:product:{product.id}"}
+
+    db_session.delete(product)
+    db_session.commit()
+
+    with patch.object(redis_client, "get_json", new=AsyncMock(return_value=cached)):
+        second = client.get("/product").json()
+
+    assert second == first
+    assert second["data"][0]["name"] == "Cached Product"
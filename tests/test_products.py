@@ -1,6 +1,7 @@
 from fastapi.testclient import TestClient
 from sqlalchemy import select
 from sqlalchemy.orm import Session
+from app.models.product import Product
 from app.models.user import User
 
 
@@ -68,3 +69,23 @@ def test_get_products(client: TestClient):
     assert "total_items" in meta
     assert meta["current_page"] == 1
     assert meta["per_page"] == 10
+
+
+def test_get_products_batch(client: TestClient, db_session: Session):
+    products = [
+        Product(name=f"Batch {i}", slug=f"batch-{i}", sku=f"SKU-BATCH-{i}", price=i)
+        for i in range(1, 5)
+    ]
+    products[3].is_active = False
+    db_session.add_all(products)
+    db_session.commit()
+    ids = [products[2].id, 999_999, products[0].id, products[2].id, products[3].id]
+
+    response = client.get("/product/batch", params={"ids": ids})
+
+    assert response.status_code == 200
+    assert [p["id"] for p in response.json()] == [products[2].id, products[0].id]
+    # Served again (from cache when Redis is available) with the same result
+    assert client.get("/product/batch", params={"ids": ids}).json() == response.json()
+
+    assert client.get("/product/batch").status_code == 422
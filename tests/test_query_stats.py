@@ -0,0 +1,36 @@
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+
+from app.db.query_stats import statement_shape, track_queries
+
+
+def test_statement_shape_ignores_values_and_in_list_length():
+    assert statement_shape(
+        "SELECT * FROM products WHERE id IN (?, ?, ?) LIMIT 10"
+    ) == statement_shape("SELECT *\n  FROM products WHERE id IN (?) LIMIT 20")
+    assert statement_shape("SELECT * FROM users WHERE id = $1") == statement_shape(
+        "SELECT * FROM users WHERE id = $2"
+    )
+
+
+def test_track_queries_flags_repeated_statements(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'stats.db'}")
+    with engine.connect() as conn:
+        conn.execute(text("CREATE TABLE t (id INTEGER)"))
+
+        with track_queries() as stats:
+            conn.execute(text("SELECT count(*) FROM t"))
+            for i in range(5):
+                conn.execute(text("SELECT * FROM t WHERE id = :id"), {"id": i})
+
+    assert stats.count == 6
+    assert stats.repeated(5) == [("SELECT * FROM t WHERE id = ?", 5)]
+    assert stats.repeated(6) == []
+    engine.dispose()
+
+
+def test_server_timing_header(client: TestClient):
+    response = client.get("/healthcheck")
+
+    assert response.status_code == 200
+    assert response.headers["server-timing"].startswith("db;dur=")
@@ -0,0 +1,160 @@
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from app.core.circuit_breaker import CircuitBreaker, CircuitOpenError
+from app.core.config import settings
+from app.core.local_cache import LocalCache
+from app.core.redis import SCAN_BATCH_SIZE, RedisClient, should_refresh_early
+
+
+def test_should_refresh_early():
+    now = 1_000.0
+    # Cheap value, far from expiry: practically never refreshed early
+    assert not any(should_refresh_early(now + 600, 0.001, 1.0, now) for _ in range(100))
+    # Past expiry: always
+    assert should_refresh_early(now - 1, 0.001, 1.0, now)
+    # Disabled with beta=0
+    assert not should_refresh_early(now + 0.001, 10.0, 0.0, now)
+
+
+def test_get_or_set_coalesces_concurrent_misses():
+    # Not connected: every call misses Redis, single-flight still applies
+    cache = RedisClient()
+    calls = 0
+
+    async def load():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.05)
+        return {"id": 1}
+
+    async def main():
+        return await asyncio.gather(
+            *(cache.get_or_set("product:1", load) for _ in range(20))
+        )
+
+    results = asyncio.run(main())
+
+    assert calls == 1
+    assert results == [{"id": 1}] * 20
+
+
+def test_delete_pattern_unlinks_in_batches():
+    async def scan_iter(**kwargs):
+        for i in range(1200):
+            yield f"product:{i}"
+
+    cache = RedisClient()
+    cache._client = MagicMock()
+    cache._client.scan_iter = scan_iter
+    cache._client.unlink = AsyncMock(side_effect=lambda *keys: len(keys))
+
+    assert asyncio.run(cache.delete_pattern("product:*")) == 1200
+    sizes = [len(call.args) for call in cache._client.unlink.await_args_list]
+    assert sizes == [SCAN_BATCH_SIZE, SCAN_BATCH_SIZE, 200]
+
+
+def test_namespaced_key_without_redis():
+    assert asyncio.run(RedisClient().namespaced_key("autocomplete", "lap")) == (
+        "autocomplete:v0:lap"
+    )
+
+
+def test_local_cache_bounds():
+    cache = LocalCache(max_entries=2, max_bytes=10, ttl=60)
+    cache.set("a", b"1234")
+    cache.set("b", b"1234")
+    cache.get("a")  # now most recently used
+    cache.set("c", b"1234")
+    assert (cache.get("a"), cache.get("b"), cache.get("c")) == (b"1234", None, b"1234")
+
+    cache.set("d", b"123456")  # over max_bytes: evicts least recently used
+    assert cache.size_bytes <= 10
+    assert cache.get("a") is None
+
+    cache.set("e", b"1", ttl=0)
+    assert cache.get("e") is None
+
+
+def test_get_or_set_serves_l1_hits():
+    cache = RedisClient(local=LocalCache(max_entries=10, max_bytes=1024, ttl=60))
+    cache._client = MagicMock()
+    cache._client.get = AsyncMock(return_value=None)
+    cache._client.set = AsyncMock()
+    cache._client.unlink = AsyncMock(return_value=1)
+    cache._client.publish = AsyncMock()
+    load = AsyncMock(return_value={"id": 1})
+
+    async def main():
+        first = await cache.get_or_set("product:1", load)
+        second = await cache.get_or_set("product:1", load)
+        await cache.delete_many(["product:1"])
+        third = await cache.get_or_set("product:1", load)
+        return first, second, third
+
+    assert asyncio.run(main()) == ({"id": 1},) * 3
+    # The second read never reached Redis; the delete evicted the L1 copy
+    assert load.await_count == 2
+    reads = [c.args[0] for c in cache._client.get.await_args_list]
+    assert reads.count("product:1") == 2
+    cache._client.publish.assert_awaited_once()
+
+
+def test_circuit_breaker_opens_and_recovers(monkeypatch):
+    clock = [0.0]
+    monkeypatch.setattr("app.core.circuit_breaker.time.monotonic", lambda: clock[0])
+    breaker = CircuitBreaker("test", failure_threshold=2, reset_timeout=5)
+
+    async def down():
+        raise ConnectionError("refused")
+
+    async def up():
+        return "PONG"
+
+    async def main():
+        for _ in range(2):
+            with pytest.raises(ConnectionError):
+                await breaker.call(down)
+        assert breaker.state == "open"
+        # Open: fails fast without calling
+        with pytest.raises(CircuitOpenError):
+            await breaker.call(up)
+
+        clock[0] = 5.0
+        assert breaker.state == "half_open"
+        # A failed trial reopens it, a successful one closes it
+        with pytest.raises(ConnectionError):
+            await breaker.call(down)
+        assert breaker.state == "open"
+        clock[0] = 10.0
+        assert await breaker.call(up) == "PONG"
+        assert breaker.state == "closed"
+
+    asyncio.run(main())
+
+
+def test_starts_and_serves_without_redis(monkeypatch):
+    # Nothing listens on port 1: connect must not raise
+    monkeypatch.setattr(settings, "REDIS_URL", "redis://127.0.0.1:1/0")
+    cache = RedisClient()
+
+    async def main():
+        await cache.connect()
+        try:
+            assert not cache.available
+            assert cache._reconnect_task is not None
+            # Bypasses Redis entirely instead of erroring
+            assert await cache.get_or_set("product:1", AsyncMock(return_value=1)) == 1
+            assert await cache.get_json("product:1") is None
+            await cache.set_json("product:1", 1)
+            assert await cache.get_many(["product:1", "product:2"]) == {}
+            await cache.set_many({"product:1": 1})
+            assert await cache.namespaced_key("autocomplete", "la") == (
+                "autocomplete:v0:la"
+            )
+        finally:
+            await cache.close()
+
+    asyncio.run(main())
@@ -0,0 +1,78 @@
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+from app.models.product import Product
+
+
+def create_test_product(db_session: Session):
+    """Helper to create a product in DB."""
+    product = Product(
+        name="Review Product",
+        slug="review-product",
+        sku="SKU-REVIEW-001",
+        description="For testing reviews",
+        price=20.0,
+        stock_quantity=10,
+    )
+    db_session.add(product)
+    db_session.commit()
+    db_session.refresh(product)
+    return product
+
+
+def register_and_login(client: TestClient, email: str) -> dict:
+    register_payload = {
+        "email": email,
+        "password": "password123",
+        "first_name": "Review",
+        "last_name": "User",
+        "phone": "1234567890",
+    }
+    client.post("/users/register", json=register_payload)
+    login_res = client.post(
+        "/users/login", json={"email": email, "password": "password123"}
+    )
+    return {"Authorization": f"Bearer {login_res.json()['token']}"}
+
+
+def test_review_changes_update_product_rating(client: TestClient, db_session: Session):
+    product = create_test_product(db_session)
+    first = register_and_login(client, "first_reviewer@example.com")
+    second = register_and_login(client, "second_reviewer@example.com")
+
+    # 1. Two reviews
+    res = client.post(
+        "/reviews/", json={"product_id": product.id, "rating": 4}, headers=first
+    )
+    assert res.status_code == 201
+    review_id = res.json()["id"]
+    client.post(
+        "/reviews/", json={"product_id": product.id, "rating": 5}, headers=second
+    )
+
+    data = client.get(f"/product/{product.slug}").json()
+    assert data["review_count"] == 2
+    assert data["average_rating"] == 4.5
+
+    # 2. Rating change
+    client.put(f"/reviews/{review_id}", json={"rating": 2}, headers=first)
+    data = client.get(f"/product/{product.slug}").json()
+    assert data["review_count"] == 2
+    assert data["average_rating"] == 3.5
+
+    # 3. Delete
+    res = client.delete(f"/reviews/{review_id}", headers=first)
+    assert res.status_code == 204
+    data = client.get(f"/product/{product.slug}").json()
+    assert data["review_count"] == 1
+    assert data["average_rating"] == 5.0
+
+
+def test_min_rating_filter_uses_stored_average(client: TestClient, db_session: Session):
+    product = create_test_product(db_session)
+    headers = register_and_login(client, "filter_reviewer@example.com")
+    client.post(
+        "/reviews/", json={"product_id": product.id, "rating": 3}, headers=headers
+    )
+
+    assert client.get("/product?min_rating=3").json()["meta"]["total_items"] == 1
+    assert client.get("/product?min_rating=4").json()["meta"]["total_items"] == 0
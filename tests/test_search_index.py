@@ -0,0 +1,123 @@
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from elasticsearch import NotFoundError
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import NullPool
+
+from app.jobs.search_index import ensure_product_index
+from app.models.product import Product
+from app.utils.es_utils import (
+    PRODUCTS_ALIAS,
+    IndexReport,
+    bulk_index_products,
+    id_partitions,
+    mapping_checksum,
+)
+
+
+def fake_es(aliased=None, checksum=None, count=0, indices=(), legacy=False):
+    es = MagicMock()
+    if aliased is None:
+        es.indices.get_alias = AsyncMock(side_effect=NotFoundError("missing", None, {}))
+    else:
+        es.indices.get_alias = AsyncMock(return_value={aliased: {}})
+    es.indices.get_mapping = AsyncMock(
+        return_value={aliased: {"mappings": {"_meta": {"mapping_checksum": checksum}}}}
+    )
+    es.count = AsyncMock(return_value={"count": count})
+    es.indices.exists = AsyncMock(return_value=legacy)
+    es.indices.get = AsyncMock(return_value={name: {} for name in indices})
+    for method in ("create", "put_settings", "refresh", "update_aliases", "delete"):
+        setattr(es.indices, method, AsyncMock())
+    return es
+
+
+def test_skips_current_index():
+    index = f"products-{mapping_checksum()}-20240101000000"
+    es = fake_es(aliased=index, checksum=mapping_checksum(), count=3)
+
+    with patch("app.jobs.search_index.product_count", AsyncMock(return_value=3)):
+        assert not asyncio.run(ensure_product_index(es))
+
+    es.indices.create.assert_not_awaited()
+    es.indices.update_aliases.assert_not_awaited()
+
+
+def test_rebuilds_and_swaps_legacy_index():
+    es = fake_es(
+        legacy=True,
+        indices=[
+            "products-old-20240101000000",
+            "products-old-20240102000000",
+        ],
+    )
+
+    with (
+        patch("app.jobs.search_index.product_count", AsyncMock(return_value=3)),
+        patch(
+            "app.utils.es_utils.bulk_index_products",
+            AsyncMock(return_value=IndexReport(3, 0)),
+        ) as bulk,
+    ):
+        assert asyncio.run(ensure_product_index(es))
+
+    index = es.indices.create.await_args.kwargs["index"]
+    assert index.startswith(f"products-{mapping_checksum()}-")
+    bulk.assert_awaited_once_with(es, index)
+    # The pre-alias concrete index is replaced in the same atomic call
+    es.indices.update_aliases.assert_awaited_once_with(
+        actions=[
+            {"remove_index": {"index": PRODUCTS_ALIAS}},
+            {"add": {"index": index, "alias": PRODUCTS_ALIAS}},
+        ]
+    )
+    # The newest previous index is kept for rollback
+    es.indices.delete.assert_awaited_once_with(index="products-old-20240101000000")
+
+
+def test_id_partitions():
+    assert id_partitions(1, 10, 3) == [(1, 4), (5, 8), (9, 10)]
+    assert id_partitions(5, 5, 4) == [(5, 5)]
+
+
+def test_bulk_index_products_streams_partitions(db_session: Session):
+    db_session.add_all(
+        Product(
+            name=f"Indexed {i}",
+            slug=f"indexed-{i}",
+            sku=f"SKU-IDX-{i}",
+            price=10,
+            stock_quantity=i % 2,
+        )
+        for i in range(7)
+    )
+    db_session.commit()
+    engine = create_async_engine(
+        db_session.bind.url.set(drivername="sqlite+aiosqlite"), poolclass=NullPool
+    )
+    sessions = async_sessionmaker(engine, expire_on_commit=False)
+    batches = []
+
+    async def streaming_bulk(es, actions, chunk_size, **kwargs):
+        async for action in actions:
+            batches.append(action)
+            # Reject one document to check failures are counted
+            yield action["_source"]["name"] != "Indexed 3", {"index": action}
+
+    with (
+        patch("app.utils.es_utils.AsyncSessionLocal", sessions),
+        patch("app.utils.es_utils.helpers.async_streaming_bulk", streaming_bulk),
+    ):
+        report = asyncio.run(
+            bulk_index_products(
+                MagicMock(), "products-new", parallelism=3, chunk_size=2
+            )
+        )
+
+    assert report == (6, 1)
+    assert len({action["_id"] for action in batches}) == 7
+    source = next(a["_source"] for a in batches if a["_source"]["name"] == "Indexed 1")
+    assert source["in_stock"] is True
+    assert source["suggest"]["contexts"] == {"category": ["General", "all"]}
@@ -0,0 +1,122 @@
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from elasticsearch import ConnectionError as ESConnectionError
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import NullPool
+
+from app.core.config import settings
+from app.crud.product import ProductCrud
+from app.jobs.search_sync import drain_once
+from app.models.product import Product
+from app.models.search_outbox import SearchOutbox
+from app.schema.product_schema import ProductCreate, ProductUpdate
+
+
+def _sessions(db_session: Session):
+    # Async sessions on the test database, like the app's
+    engine = create_async_engine(
+        db_session.bind.url.set(drivername="sqlite+aiosqlite"), poolclass=NullPool
+    )
+    return async_sessionmaker(engine, expire_on_commit=False)
+
+
+def _drain(db_session: Session, fail_ids=(), down=False):
+    actions = []
+
+    async def streaming_bulk(es, batch, **kwargs):
+        if down:
+            raise ESConnectionError("down")
+        for action in batch:
+            actions.append(action)
+            ok = action["_id"] not in fail_ids
+            yield ok, {action["_op_type"]: {"_id": str(action["_id"]), "status": 500}}
+
+    with (
+        patch("app.jobs.search_sync.AsyncSessionLocal", _sessions(db_session)),
+        patch("app.jobs.search_sync.helpers.async_streaming_bulk", streaming_bulk),
+        patch(
+            "app.utils.es_utils.write_indices", AsyncMock(return_value=["products-v1"])
+        ),
+    ):
+        asyncio.run(drain_once(MagicMock()))
+    db_session.expire_all()
+    return actions
+
+
+def test_product_writes_enqueue_search_sync(db_session: Session):
+    async def write() -> int:
+        async with _sessions(db_session)() as db:
+            crud = ProductCrud(db=db)
+            product = await crud.create_product(
+                ProductCreate(name="Outbox Lamp", price=20, stock_quantity=5)
+            )
+            await crud.update_product(product.id, ProductUpdate(price=25))
+            # Not part of the search document: nothing to sync
+            await crud.update_product(
+                product.id, ProductUpdate(image_url="https://example.com/a.png")
+            )
+            await crud.delete_product(product.id)
+            return product.id
+
+    product_id = asyncio.run(write())
+
+    rows = db_session.scalars(
+        select(SearchOutbox).where(SearchOutbox.product_id == product_id)
+    ).all()
+    assert [(row.operation, row.fields) for row in rows] == [
+        ("upsert", None),
+        ("upsert", ["price"]),
+        ("delete", None),
+    ]
+
+
+def test_drain_coalesces_and_dead_letters(db_session: Session, monkeypatch):
+    product = Product(name="Synced", slug="synced", sku="SKU-SYNC", price=10)
+    db_session.add(product)
+    db_session.flush()
+    db_session.add_all(
+        [
+            SearchOutbox(product_id=product.id, operation="upsert", fields=["price"]),
+            SearchOutbox(
+                product_id=product.id, operation="upsert", fields=["name", "suggest"]
+            ),
+            SearchOutbox(product_id=999_999, operation="delete"),
+        ]
+    )
+    db_session.commit()
+
+    actions = _drain(db_session)
+
+    # One partial update for the two changes, one delete for the gone row
+    update, delete = sorted(actions, key=lambda a: a["_op_type"], reverse=True)
+    assert update["_id"] == product.id
+    assert sorted(update["doc"]) == ["name", "price", "suggest"]
+    assert update["upsert"]["name"] == "Synced"
+    assert delete == {"_op_type": "delete", "_index": "products-v1", "_id": 999_999}
+    assert db_session.scalars(select(SearchOutbox)).all() == []
+
+    # Failures are retried later, then dead-lettered
+    monkeypatch.setattr(settings, "ES_OUTBOX_MAX_ATTEMPTS", 1)
+    db_session.add(SearchOutbox(product_id=product.id, operation="upsert"))
+    db_session.commit()
+    _drain(db_session, fail_ids={product.id})
+    row = db_session.scalars(select(SearchOutbox)).one()
+    assert row.attempts == 1 and row.dead_at is not None
+
+
+def test_cluster_outage_uses_up_no_attempts(db_session: Session, monkeypatch):
+    monkeypatch.setattr(settings, "ES_OUTBOX_MAX_ATTEMPTS", 1)
+    db_session.add(SearchOutbox(product_id=999_998, operation="delete"))
+    db_session.commit()
+
+    with pytest.raises(ESConnectionError):
+        _drain(db_session, down=True)
+
+    row = db_session.scalars(
+        select(SearchOutbox).where(SearchOutbox.product_id == 999_998)
+    ).one()
+    assert row.attempts == 0 and row.dead_at is None and row.available_at is None